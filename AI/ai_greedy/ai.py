@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import copy
+from dataclasses import dataclass
 import importlib.util
 import itertools
 import math
+import multiprocessing
 from pathlib import Path
+import pickle
 import sys
 import time
-from typing import List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from SDK.backend.forecast import (
     MAX_ROUND,
@@ -23,6 +27,7 @@ from SDK.backend.forecast import (
     TowerType,
     hex_distance as distance,
     is_valid_pos,
+    load_forecast_simulator,
 )
 from SDK.utils.constants import ANT_AGE_LIMIT
 from SDK.utils.constants import (
@@ -30,13 +35,19 @@ from SDK.utils.constants import (
     BASE_UPGRADE_COST,
     LEVEL2_TOWER_UPGRADE_COST,
     LEVEL3_TOWER_UPGRADE_COST,
+    MAP_SIZE,
     SUPER_WEAPON_STATS,
     TOWER_DOWNGRADE_REFUND_RATIO,
     tower_build_cost_for_count,
 )
 
 SEARCH_BUDGET = 0.15
+TURN_TIME_LIMIT = 10.0
+SEARCH_SAFETY_MARGIN = 0.5
+MATCH_SEARCH_ALLOWANCE = 150.0
+FORECAST_BACKEND = "auto"
 MAX_NODE_COUNT = 20000
+ROOT_PARALLEL_WORKERS = 0
 SEARCH_STAGING_ENEMY_BASE_HP = BASE_HP
 EVALUATION_HORIZON = 60
 TOWER_COUNT_SCORE = 1.0
@@ -202,6 +213,360 @@ for family in SITE_FAMILIES:
     for site in family:
         SITE_TO_FAMILY[site] = family
 
+# Site geometry, fixed per side. Candidate generation works on bitsets whose bit ``rank`` stands
+# for ACTIONABLE_SITES[rank], so enumerating set bits keeps the historical candidate order.
+ACTIONABLE_RANK = {site: rank for rank, site in enumerate(ACTIONABLE_SITES)}
+ACTIONABLE_MASK = (1 << len(ACTIONABLE_SITES)) - 1
+ACTIONABLE_CELLS = tuple(tuple(layout[site] for site in ACTIONABLE_SITES) for layout in SITE_LAYOUT)
+ACTIONABLE_RANK_AT_CELL = tuple({cell: rank for rank, cell in enumerate(cells)} for cells in ACTIONABLE_CELLS)
+FAMILY_MASKS = tuple(sum(1 << ACTIONABLE_RANK[peer] for peer in SITE_TO_FAMILY[site]) for site in ACTIONABLE_SITES)
+SITE_DISTANCE = tuple(
+    tuple(tuple(distance(x, y, px, py) for px, py in layout) for x, y in layout) for layout in SITE_LAYOUT
+)
+INNER_SITES_MASK = sum(1 << site for site in range(1, 34))
+# Per side and cell ``x * MAP_SIZE + y``: sites an EMP there covers, by site and by actionable rank.
+EMP_SITE_COVER = tuple(
+    tuple(
+        sum(1 << site for site, (sx, sy) in enumerate(layout) if distance(x, y, sx, sy) <= 3)
+        for x in range(MAP_SIZE)
+        for y in range(MAP_SIZE)
+    )
+    for layout in SITE_LAYOUT
+)
+EMP_ACTIONABLE_COVER = tuple(
+    tuple(
+        sum(1 << rank for rank, (sx, sy) in enumerate(cells) if distance(x, y, sx, sy) <= 3)
+        for x in range(MAP_SIZE)
+        for y in range(MAP_SIZE)
+    )
+    for cells in ACTIONABLE_CELLS
+)
+BUILD_OPERATIONS = tuple(tuple(Operation(OperationType.BUILD_TOWER, x, y) for x, y in cells) for cells in ACTIONABLE_CELLS)
+UPGRADE_TARGETS = {
+    TowerType.BASIC: (TowerType.HEAVY, TowerType.MORTAR, TowerType.QUICK),
+    TowerType.HEAVY: (TowerType.HEAVY_PLUS, TowerType.BEWITCH, TowerType.ICE),
+    TowerType.MORTAR: (TowerType.MORTAR_PLUS, TowerType.MISSILE, TowerType.PULSE),
+    TowerType.QUICK: (TowerType.QUICK_PLUS, TowerType.DOUBLE, TowerType.SNIPER),
+}
+
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _emp_site_value(side: int, x: int, y: int, value: float = 0.0) -> float:
+    """Add the placement bonus of an EMP at ``(x, y)`` for the inner sites of ``side`` it covers."""
+    home = SITE_DISTANCE[side][HOME_SLOT]
+    for site in _bits(EMP_SITE_COVER[side][x * MAP_SIZE + y] & INNER_SITES_MASK):
+        value += 3 - home[site] * 0.01
+    return value
+
+
+@dataclass(slots=True)
+class SiteState:
+    """Own actionable sites of one forecast state, as bitsets over ACTIONABLE_SITES ranks."""
+
+    towers: List[Optional[Tower]]
+    occupied: int
+    buildable: int
+    basic: int
+    advanced: int
+    upgradable: int
+
+
+@dataclass(slots=True)
+class ForecastEvaluation:
+    info: GameInfo
+    trace_start: int
+    trace: List[int]
+    collapse_round: int
+    ruin_round: int
+    safe_gap: int
+    solvent: bool
+
+
+@dataclass(slots=True)
+class SearchCarry:
+    """The root child a search committed to, kept in case the next turn is the one it forecast."""
+
+    nodes: List[ForecastNode]
+    node_id: int
+    signature: Tuple
+
+
+class TranspositionTable:
+    """Per-turn rollout results keyed by forecast state, shared by every node that reaches it."""
+
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[int, int], ForecastEvaluation] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(self, key: Tuple[int, int]) -> Optional[ForecastEvaluation]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key: Tuple[int, int], entry: ForecastEvaluation) -> None:
+        self.entries[key] = entry
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class SearchBudget:
+    """Per-turn search time, scaled by game phase and danger and bounded by what is left.
+
+    ``SEARCH_BUDGET`` is a quiet midgame turn. A turn never gets more than the rule limit minus
+    the safety margin, nor more than four times the fair share of the unspent match allowance.
+    """
+
+    def __init__(self) -> None:
+        self.base = SEARCH_BUDGET
+        self.turn_limit = TURN_TIME_LIMIT
+        self.margin = SEARCH_SAFETY_MARGIN
+        self.allowance = MATCH_SEARCH_ALLOWANCE
+        self.used = 0.0
+
+    @staticmethod
+    def phase_factor(round_index: int) -> float:
+        if round_index < 30:
+            return 0.5
+        if round_index >= 400:
+            return 1.5
+        return 1.0
+
+    @staticmethod
+    def danger_factor(collapse_gap: int) -> float:
+        if collapse_gap <= 8:
+            return 6.0
+        if collapse_gap <= 16:
+            return 3.0
+        if collapse_gap <= 30:
+            return 1.5
+        return 1.0
+
+    def allot(self, round_index: int, collapse_gap: int) -> float:
+        budget = self.base * self.phase_factor(round_index) * self.danger_factor(collapse_gap)
+        rounds_left = max(MAX_ROUND - round_index, 1)
+        fair_share = max(self.allowance - self.used, 0.0) / rounds_left
+        return max(min(budget, fair_share * 4, self.turn_limit - self.margin), 0.0)
+
+    def charge(self, seconds: float) -> None:
+        self.used += seconds
+
+
+class RootPool:
+    """Worker processes that deepen disjoint slices of the root children in parallel.
+
+    ``start`` forks the pool once at match start, so the fork never lands in a turn's budget.
+    Fewer than two workers, an environment that cannot fork or share semaphores, or a worker
+    failure leaves the pool unavailable and the search serial.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.available = workers > 1
+        self._pool = None
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> None:
+        if not self.available or self._pool is not None:
+            return
+        try:
+            self._pool = multiprocessing.get_context("fork").Pool(self.workers)
+        except (ImportError, OSError, ValueError):
+            self.available = False
+
+    def map(self, payloads: List[bytes]) -> Optional[List[bytes]]:
+        if self._pool is None:
+            return None
+        try:
+            return self._pool.map(_search_root_slice, payloads)
+        except Exception:
+            self.close()
+            self.available = False
+            return None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+
+def _search_root_slice(payload: bytes) -> bytes:
+    """Worker side of RootPool: deepen some root children until their share of the turn is spent."""
+    context, allowance, packed = pickle.loads(payload)
+    start_cpu = time.process_time()
+    brain = AI()
+    brain._restore_search_context(context)
+    children = [ForecastNode.unpack(brain, item) for item in packed]
+    root = ForecastNode(brain, children[0].sim)
+    root.node_id = 0
+    brain.nodes = [root]
+    for child in children:
+        child.parent = 0
+        child.node_id = len(brain.nodes)
+        brain.nodes.append(child)
+        root.children.append(child.node_id)
+    brain.deadline = start_cpu + allowance
+    while not brain._out_of_time() and len(brain.nodes) < MAX_NODE_COUNT - 10:
+        if not brain._expand_one():
+            break
+    results = [
+        (
+            item[0],
+            child.best_descendant,
+            child.best_depth,
+            child.expanded_layers,
+            child.collapse_round,
+            child.danger,
+            child.solvent,
+        )
+        for item, child in zip(packed, children)
+    ]
+    return pickle.dumps((time.process_time() - start_cpu, results), pickle.HIGHEST_PROTOCOL)
+
+
+GRAFTABLE_OPERATIONS = frozenset(
+    (
+        OperationType.BUILD_TOWER,
+        OperationType.UPGRADE_TOWER,
+        OperationType.DOWNGRADE_TOWER,
+        OperationType.UPGRADE_GENERATION_SPEED,
+        OperationType.UPGRADE_GENERATED_ANT,
+    )
+)
+
+
+def _tower_signature(tower: Tower) -> Tuple[int, int, int, int, int, bool]:
+    return tower.x, tower.y, int(tower.type), tower.cd, tower.hp, tower.emp
+
+
+def _public_signature(info: GameInfo, side: int) -> Tuple:
+    """Discrete public state as the forecast of ``side`` keeps it: own ants and enemy towers pruned.
+
+    Pheromone is left out; the forecast models it more coarsely than the engine, so it never agrees.
+    """
+    return (
+        info.round,
+        tuple(info.coins),
+        tuple((base.hp, base.gen_speed_level, base.ant_level) for base in info.bases),
+        tuple(
+            (tower.id, tower.x, tower.y, int(tower.type), tower.cd, tower.hp)
+            for tower in info.towers
+            if tower.player == side
+        ),
+        tuple(
+            sorted(
+                (ant.id, ant.x, ant.y, ant.hp, ant.level, ant.age, int(ant.state))
+                for ant in info.ants
+                if ant.player != side
+            )
+        ),
+        tuple((int(weapon.type), weapon.player, weapon.x, weapon.y, weapon.left_time) for weapon in info.super_weapons),
+        info.super_weapon_cd.tobytes(),
+    )
+
+
+_DISK_CELLS: Dict[Tuple[int, int, int], Tuple[int, ...]] = {}
+
+
+def _disk_cells(x: int, y: int, radius: int) -> Tuple[int, ...]:
+    key = (x, y, radius)
+    cells = _DISK_CELLS.get(key)
+    if cells is None:
+        cells = tuple(
+            cx * MAP_SIZE + cy
+            for cx in range(max(0, x - radius - 1), min(MAP_SIZE, x + radius + 2))
+            for cy in range(max(0, y - radius), min(MAP_SIZE, y + radius + 1))
+            if distance(cx, cy, x, y) <= radius
+        )
+        _DISK_CELLS[key] = cells
+    return cells
+
+
+class IdleBaseline:
+    """No-op rollout of a parent state, shared by the children that only differ in own towers.
+
+    Such a child follows the idle trajectory exactly until an enemy ant comes within range of
+    one of its changed towers; those rounds are read from here instead of simulated. The idle
+    line is only played as far as some child has asked for.
+    """
+
+    def __init__(self, brain: AI, origin: Simulator) -> None:
+        self.side = brain.side
+        self.origin = origin.clone()
+        self.round = self.origin.info.round
+        self.horizon = brain.current_round + EVALUATION_HORIZON
+        self.snapshots: List[Simulator] = [self.origin]
+        self.enemy_cells: List[frozenset[int]] = [self._enemy_cells(self.origin)]
+        self.base_hp: List[int] = []
+        self.nearest_hostile: List[int] = []
+        self.halted = False
+        self._sim: Optional[Simulator] = None
+
+    def _enemy_cells(self, sim: Simulator) -> frozenset[int]:
+        return frozenset(x * MAP_SIZE + y for x, y in sim.ant_cells(1 - self.side))
+
+    def _advance(self) -> None:
+        if self._sim is None:
+            self._sim = self.origin.clone()
+        side = self.side
+        trace = self._sim.fast_forward(1, side, anchor=SITE_LAYOUT[side][HOME_SLOT])
+        if trace.halted:
+            self.halted = True
+            return
+        self.base_hp.append(trace.base_hp[0][side])
+        self.nearest_hostile.append(trace.nearest_hostile[0])
+        snapshot = self._sim.clone()
+        self.snapshots.append(snapshot)
+        self.enemy_cells.append(self._enemy_cells(snapshot))
+
+    def changed_cells(self, sim: Simulator) -> frozenset[int]:
+        """Cells from which ``sim``'s own towers could act differently than on the idle line."""
+        side = self.side
+        before = {tower.id: tower for tower in self.origin.info.towers if tower.player == side}
+        cells: set[int] = set()
+        for tower in sim.info.towers:
+            if tower.player != side:
+                continue
+            radius = tower.range
+            old = before.pop(tower.id, None)
+            if old is not None:
+                if _tower_signature(old) == _tower_signature(tower):
+                    continue
+                radius = max(radius, old.range)
+            cells.update(_disk_cells(tower.x, tower.y, radius))
+        for old in before.values():
+            cells.update(_disk_cells(old.x, old.y, old.range))
+        return frozenset(cells)
+
+    def shares(self, step: int, cells: frozenset[int]) -> bool:
+        """Whether round ``step`` of the idle line is also played by a child with ``cells`` changed."""
+        while len(self.base_hp) <= step and not self.halted and self.round + len(self.base_hp) < self.horizon:
+            self._advance()
+        return step < len(self.base_hp) and cells.isdisjoint(self.enemy_cells[step])
+
 
 class ForecastNode:
     def __init__(self, brain: AI, sim: Simulator) -> None:
@@ -221,11 +586,62 @@ class ForecastNode:
         self.danger = False
         self.solvent = True
         self.distance_trace = [0] * EVALUATION_HORIZON
+        self.idle: Optional[IdleBaseline] = None
+        self._changed_cells: Optional[frozenset[int]] = None
+        self._idle_split = EVALUATION_HORIZON
+        self.forecast_signature: Optional[Tuple] = None
 
     @property
     def action_count(self) -> int:
         return len(self.chosen)
 
+    def snapshot(self, brain: AI) -> ForecastNode:
+        """Copy owned by ``brain``; the idle baseline is a deterministic cache and stays shared."""
+        twin = copy.copy(self)
+        twin.brain = brain
+        twin.sim = self.sim.clone()
+        twin.children = list(self.children)
+        twin.chosen = list(self.chosen)
+        twin.distance_trace = list(self.distance_trace)
+        return twin
+
+    def pack(self) -> Tuple:
+        return (
+            self.node_id,
+            self.sim.info,
+            self.chosen,
+            self.score,
+            self.best_descendant,
+            self.best_depth,
+            self.expanded_layers,
+            self.round_tag,
+            self.sunk_cost,
+            self.collapse_round,
+            self.danger,
+            self.solvent,
+            self.distance_trace,
+        )
+
+    @classmethod
+    def unpack(cls, brain: AI, packed: Tuple) -> ForecastNode:
+        node = cls(brain, brain.simulator(packed[1]))
+        (
+            node.node_id,
+            _,
+            node.chosen,
+            node.score,
+            node.best_descendant,
+            node.best_depth,
+            node.expanded_layers,
+            node.round_tag,
+            node.sunk_cost,
+            node.collapse_round,
+            node.danger,
+            node.solvent,
+            node.distance_trace,
+        ) = packed
+        return node
+
     def _record_hostile_distance(self, info: GameInfo) -> None:
         brain = self.brain
         trace_idx = info.round - brain.current_round
@@ -235,13 +651,43 @@ class ForecastNode:
     def _advance_trial_until_hp_drop(self, trial: Simulator, hp_drop: int) -> int:
         info = trial.info
         brain = self.brain
+        side = brain.side
         horizon = brain.current_round + EVALUATION_HORIZON
-        for turn in range(info.round, horizon):
-            if not trial.fast_next_round(brain.side):
-                break
-            self.distance_trace[turn - brain.current_round] = brain._nearest_hostile_step(info)
-            if info.bases[brain.side].hp <= brain.wall_hp_snapshot - hp_drop:
+        start = info.round - brain.current_round
+        threshold = brain.wall_hp_snapshot - hp_drop
+        rounds = horizon - info.round
+        idle = self.idle
+        if idle is not None and info.round - idle.round < self._idle_split:
+            if self._changed_cells is None:
+                self._changed_cells = idle.changed_cells(self.sim)
+            offset = info.round - idle.round
+            step = offset
+            stopped = False
+            while step < offset + rounds:
+                if not idle.shares(step, self._changed_cells):
+                    # Once off the idle line the trial never rejoins it.
+                    self._idle_split = step
+                    break
+                self.distance_trace[start + step - offset] = idle.nearest_hostile[step]
+                step += 1
+                if idle.base_hp[step - 1] <= threshold:
+                    stopped = True
+                    break
+            if step > offset:
+                trial.graft(self.sim, idle.origin, idle.snapshots[step], side)
+            if stopped:
                 return info.round
+            start += step - offset
+            rounds -= step - offset
+        trace = trial.fast_forward(
+            rounds,
+            side,
+            anchor=SITE_LAYOUT[side][HOME_SLOT],
+            stop_base_hp=(side, threshold),
+        )
+        self.distance_trace[start : start + len(trace)] = trace.nearest_hostile
+        if trace.stopped:
+            return info.round
         return horizon
 
     def _forecast_ruin_round(self, trial: Simulator) -> int:
@@ -413,19 +859,59 @@ class ForecastNode:
             return 0.0
         return pressure / enemy_count * 0.5
 
-    def evaluate(self) -> float:
+    def _rollout(self) -> ForecastEvaluation:
         trial = self.sim.clone()
         info = trial.info
+        brain = self.brain
+        trace_start = info.round - brain.current_round
         self._record_hostile_distance(info)
         safe_gap = self._safe_gap(info)
         ruin_round = self._forecast_ruin_round(trial)
+        info = trial.info
+        trace_end = min(EVALUATION_HORIZON, max(trace_start + 1, info.round - brain.current_round))
+        return ForecastEvaluation(
+            info=info,
+            trace_start=trace_start,
+            trace=self.distance_trace[trace_start:trace_end],
+            collapse_round=self.collapse_round,
+            ruin_round=ruin_round,
+            safe_gap=safe_gap,
+            solvent=self.solvent,
+        )
+
+    def _replay(self, entry: ForecastEvaluation) -> None:
+        start = entry.trace_start
+        if 0 <= start < EVALUATION_HORIZON:
+            self.distance_trace[start : start + len(entry.trace)] = entry.trace
+        self.collapse_round = entry.collapse_round
+        self.solvent = entry.solvent
+
+    def _transposition_key(self) -> Tuple[int, int]:
+        brain = self.brain
+        info = self.sim.info
+        # Once the wall has cracked, the inherited collapse round feeds the score unchanged.
+        inherited = self.collapse_round if info.bases[brain.side].hp <= brain.wall_hp_snapshot - 1 else -1
+        return self.sim.state_hash(), inherited
+
+    def evaluate(self) -> float:
+        table = self.brain.transpositions
+        key = self._transposition_key()
+        entry = table.lookup(key)
+        if entry is None:
+            entry = self._rollout()
+            table.store(key, entry)
+        else:
+            self._replay(entry)
+
+        info = entry.info
+        ruin_round = entry.ruin_round
         my_towers = self._my_towers(info)
 
         score = 0.0
         score += self._score_survival_window(info, ruin_round)
         score += self._score_frontline_trades(info)
         score += self._score_danger_window(ruin_round)
-        score += self._score_cash_safety(safe_gap)
+        score += self._score_cash_safety(entry.safe_gap)
         score += self._score_tower_count(len(my_towers))
         score += self._score_tower_investment(my_towers)
         score += self._score_tower_spacing(my_towers)
@@ -438,6 +924,14 @@ class ForecastNode:
         self.best_descendant = score
         return score
 
+    def evaluate_from(self, origin: Simulator) -> float:
+        """Evaluate as a node created on ``origin``, for a carried node whose own sim has moved on."""
+        advanced, self.sim = self.sim, origin
+        try:
+            return self.evaluate()
+        finally:
+            self.sim = advanced
+
     def expand(self, is_root: bool = False) -> None:
         brain = self.brain
         info = self.sim.info
@@ -449,15 +943,15 @@ class ForecastNode:
                 self.distance_trace[info.round - brain.current_round] = brain._nearest_hostile_step(info)
             if not self.sim.fast_next_round(brain.side):
                 return
+            if self.parent == 0 and self.sim.info.round == brain.current_round + 1:
+                self.forecast_signature = _public_signature(self.sim.info, brain.side)
 
-        emp_blocked = [False] * 34
+        emp_blocked = 0
         for weapon in self.sim.info.super_weapons:
             if weapon.player == 1 - brain.side and weapon.type == SuperWeaponType.EMP_BLASTER:
-                for site in range(34):
-                    sx, sy = SITE_LAYOUT[brain.side][site]
-                    if distance(weapon.x, weapon.y, sx, sy) <= 3:
-                        emp_blocked[site] = True
+                emp_blocked = EMP_ACTIONABLE_COVER[brain.side][weapon.x * MAP_SIZE + weapon.y]
                 break
+        sites = brain._site_state(self.sim.info)
 
         bundles: List[List[Operation]] = []
         for tactic in range(8):
@@ -486,19 +980,29 @@ class ForecastNode:
                 continue
             if self.sim.info.tower_num_of_player(brain.side) >= 4 and tactic in (0, 2):
                 continue
-            bundles.extend(brain._candidate_bundles(tactic, self.sim.info, emp_blocked))
+            bundles.extend(brain._candidate_bundles(tactic, self.sim.info, sites, emp_blocked))
 
         if is_root:
-            idle = ForecastNode(brain, self.sim)
-            idle.node_id = len(brain.nodes)
-            idle.parent = self.node_id
-            idle.evaluate()
-            brain.nodes.append(idle)
+            idle = brain._adopt(())
+            if idle is None:
+                idle = ForecastNode(brain, self.sim)
+                idle.node_id = len(brain.nodes)
+                idle.parent = self.node_id
+                idle.evaluate()
+                brain.nodes.append(idle)
             self.children.append(idle.node_id)
 
+        idle_baseline: Optional[IdleBaseline] = None
         for bundle in bundles:
-            if len(brain.nodes) >= MAX_NODE_COUNT - 10:
+            if len(brain.nodes) >= MAX_NODE_COUNT - 10 or brain._out_of_time():
                 break
+            adopted = brain._adopt(bundle) if is_root else None
+            if adopted is not None:
+                if adopted.score > self.best_descendant:
+                    self.best_descendant = adopted.score
+                    self.best_depth = self.expanded_layers + 1
+                self.children.append(adopted.node_id)
+                continue
             child = ForecastNode(brain, self.sim)
             child.node_id = len(brain.nodes)
             child.parent = self.node_id
@@ -523,6 +1027,10 @@ class ForecastNode:
                             child.sunk_cost += mutable.upgrade_tower_cost(int(tower.type)) * 0.2
                 child.sim.add_operation_of_player(brain.side, op)
             child.sim.apply_operations_of_player(brain.side)
+            if brain.share_idle_rollouts and all(op.type in GRAFTABLE_OPERATIONS for op in bundle):
+                if idle_baseline is None:
+                    idle_baseline = IdleBaseline(brain, self.sim)
+                child.idle = idle_baseline
             value = child.evaluate()
             if value > self.best_descendant:
                 self.best_descendant = value
@@ -548,20 +1056,54 @@ class AI:
         self.last_superweapon_round = -1
         self.reserve_depth = 0
         self.nodes: List[ForecastNode] = []
-
-    def create_session(self):
-        return _load_runtime_module().GreedySession(self)
+        self.transpositions = TranspositionTable()
+        self.budget = SearchBudget()
+        self.deadline = math.inf
+        self.halted = False
+        self.carry: Optional[SearchCarry] = None
+        self.root_pool = RootPool(ROOT_PARALLEL_WORKERS)
+        self.reusable: Dict[Tuple[Operation, ...], List[ForecastNode]] = {}
+        self.reuse_subtrees = True
+        self.simulator = load_forecast_simulator(FORECAST_BACKEND)
+        # Native rollouts cost less than the bookkeeping that would let siblings skip them.
+        self.share_idle_rollouts = self.simulator is Simulator
+
+    def create_session(self, *, ponder: bool = False):
+        return _load_runtime_module().GreedySession(self, ponder=ponder)
+
+    def on_match_start(self, player: int, seed: int) -> None:
+        del player, seed
+        self.root_pool.start()
+
+    def on_match_end(self) -> None:
+        self.root_pool.close()
+
+    def fork(self) -> AI:
+        """Copy for a speculative decision, with its own snapshot of the carried subtree.
+
+        Re-rooting and expanding mutate carried nodes, so the original keeps its carry intact
+        for the turn it plays itself if the speculation misses.
+        """
+        twin = copy.copy(self)
+        twin.nodes = []
+        twin.transpositions = TranspositionTable()
+        twin.budget = copy.copy(self.budget)
+        twin.reusable = {}
+        carry = self.carry
+        if carry is not None:
+            nodes = list(carry.nodes)
+            for node in self._subtree(carry.nodes, carry.node_id):
+                nodes[node.node_id] = node.snapshot(twin)
+            twin.carry = SearchCarry(nodes, carry.node_id, carry.signature)
+        return twin
+
+    def halt(self) -> None:
+        self.halted = True
 
     def _mark_super(self, weapon_type: SuperWeaponType) -> None:
         self.last_superweapon_round = self.current_round
         self.last_superweapon_type = weapon_type
 
-    def _tower_at(self, x: int, y: int, info: GameInfo) -> Optional[Tower]:
-        for tower in info.towers:
-            if tower.x == x and tower.y == y:
-                return tower
-        return None
-
     def _tower_by_id(self, tower_id: int, info: GameInfo) -> Optional[Tower]:
         return info.tower_of_id(tower_id)
 
@@ -619,194 +1161,240 @@ class AI:
                 best = min(best, distance(ant.x, ant.y, tx, ty))
         return best
 
-    def _site_operation(
-        self,
-        site: int,
-        mode: int,
-        info: GameInfo,
-        coins: int,
-        towers: int,
-        upgrade_branch: int = 0,
-        exempt_site: int = -1,
-    ) -> Tuple[Optional[Operation], int, int]:
-        x, y = SITE_LAYOUT[self.side][site]
-
-        if mode == 1:
-            cost = info.build_tower_cost(towers)
-            if coins < cost:
-                return None, coins, towers
-            for peer in SITE_TO_FAMILY[site]:
-                if peer == exempt_site:
-                    continue
-                px, py = SITE_LAYOUT[self.side][peer]
-                if info.building_tag[px][py] != BuildingType.EMPTY:
-                    return None, coins, towers
-            return Operation(OperationType.BUILD_TOWER, x, y), coins - cost, towers + 1
-
-        if mode == 2:
-            if info.building_tag[x][y] == BuildingType.EMPTY:
-                return None, coins, towers
-            tower = self._tower_at(x, y, info)
-            if tower is None or int(tower.type) // 10 > 0:
-                return None, coins, towers
-
-            target: Optional[TowerType] = None
+    def _site_state(self, info: GameInfo) -> SiteState:
+        tag = info.building_tag
+        occupied = 0
+        for rank, (x, y) in enumerate(ACTIONABLE_CELLS[self.side]):
+            if tag[x, y] != BuildingType.EMPTY:
+                occupied |= 1 << rank
+        towers: List[Optional[Tower]] = [None] * len(ACTIONABLE_SITES)
+        rank_at_cell = ACTIONABLE_RANK_AT_CELL[self.side]
+        for tower in info.towers:
+            rank = rank_at_cell.get((tower.x, tower.y))
+            if rank is not None and towers[rank] is None and occupied >> rank & 1:
+                towers[rank] = tower
+        buildable = basic = advanced = upgradable = 0
+        for rank, family in enumerate(FAMILY_MASKS):
+            if not family & occupied:
+                buildable |= 1 << rank
+            tower = towers[rank]
+            if tower is None:
+                continue
             if tower.type == TowerType.BASIC:
-                target = (TowerType.HEAVY, TowerType.MORTAR, TowerType.QUICK)[upgrade_branch]
-            elif tower.type == TowerType.HEAVY:
-                target = (TowerType.HEAVY_PLUS, TowerType.BEWITCH, TowerType.ICE)[upgrade_branch]
-            elif tower.type == TowerType.MORTAR:
-                target = (TowerType.MORTAR_PLUS, TowerType.MISSILE, TowerType.PULSE)[upgrade_branch]
-            elif tower.type == TowerType.QUICK:
-                target = (TowerType.QUICK_PLUS, TowerType.DOUBLE, TowerType.SNIPER)[upgrade_branch]
-
-            if target is None:
-                return None, coins, towers
-            cost = info.upgrade_tower_cost(int(target))
-            if coins < cost:
-                return None, coins, towers
-            return Operation(OperationType.UPGRADE_TOWER, tower.id, int(target)), coins - cost, towers
-
-        if mode == 3:
-            if info.building_tag[x][y] == BuildingType.EMPTY:
-                return None, coins, towers
-            tower = self._tower_at(x, y, info)
-            if tower is None or tower.type != TowerType.BASIC:
-                return None, coins, towers
-            refund = info.destroy_tower_income(towers)
-            return Operation(OperationType.DOWNGRADE_TOWER, tower.id), coins + refund, towers - 1
-
-        if mode == 4:
-            if info.building_tag[x][y] == BuildingType.EMPTY:
-                return None, coins, towers
-            tower = self._tower_at(x, y, info)
-            if tower is None or tower.type == TowerType.BASIC:
-                return None, coins, towers
-            refund = info.downgrade_tower_income(int(tower.type))
-            return Operation(OperationType.DOWNGRADE_TOWER, tower.id), coins + refund, towers
-
-        return None, coins, towers
-
-    def _candidate_bundles(self, tactic: int, info: GameInfo, emp_blocked: Sequence[bool]) -> List[List[Operation]]:
-        bundles: List[List[Operation]] = []
+                basic |= 1 << rank
+            else:
+                advanced |= 1 << rank
+            if tower.type in UPGRADE_TARGETS:
+                upgradable |= 1 << rank
+        return SiteState(towers, occupied, buildable, basic, advanced, upgradable)
+
+    def _build_operations(self, info: GameInfo, mask: int, coins: int, towers: int) -> List[Operation]:
+        if coins < info.build_tower_cost(towers):
+            return []
+        operations = BUILD_OPERATIONS[self.side]
+        return [operations[rank] for rank in _bits(mask)]
+
+    def _upgrade_operations(self, info: GameInfo, sites: SiteState, mask: int, coins: int) -> List[Operation]:
+        operations: List[Operation] = []
+        for rank in _bits(mask & sites.upgradable):
+            tower = sites.towers[rank]
+            for target in UPGRADE_TARGETS[tower.type]:
+                if coins >= info.upgrade_tower_cost(int(target)):
+                    operations.append(Operation(OperationType.UPGRADE_TOWER, tower.id, int(target)))
+        return operations
+
+    def _downgrade_heads(self, info: GameInfo, sites: SiteState, mask: int) -> List[Tuple[int, Operation, int, int]]:
+        """Downgrades of the towers in ``mask`` with the coins and tower count they leave behind."""
+        coins = info.coins[self.side]
+        towers = info.tower_num_of_player(self.side)
+        heads: List[Tuple[int, Operation, int, int]] = []
+        for rank in _bits(mask):
+            tower = sites.towers[rank]
+            operation = Operation(OperationType.DOWNGRADE_TOWER, tower.id)
+            if tower.type == TowerType.BASIC:
+                heads.append((rank, operation, coins + info.destroy_tower_income(towers), towers - 1))
+            else:
+                heads.append((rank, operation, coins + info.downgrade_tower_income(int(tower.type)), towers))
+        return heads
+
+    def _candidate_bundles(self, tactic: int, info: GameInfo, sites: SiteState, emp_blocked: int) -> List[List[Operation]]:
+        open_sites = ACTIONABLE_MASK & ~emp_blocked
+        coins = info.coins[self.side]
+        towers = info.tower_num_of_player(self.side)
 
         if tactic == 0:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                op, _, _ = self._site_operation(site, 1, info, info.coins[self.side], info.tower_num_of_player(self.side))
-                if op is not None:
-                    bundles.append([op])
-        elif tactic == 1:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                for branch in range(3):
-                    op, _, _ = self._site_operation(
-                        site,
-                        2,
-                        info,
-                        info.coins[self.side],
-                        info.tower_num_of_player(self.side),
-                        branch,
-                    )
-                    if op is not None:
-                        bundles.append([op])
-        elif tactic == 2:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                head, coins, towers = self._site_operation(
-                    site,
-                    4,
-                    info,
-                    info.coins[self.side],
-                    info.tower_num_of_player(self.side),
-                )
-                if head is None:
-                    continue
-                for site2 in ACTIONABLE_SITES:
-                    if emp_blocked[site2] or site2 == site:
-                        continue
-                    tail, _, _ = self._site_operation(site2, 1, info, coins, towers)
-                    if tail is not None:
-                        bundles.append([head, tail])
-        elif tactic == 3:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                op, _, _ = self._site_operation(site, 3, info, info.coins[self.side], info.tower_num_of_player(self.side))
-                if op is not None:
-                    bundles.append([op])
-        elif tactic == 4:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                head, coins, towers = self._site_operation(
-                    site,
-                    3,
-                    info,
-                    info.coins[self.side],
-                    info.tower_num_of_player(self.side),
-                )
-                if head is None:
-                    continue
-                for site2 in ACTIONABLE_SITES:
-                    if emp_blocked[site2] or site2 == site:
-                        continue
-                    for branch in range(3):
-                        tail, _, _ = self._site_operation(site2, 2, info, coins, towers, branch)
-                        if tail is not None:
-                            bundles.append([head, tail])
-        elif tactic == 5:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                op, _, _ = self._site_operation(site, 4, info, info.coins[self.side], info.tower_num_of_player(self.side))
-                if op is not None:
-                    bundles.append([op])
-        elif tactic == 6:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                head, coins, towers = self._site_operation(
-                    site,
-                    3,
-                    info,
-                    info.coins[self.side],
-                    info.tower_num_of_player(self.side),
-                )
-                if head is None:
-                    continue
-                for site2 in ACTIONABLE_SITES:
-                    if emp_blocked[site2] or site2 == site:
-                        continue
-                    tail, _, _ = self._site_operation(site2, 1, info, coins, towers, exempt_site=site)
-                    if tail is not None:
-                        bundles.append([head, tail])
-        elif tactic == 7:
-            for site in ACTIONABLE_SITES:
-                if emp_blocked[site]:
-                    continue
-                head, coins, towers = self._site_operation(
-                    site,
-                    4,
-                    info,
-                    info.coins[self.side],
-                    info.tower_num_of_player(self.side),
-                )
-                if head is None:
-                    continue
-                for site2 in ACTIONABLE_SITES:
-                    if emp_blocked[site2] or site2 == site:
-                        continue
-                    for branch in range(3):
-                        tail, _, _ = self._site_operation(site2, 2, info, coins, towers, branch)
-                        if tail is not None:
-                            bundles.append([head, tail])
+            return [[op] for op in self._build_operations(info, sites.buildable & open_sites, coins, towers)]
+        if tactic == 1:
+            return [[op] for op in self._upgrade_operations(info, sites, open_sites, coins)]
+        if tactic == 3:
+            return [[head] for _, head, _, _ in self._downgrade_heads(info, sites, sites.basic & open_sites)]
+        if tactic == 5:
+            return [[head] for _, head, _, _ in self._downgrade_heads(info, sites, sites.advanced & open_sites)]
 
+        bundles: List[List[Operation]] = []
+        if tactic == 2:
+            for rank, head, head_coins, head_towers in self._downgrade_heads(info, sites, sites.advanced & open_sites):
+                tail_sites = sites.buildable & open_sites & ~(1 << rank)
+                bundles.extend([head, tail] for tail in self._build_operations(info, tail_sites, head_coins, head_towers))
+        elif tactic == 6:
+            for rank, head, head_coins, head_towers in self._downgrade_heads(info, sites, sites.basic & open_sites):
+                # Removing the head frees its family when nothing else there is built.
+                buildable = sites.buildable
+                family = FAMILY_MASKS[rank]
+                if not family & sites.occupied & ~(1 << rank):
+                    buildable |= family
+                tail_sites = buildable & open_sites & ~(1 << rank)
+                bundles.extend([head, tail] for tail in self._build_operations(info, tail_sites, head_coins, head_towers))
+        elif tactic in (4, 7):
+            head_sites = sites.basic if tactic == 4 else sites.advanced
+            for rank, head, head_coins, _ in self._downgrade_heads(info, sites, head_sites & open_sites):
+                tail_sites = open_sites & ~(1 << rank)
+                bundles.extend([head, tail] for tail in self._upgrade_operations(info, sites, tail_sites, head_coins))
         return bundles
 
+    def _search_context(self) -> Tuple:
+        return (
+            self.side,
+            self.current_round,
+            self.front_state,
+            self.wall_hp_snapshot,
+            self.enemy_old_baseline,
+            self.enemy_die_baseline,
+            self.last_superweapon_type,
+            self.last_superweapon_round,
+            self.reserve_depth,
+        )
+
+    def _restore_search_context(self, context: Tuple) -> None:
+        (
+            self.side,
+            self.current_round,
+            self.front_state,
+            self.wall_hp_snapshot,
+            self.enemy_old_baseline,
+            self.enemy_die_baseline,
+            self.last_superweapon_type,
+            self.last_superweapon_round,
+            self.reserve_depth,
+        ) = context
+
+    def _search_root_parallel(self) -> Optional[float]:
+        """Deepen the root children on the worker pool; returns the slowest worker's CPU time.
+
+        Only the per-child results come back, so a parallel search leaves no subtree to carry over.
+        """
+        root = self.nodes[0]
+        workers = min(self.root_pool.workers, len(root.children))
+        if not self.root_pool.running or workers < 2:
+            return None
+        allowance = max(self.deadline - time.process_time(), 0.0)
+        context = self._search_context()
+        payloads = [
+            pickle.dumps(
+                (context, allowance, [self.nodes[child_id].pack() for child_id in root.children[index::workers]]),
+                pickle.HIGHEST_PROTOCOL,
+            )
+            for index in range(workers)
+        ]
+        replies = self.root_pool.map(payloads)
+        if replies is None:
+            return None
+        slowest = 0.0
+        for reply in replies:
+            spent, results = pickle.loads(reply)
+            slowest = max(slowest, spent)
+            for node_id, best_descendant, best_depth, expanded_layers, collapse_round, danger, solvent in results:
+                child = self.nodes[node_id]
+                child.best_descendant = best_descendant
+                child.best_depth = best_depth
+                child.expanded_layers = expanded_layers
+                child.collapse_round = collapse_round
+                child.danger = danger
+                child.solvent = solvent
+        return slowest
+
+    def _out_of_time(self) -> bool:
+        return self.halted or time.process_time() >= self.deadline
+
+    def _reroot(self, carry: SearchCarry, staging: GameInfo) -> Dict[Tuple[Operation, ...], List[ForecastNode]]:
+        """Split the carried subtree into ready-made root children if this turn is the one it forecast.
+
+        The forecast assumes an idle opponent, so any opponent operation shows up in the signature.
+        The carried node continues as the idle child; its first-layer children become siblings.
+        Scores are left to ``_adopt``, which re-evaluates them against this turn's baselines.
+        """
+        if _public_signature(staging, self.side) != carry.signature:
+            return {}
+        nodes = carry.nodes
+        node = nodes[carry.node_id]
+        sunk_cost = node.sunk_cost
+        reusable: Dict[Tuple[Operation, ...], List[ForecastNode]] = {}
+        kept: List[int] = []
+        for child_id in node.children:
+            child = nodes[child_id]
+            if child.round_tag == self.current_round:
+                reusable[tuple(child.chosen)] = self._subtree(nodes, child_id)
+            else:
+                kept.append(child_id)
+        node.chosen = []
+        node.children = kept
+        node.expanded_layers -= 1
+        reusable[()] = self._subtree(nodes, carry.node_id)
+        for subtree in reusable.values():
+            for kept_node in subtree:
+                kept_node.sunk_cost -= sunk_cost
+                kept_node.distance_trace = kept_node.distance_trace[1:] + [0]
+                kept_node.forecast_signature = None
+                kept_node.idle = None
+                kept_node._changed_cells = None
+        return reusable
+
+    @staticmethod
+    def _subtree(nodes: Sequence[ForecastNode], node_id: int) -> List[ForecastNode]:
+        subtree = [nodes[node_id]]
+        for node in subtree:
+            subtree.extend(nodes[child_id] for child_id in node.children)
+        return subtree
+
+    def _adopt(self, bundle: Sequence[Operation]) -> Optional[ForecastNode]:
+        """Graft a carried subtree under the root, rescored as if expanded fresh this turn.
+
+        Carried scores were taken against last turn's round, wall and sunk cost. The idle node's
+        sim has been advanced by its expansions, so it is scored on the root's state instead.
+        Children that the turn's budget leaves no time to rescore are dropped.
+        """
+        subtree = self.reusable.pop(tuple(bundle), None)
+        if subtree is None:
+            return None
+        head = subtree[0]
+        if bundle:
+            head.evaluate()
+        else:
+            head.evaluate_from(self.nodes[0].sim)
+        head.best_depth = 0
+        rescored = [head]
+        for node in subtree[1:]:
+            if self._out_of_time():
+                break
+            node.collapse_round = head.collapse_round
+            value = node.evaluate()
+            if value > head.best_descendant:
+                head.best_descendant = value
+                head.best_depth = node.round_tag - self.current_round
+            rescored.append(node)
+        kept = {node.node_id for node in rescored}
+        head.children = [child_id for child_id in head.children if child_id in kept]
+        subtree = rescored
+        renumbered: Dict[int, int] = {}
+        for node in subtree:
+            renumbered[node.node_id] = len(self.nodes)
+            node.node_id = len(self.nodes)
+            self.nodes.append(node)
+        for node in subtree:
+            node.parent = renumbered.get(node.parent, 0)
+            node.children = [renumbered[child_id] for child_id in node.children]
+        return subtree[0]
+
     def _expand_one(self) -> bool:
         root = self.nodes[0]
         if not root.children:
@@ -845,9 +1433,7 @@ class AI:
             target_round = min(MAX_ROUND - 1, child.collapse_round - bias)
             if now_round >= target_round:
                 continue
-            for _ in range(now_round, target_round - 1):
-                if not child.sim.fast_next_round(self.side):
-                    break
+            child.sim.fast_forward(target_round - 1 - now_round, self.side)
             child.expand()
 
     def _liquidate_all(
@@ -878,7 +1464,7 @@ class AI:
         if not tower_ids:
             return None
 
-        baseline = Simulator(info)
+        baseline = self.simulator(info)
         fallback_round = 48
         for step in range(1, 49):
             if not baseline.fast_next_round(self.side):
@@ -892,7 +1478,7 @@ class AI:
         best_ops: List[Operation] = []
         for order in itertools.permutations(tower_ids):
             plan: List[Operation] = []
-            trial = Simulator(info)
+            trial = self.simulator(info)
             snapshot = trial.info
             wallet = coins
             tower_count = towers
@@ -959,7 +1545,7 @@ class AI:
             for y in range(19):
                 if not is_valid_pos(x, y):
                     continue
-                trial = Simulator(info)
+                trial = self.simulator(info)
                 for op in prefix:
                     trial.add_operation_of_player(self.side, op)
                 trial.add_operation_of_player(self.side, Operation(OperationType.USE_LIGHTNING_STORM, x, y))
@@ -1056,7 +1642,7 @@ class AI:
             and wallet >= info.use_super_weapon_cost(int(SuperWeaponType.EMERGENCY_EVASION))
         )
 
-        preview = Simulator(info)
+        preview = self.simulator(info)
         for _ in range(24):
             if not preview.fast_next_round(1 - self.side):
                 break
@@ -1081,7 +1667,7 @@ class AI:
                                 value += 80
                     if value < 100:
                         continue
-                    trial = Simulator(info)
+                    trial = self.simulator(info)
                     for op in prefix:
                         trial.add_operation_of_player(self.side, op)
                     trial.add_operation_of_player(self.side, Operation(OperationType.USE_EMP_BLASTER, x, y))
@@ -1098,11 +1684,7 @@ class AI:
                     elif trial.info.bases[1 - self.side].hp >= base_enemy_hp - 4:
                         continue
                     value += 100 * (base_enemy_hp - trial.info.bases[1 - self.side].hp)
-                    for site in range(1, 34):
-                        sx, sy = SITE_LAYOUT[1 - self.side][site]
-                        if distance(sx, sy, x, y) <= 3:
-                            bx, by = SITE_LAYOUT[1 - self.side][HOME_SLOT]
-                            value += 3 - distance(sx, sy, bx, by) * 0.01
+                    value = _emp_site_value(1 - self.side, x, y, value)
                     results.append((x, y, value))
 
             if results and not enemy_storm:
@@ -1136,7 +1718,7 @@ class AI:
                             continue
                         if count < 3 or (self.current_round > 460 and count < 2):
                             continue
-                        trial = Simulator(info)
+                        trial = self.simulator(info)
                         for op in prefix:
                             trial.add_operation_of_player(self.side, op)
                         trial.add_operation_of_player(self.side, Operation(OperationType.USE_EMERGENCY_EVASION, x, y))
@@ -1168,7 +1750,7 @@ class AI:
                         if distance(x, y, bx, by) > 4:
                             continue
                         value = 0.0
-                        trial = Simulator(info)
+                        trial = self.simulator(info)
                         for op in prefix:
                             trial.add_operation_of_player(self.side, op)
                         trial.add_operation_of_player(self.side, Operation(OperationType.USE_DEFLECTOR, x, y))
@@ -1216,14 +1798,14 @@ class AI:
                 return []
             prefix, wallet, tower_count = sale
 
-        own_preview = Simulator(info)
+        own_preview = self.simulator(info)
         for _ in range(24):
             if not own_preview.fast_next_round(self.side):
                 break
             if own_preview.info.bases[self.side].hp < info.bases[self.side].hp:
                 return []
 
-        preview = Simulator(info)
+        preview = self.simulator(info)
         for _ in range(24):
             if not preview.fast_next_round(1 - self.side):
                 break
@@ -1245,7 +1827,7 @@ class AI:
                             value += 80
                 if value < 100:
                     continue
-                trial = Simulator(info)
+                trial = self.simulator(info)
                 for op in prefix:
                     trial.add_operation_of_player(self.side, op)
                 trial.add_operation_of_player(self.side, Operation(OperationType.USE_EMP_BLASTER, x, y))
@@ -1256,11 +1838,7 @@ class AI:
                 if trial.info.bases[1 - self.side].hp >= base_enemy_hp - 4:
                     continue
                 value += 100 * (base_enemy_hp - trial.info.bases[1 - self.side].hp)
-                for site in range(1, 34):
-                    sx, sy = SITE_LAYOUT[1 - self.side][site]
-                    if distance(sx, sy, x, y) <= 3:
-                        bx, by = SITE_LAYOUT[1 - self.side][HOME_SLOT]
-                        value += 3 - distance(sx, sy, bx, by) * 0.01
+                value = _emp_site_value(1 - self.side, x, y, value)
                 results.append((x, y, value))
 
         if not results:
@@ -1311,6 +1889,7 @@ class AI:
 
     def __call__(self, player_id: int, game_info: GameInfo) -> List[Operation]:
         self.current_round = game_info.round
+        carry, self.carry = self.carry, None
         if self.current_round == 0:
             self.side = player_id
 
@@ -1378,18 +1957,27 @@ class AI:
         staging.bases[enemy].hp = SEARCH_STAGING_ENEMY_BASE_HP
 
         self.nodes = []
-        root = ForecastNode(self, Simulator(staging))
+        self.transpositions.clear()
+        if carry is not None and self.reuse_subtrees:
+            self.reusable = self._reroot(carry, staging)
+        root = ForecastNode(self, self.simulator(staging))
         root.node_id = 0
         root.parent = -1
         root.evaluate()
+        self.deadline = start_cpu + self.budget.allot(self.current_round, root.collapse_round - self.current_round)
         self.nodes.append(root)
         self.nodes[0].expand(is_root=True)
 
-        while True:
-            if time.process_time() - start_cpu >= SEARCH_BUDGET or len(self.nodes) >= MAX_NODE_COUNT - 10:
+        worker_cpu = self._search_root_parallel()
+        # Each pass deepens the shallowest root child, so stopping at any point leaves a usable answer.
+        while worker_cpu is None:
+            if self._out_of_time() or len(self.nodes) >= MAX_NODE_COUNT - 10:
                 break
             if not self._expand_one():
                 break
+        self.budget.charge(time.process_time() - start_cpu + (worker_cpu or 0.0))
+        self.deadline = math.inf
+        self.reusable = {}
 
         best_id = -1
         best_value = -1e9
@@ -1428,5 +2016,8 @@ class AI:
 
         if best_id > 0:
             self.reserve_depth = self.nodes[best_id].best_depth
+            signature = self.nodes[best_id].forecast_signature
+            if signature is not None:
+                self.carry = SearchCarry(self.nodes, best_id, signature)
             return list(self.nodes[best_id].chosen)
         return []
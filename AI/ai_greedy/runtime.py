@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 try:
-    from common import MatchSession
+    from common import MatchSession, Ponderer
 except ModuleNotFoundError as exc:
     if exc.name != "common":
         raise
-    from AI.common import MatchSession
+    from AI.common import MatchSession, Ponderer
 
 try:
     from protocol import ProtocolIO
@@ -29,30 +29,62 @@ def _to_greedy_info(state) -> GameInfo:
 
 
 class GreedySession(MatchSession):
-    def __init__(self, agent, io: ProtocolIO | None = None) -> None:
+    def __init__(self, agent, io: ProtocolIO | None = None, *, ponder: bool = False) -> None:
         self.agent = agent
         self.io = io or ProtocolIO()
         player, seed = self.io.recv_init()
         self.runtime = MatchRuntime.create(player=player, seed=seed, prefer_native=False)
+        self.ponderer = Ponderer() if ponder else None
+        agent.on_match_start(player, seed)
 
     @property
     def player(self) -> int:
         return self.runtime.player
 
+    def close(self) -> None:
+        if self.ponderer is not None:
+            self.ponderer.cancel()
+        self.agent.on_match_end()
+
+    def _ponder(self) -> None:
+        # Guess that the opponent holds and the judge agrees with the local engine.
+        if self.ponderer is None:
+            return
+        runtime = self.runtime.fork()
+        runtime.apply_opponent_operations([])
+        if self.player == 0:
+            runtime.finish_round_locally()
+        info = runtime.forecast_state()
+        agent = self.agent.fork()
+        self.ponderer.start(agent, info.state_hash(), lambda: agent(runtime.player, info))
+
+    def _decide(self) -> list[Operation]:
+        info = self.runtime.forecast_state()
+        if self.ponderer is not None and self.ponderer.pending:
+            claimed = self.ponderer.claim(info.state_hash())
+            if claimed is not None:
+                self.agent, operations = claimed
+                return operations
+        return self.agent(self.player, info)
+
     def perform_self_turn(self) -> None:
-        proposed = [_to_sdk_operation(operation) for operation in self.agent(self.player, _to_greedy_info(self.runtime.state))]
+        proposed = [_to_sdk_operation(operation) for operation in self._decide()]
         accepted: list[SDKOperation] = []
         for operation in proposed:
             if self.runtime.state.can_apply_operation(self.player, operation, accepted):
                 accepted.append(operation)
         self.runtime.apply_self_operations(accepted)
         self.io.send_operations(accepted)
+        if self.player == 0:
+            self._ponder()
 
     def receive_opponent_turn(self) -> bool:
         try:
             opponent_operations = self.io.recv_operations()
         except Exception:
             return False
+        if self.ponderer is not None:
+            self.ponderer.cancel()
         self.runtime.apply_opponent_operations(opponent_operations)
         return True
 
@@ -60,5 +92,9 @@ class GreedySession(MatchSession):
         round_state = self.io.recv_round_state()
         if round_state is None:
             return False
+        if self.ponderer is not None:
+            self.ponderer.cancel()
         self.runtime.finish_round(round_state)
+        if self.player == 1:
+            self._ponder()
         return True
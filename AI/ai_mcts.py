@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import os
 from pathlib import Path
 
@@ -80,6 +81,13 @@ class MCTSAgent(BaseAgent):
             return model
         return None
 
+    def fork(self) -> MCTSAgent:
+        # The network is read-only during search, so forks share it.
+        return copy.deepcopy(self, {id(self.model): self.model})
+
+    def halt(self) -> None:
+        self.search.halt()
+
     def list_bundles(self, state: BackendState, player: int) -> list[ActionBundle]:
         return self.catalog.build(state, player, context=DecisionContext.for_player(player), rerank=False)
 
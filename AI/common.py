@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import copy
 from dataclasses import dataclass
 import random
+import threading
+from typing import Any, Callable, Hashable
 
 from SDK.utils.actions import ActionBundle, ActionCatalog
 from SDK.backend.state import BackendState
@@ -36,6 +39,76 @@ class MatchSession(ABC):
     def sync_round(self) -> bool:
         raise NotImplementedError
 
+    def close(self) -> None:
+        """Release whatever the session holds once the match is over."""
+
+
+class Ponderer:
+    """One speculative decision, made on a forked agent while the session blocks on input.
+
+    ``cancel`` never waits for it: an unfinished decision is dropped and its thread abandoned, after
+    ``halt()`` if the agent has one so that the search stops soon. ``claim`` hands back the forked
+    agent and its operations only if the real decision input matches the predicted ``key``.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._thread: threading.Thread | None = None
+        self._agent: Any = None
+        self._key: Hashable = None
+        self._outcome: list[list] = []
+
+    @property
+    def pending(self) -> bool:
+        return self._agent is not None
+
+    def start(self, agent: Any, key: Hashable, decide: Callable[[], list]) -> None:
+        self.cancel()
+        self._agent = agent
+        self._key = key
+        # Each run writes to its own box, so an abandoned thread cannot fill a later one.
+        outcome: list[list] = []
+        self._outcome = outcome
+
+        def run() -> None:
+            try:
+                outcome.append(decide())
+            except Exception:
+                pass
+
+        self._thread = threading.Thread(target=run, name="ponder", daemon=True)
+        self._thread.start()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+
+    def cancel(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        if thread.is_alive():
+            halt = getattr(self._agent, "halt", None)
+            if callable(halt):
+                halt()
+            self._outcome = []
+
+    def claim(self, key: Hashable) -> tuple[Any, list] | None:
+        self.cancel()
+        agent, outcome, matched = self._agent, self._outcome, self._key == key
+        self._agent = None
+        self._key = None
+        self._outcome = []
+        if agent is None:
+            return None
+        if not outcome or not matched:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return agent, outcome[0]
+
 
 class BaseAgent(ABC):
     def __init__(self, seed: int | None = None, max_actions: int = MAX_ACTIONS) -> None:
@@ -51,6 +124,9 @@ class BaseAgent(ABC):
         if self._seed_override is None:
             self.rng.seed((seed << 1) ^ player)
 
+    def fork(self) -> BaseAgent:
+        return copy.deepcopy(self)
+
     def on_self_operations(self, operations) -> None:
         del operations
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+
 try:
     from ai import AI as PackagedAI
 except ModuleNotFoundError as exc:  # pragma: no cover - repository layout
@@ -15,10 +17,10 @@ except ModuleNotFoundError as exc:  # pragma: no cover - repository layout
     from AI.common import BaseAgent, MatchSession
 
 
-def build_session(agent) -> MatchSession:
+def build_session(agent, *, ponder: bool = False) -> MatchSession:
     factory = getattr(agent, "create_session", None)
     if callable(factory):
-        session = factory()
+        session = factory(ponder=ponder) if ponder else factory()
         if not isinstance(session, MatchSession):
             raise TypeError("AI.create_session() must return a MatchSession")
         return session
@@ -30,32 +32,38 @@ def build_session(agent) -> MatchSession:
             if exc.name != "protocol":
                 raise
             from AI.protocol import ProtocolSession
-        return ProtocolSession(agent)
+        return ProtocolSession(agent, ponder=ponder)
 
     raise TypeError("AI must inherit BaseAgent or expose create_session()")
 
 
 def run_session(session: MatchSession) -> None:
-    while True:
-        if session.player == 0:
-            session.perform_self_turn()
-            if not session.receive_opponent_turn():
-                break
-            if not session.sync_round():
-                break
-        else:
-            if not session.receive_opponent_turn():
-                break
-            session.perform_self_turn()
-            if not session.sync_round():
-                break
+    try:
+        while True:
+            if session.player == 0:
+                session.perform_self_turn()
+                if not session.receive_opponent_turn():
+                    break
+                if not session.sync_round():
+                    break
+            else:
+                if not session.receive_opponent_turn():
+                    break
+                session.perform_self_turn()
+                if not session.sync_round():
+                    break
+    finally:
+        session.close()
 
 
 def main(ai_cls=None) -> None:
     agent_cls = ai_cls or PackagedAI
     if agent_cls is None:
         raise RuntimeError("main.py expects ai.py to export class AI, or an explicit ai_cls argument")
-    run_session(build_session(agent_cls()))
+    if os.getenv("AGENT_TRADITION_PONDER") == "1":
+        run_session(build_session(agent_cls(), ponder=True))
+    else:
+        run_session(build_session(agent_cls()))
 
 
 if __name__ == "__main__":  # pragma: no cover - exercised in packaged layout
@@ -6,11 +6,11 @@ from dataclasses import dataclass
 from typing import Iterable
 
 try:
-    from common import BaseAgent, MatchSession
+    from common import BaseAgent, MatchSession, Ponderer
 except ModuleNotFoundError as exc:
     if exc.name != "common":
         raise
-    from AI.common import BaseAgent, MatchSession
+    from AI.common import BaseAgent, MatchSession, Ponderer
 
 from SDK.backend.engine import PublicRoundState
 from SDK.backend.runtime import MatchRuntime
@@ -141,21 +141,47 @@ class ProtocolIO:
 
 
 class ProtocolSession(MatchSession):
-    def __init__(self, agent: BaseAgent, io: ProtocolIO | None = None) -> None:
+    def __init__(self, agent: BaseAgent, io: ProtocolIO | None = None, *, ponder: bool = False) -> None:
         self.io = io or ProtocolIO()
         player, seed = self.io.recv_init()
         self.controller = ProtocolController(
             runtime=MatchRuntime.create(player=player, seed=seed, prefer_native=False),
             agent=agent,
         )
+        self.ponderer = Ponderer() if ponder else None
+        self.opponent_operations: tuple[Operation, ...] = ()
         agent.on_match_start(player, seed)
 
     @property
     def player(self) -> int:
         return self.controller.player
 
+    def _ponder(self) -> None:
+        # Guess that the opponent holds and the judge agrees with the local engine.
+        if self.ponderer is None:
+            return
+        runtime = self.controller.runtime.fork()
+        agent = self.controller.agent.fork()
+        runtime.apply_opponent_operations([])
+        agent.on_opponent_operations([])
+        if self.player == 0:
+            agent.on_round_state(runtime.finish_round_locally())
+        key = ((), runtime.state.to_bytes())
+        self.ponderer.start(agent, key, lambda: agent.choose_operations(runtime.state, runtime.player))
+
+    def _pondered_operations(self) -> list[Operation] | None:
+        if self.ponderer is None or not self.ponderer.pending:
+            return None
+        claimed = self.ponderer.claim((self.opponent_operations, self.controller.state.to_bytes()))
+        if claimed is None:
+            return None
+        self.controller.agent, operations = claimed
+        return operations
+
     def perform_self_turn(self) -> None:
-        proposed = self.controller.decide()
+        proposed = self._pondered_operations()
+        if proposed is None:
+            proposed = self.controller.decide()
         accepted: list[Operation] = []
         for operation in proposed:
             if self.controller.state.can_apply_operation(self.player, operation, accepted):
@@ -163,12 +189,17 @@ class ProtocolSession(MatchSession):
         self.controller.apply_self_operations(accepted)
         self.controller.agent.on_self_operations(accepted)
         self.io.send_operations(accepted)
+        if self.player == 0:
+            self._ponder()
 
     def receive_opponent_turn(self) -> bool:
         try:
             opponent_ops = self.io.recv_operations()
         except Exception:
             return False
+        if self.ponderer is not None:
+            self.ponderer.cancel()
+        self.opponent_operations = tuple(opponent_ops)
         self.controller.apply_opponent_operations(opponent_ops)
         self.controller.agent.on_opponent_operations(opponent_ops)
         return True
@@ -177,12 +208,16 @@ class ProtocolSession(MatchSession):
         round_state = self.io.recv_round_state()
         if round_state is None:
             return False
+        if self.ponderer is not None:
+            self.ponderer.cancel()
         self.controller.finish_round(round_state)
         self.controller.agent.on_round_state(round_state)
+        if self.player == 1:
+            self._ponder()
         return True
 
 
-def run_agent(agent: BaseAgent, io: ProtocolIO | None = None) -> None:
+def run_agent(agent: BaseAgent, io: ProtocolIO | None = None, *, ponder: bool = False) -> None:
     try:
         from main import run_session
     except ModuleNotFoundError as exc:  # pragma: no cover - repository layout
@@ -190,4 +225,4 @@ def run_agent(agent: BaseAgent, io: ProtocolIO | None = None) -> None:
             raise
         from AI.main import run_session
 
-    run_session(ProtocolSession(agent, io=io))
+    run_session(ProtocolSession(agent, io=io, ponder=ponder))
@@ -303,11 +303,16 @@ class PriorGuidedMCTS:
         self.feature_extractor = feature_extractor or FeatureExtractor()
         self.action_catalog = action_catalog or ActionCatalog(feature_extractor=self.feature_extractor)
         self.rng = random.Random(self.search_config.seed)
+        self.halted = False
 
     @property
     def action_dim(self) -> int:
         return self.action_catalog.max_actions
 
+    def halt(self) -> None:
+        """Stop this and any later search after the current iteration; for abandoned speculation."""
+        self.halted = True
+
     def _heuristic_value(
         self,
         state: BackendState,
@@ -328,8 +333,7 @@ class PriorGuidedMCTS:
         bundles: list[ActionBundle],
     ) -> PolicyValueInference:
         action_mask = self.action_catalog.action_mask(bundles).astype(np.float32)
-        observation = self.feature_extractor.encode_observation(state, player, action_mask, context=context)
-        flat = self.feature_extractor.flatten_observation(observation)
+        flat = self.feature_extractor.encode_batch([state], [player], [context])[0]
         heuristic_priors = _heuristic_bundle_policy(bundles)
         heuristic_value = self._heuristic_value(state, player, context=context)
         if self.model is None:
@@ -492,6 +496,8 @@ class PriorGuidedMCTS:
             )
 
         for _ in range(self.search_config.iterations):
+            if self.halted:
+                break
             node = root
             path = [root]
             while node.expanded and node.children and node.depth < max_decision_depth and not node.state.terminal:
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+# Shared with NativeState::checksum in SDK/native_antwar.cpp; both sides must hash the
+# same int64 words in the same order.
+#
+#   section(values) = n ^ sum_i splitmix64(uint64(values[i]) ^ (i + 1) * GOLDEN)   (mod 2**64)
+#   h = CHECKSUM_SEED; h = splitmix64(h ^ section) for each section, in order:
+#     scalars  round_index, coins[0..1], base hp[0..1]
+#     towers   rows sorted by id: id, player, x, y, type, display cooldown[, hp]
+#     ants     rows sorted by id: id, player, x, y, hp, level, age, status[, behavior, kind]
+#     pheromone int32 field in (player, x, y) order            (full checksum only)
+#     rng      48-bit LCG state                                 (full checksum only)
+# The public checksum keeps only the columns every PublicRoundState carries.
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+CHECKSUM_SEED = 0x416E7457617243
+PUBLIC_TOWER_COLUMNS = 6
+PUBLIC_ANT_COLUMNS = 8
+FULL_TOWER_COLUMNS = 7
+FULL_ANT_COLUMNS = 10
+
+
+def _splitmix64(value: int) -> int:
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def _splitmix64_array(values: np.ndarray) -> np.ndarray:
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def section_hash(values: np.ndarray | Sequence[int]) -> int:
+    words = np.ascontiguousarray(values, dtype=np.int64).ravel().view(np.uint64)
+    count = words.shape[0]
+    if count == 0:
+        return 0
+    salt = np.arange(1, count + 1, dtype=np.uint64) * np.uint64(GOLDEN)
+    with np.errstate(over="ignore"):
+        total = int(_splitmix64_array(words ^ salt).sum(dtype=np.uint64))
+    return total ^ count
+
+
+def _rows(rows: Sequence[Sequence[int]], columns: int) -> list[int]:
+    flat: list[int] = []
+    for row in sorted(rows, key=lambda item: item[0]):
+        flat.extend(row[:columns])
+    return flat
+
+
+def round_checksum(
+    round_index: int,
+    coins: Sequence[int],
+    camps_hp: Sequence[int],
+    tower_rows: Sequence[Sequence[int]],
+    ant_rows: Sequence[Sequence[int]],
+    *,
+    pheromone: np.ndarray | None = None,
+    rng_state: int | None = None,
+    public_only: bool = False,
+) -> int:
+    tower_columns = PUBLIC_TOWER_COLUMNS if public_only else FULL_TOWER_COLUMNS
+    ant_columns = PUBLIC_ANT_COLUMNS if public_only else FULL_ANT_COLUMNS
+    sections = [
+        section_hash([round_index, coins[0], coins[1], camps_hp[0], camps_hp[1]]),
+        section_hash(_rows(tower_rows, tower_columns)),
+        section_hash(_rows(ant_rows, ant_columns)),
+    ]
+    if not public_only:
+        if pheromone is not None:
+            sections.append(section_hash(pheromone))
+        if rng_state is not None:
+            sections.append(section_hash([rng_state]))
+    checksum = CHECKSUM_SEED
+    for section in sections:
+        checksum = _splitmix64(checksum ^ section)
+    return checksum
+
+
+def public_state_checksum(public_state) -> int:
+    return round_checksum(
+        public_state.round_index,
+        public_state.coins,
+        public_state.camps_hp,
+        public_state.towers,
+        public_state.ants,
+        public_only=True,
+    )
+
+
+__all__ = [
+    "CHECKSUM_SEED",
+    "public_state_checksum",
+    "round_checksum",
+    "section_hash",
+]
@@ -4,13 +4,14 @@ from collections import deque
 from dataclasses import dataclass, field
 from functools import lru_cache
 from heapq import heappop, heappush
-from typing import Iterable
+from typing import Callable, Iterable
 
 import numpy as np
 
 from SDK.utils.constants import (
     AntKind,
     AntBehavior,
+    ANT_AGE_LIMIT,
     ANT_BREACH_REWARD,
     ANT_TELEPORT_INTERVAL,
     ANT_TELEPORT_RATIO,
@@ -67,7 +68,17 @@ from SDK.utils.constants import (
     tower_build_cost_for_count,
 )
 from SDK.backend.model import NO_MOVE, Ant, Base, Operation, Tower, WeaponEffect, default_behavior_expiry
-from SDK.utils.geometry import hex_distance, is_highland, is_path, is_valid_pos, neighbors
+from SDK.utils.geometry import (
+    PATH_NEIGHBORS,
+    VALID_NEIGHBORS,
+    WALKABLE_NEIGHBORS,
+    hex_distance,
+    is_ant_walkable,
+    is_highland,
+    is_path,
+    is_valid_pos,
+    neighbors,
+)
 
 RNG_MASK = (1 << 48) - 1
 RNG_MULTIPLIER = 25214903917
@@ -138,10 +149,6 @@ def _trail_for_pheromone(ant: Ant) -> list[tuple[int, int]]:
     return trail
 
 
-def _is_ant_walkable_cell(x: int, y: int) -> bool:
-    return (x, y) in PLAYER_BASES or is_path(x, y)
-
-
 @dataclass(slots=True)
 class PublicRoundState:
     round_index: int
@@ -175,6 +182,63 @@ class EnhancedMoveAnnotation:
     tower_id: int | None = None
 
 
+@dataclass(slots=True)
+class FastForwardTrace:
+    round_index: np.ndarray
+    base_hp: np.ndarray
+    coins: np.ndarray
+    nearest_hostile: np.ndarray
+    stopped: bool = False
+
+    @classmethod
+    def allocate(cls, rounds: int) -> FastForwardTrace:
+        rounds = max(rounds, 0)
+        return cls(
+            round_index=np.zeros(rounds, dtype=np.int16),
+            base_hp=np.zeros((rounds, PLAYER_COUNT), dtype=np.int16),
+            coins=np.zeros((rounds, PLAYER_COUNT), dtype=np.int32),
+            nearest_hostile=np.zeros((rounds, PLAYER_COUNT), dtype=np.int16),
+        )
+
+    def __len__(self) -> int:
+        return int(self.round_index.shape[0])
+
+    def record(self, index: int, state: GameState) -> None:
+        self.round_index[index] = state.round_index
+        self.base_hp[index] = (state.bases[0].hp, state.bases[1].hp)
+        self.coins[index] = state.coins
+        nearest = [32, 32]
+        for ant in state.ants:
+            if not ant.is_alive():
+                continue
+            defender = 1 - ant.player
+            base_x, base_y = PLAYER_BASES[defender]
+            distance = hex_distance(ant.x, ant.y, base_x, base_y)
+            if distance < nearest[defender]:
+                nearest[defender] = distance
+        self.nearest_hostile[index] = nearest
+
+    def truncate(self, count: int) -> FastForwardTrace:
+        if count >= len(self):
+            return self
+        return FastForwardTrace(
+            round_index=self.round_index[:count].copy(),
+            base_hp=self.base_hp[:count].copy(),
+            coins=self.coins[:count].copy(),
+            nearest_hostile=self.nearest_hostile[:count].copy(),
+            stopped=self.stopped,
+        )
+
+
+def stop_on_base_hp_drop(state: GameState, player: int, drop: int = 1) -> Callable[[GameState], bool]:
+    threshold = state.bases[player].hp - drop
+    return lambda current: current.bases[player].hp <= threshold
+
+
+def stop_on_hostile_within(player: int, distance: int) -> Callable[[GameState], bool]:
+    return lambda current: current.nearest_ant_distance(player) <= distance
+
+
 @dataclass(slots=True)
 class GameState:
     seed: int = 0
@@ -266,6 +330,17 @@ class GameState:
             enhanced_move_cache_dirty=True,
         )
 
+    def to_bytes(self) -> bytes:
+        from SDK.backend.snapshot import encode_state
+
+        return encode_state(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> GameState:
+        from SDK.backend.snapshot import decode_state
+
+        return decode_state(data)
+
     def _init_pheromone(self, seed: int) -> None:
         value = seed & ((1 << 48) - 1)
         for player in range(PLAYER_COUNT):
@@ -494,9 +569,8 @@ class GameState:
             if not ant.is_alive():
                 continue
             field[ant.player, ant.x, ant.y] += 1.0
-            for _, nx, ny in neighbors(ant.x, ant.y):
-                if _is_ant_walkable_cell(nx, ny):
-                    field[ant.player, nx, ny] += 0.35
+            for _, nx, ny in WALKABLE_NEIGHBORS[ant.x][ant.y]:
+                field[ant.player, nx, ny] += 0.35
         return field
 
     def _reverse_weighted_plan(
@@ -513,7 +587,7 @@ class GameState:
         damage = np.full((MAP_SIZE, MAP_SIZE), np.inf, dtype=np.float32)
         heap: list[tuple[float, float, int, int]] = []
         for x, y in sources:
-            if not _is_ant_walkable_cell(x, y):
+            if not is_ant_walkable(x, y):
                 continue
             if float(total[x, y]) <= 0.0:
                 continue
@@ -543,9 +617,7 @@ class GameState:
                 - effect_weight * step_effect,
             )
 
-            for _, px, py in neighbors(x, y):
-                if not _is_ant_walkable_cell(px, py):
-                    continue
+            for _, px, py in WALKABLE_NEIGHBORS[x][y]:
                 next_total = current_total + step_total
                 next_damage = current_damage + step_damage
                 known_total = float(total[px, py])
@@ -586,7 +658,7 @@ class GameState:
             for tower in self.towers:
                 if tower.player == player:
                     continue
-                sources = [(nx, ny) for _, nx, ny in neighbors(tower.x, tower.y) if _is_ant_walkable_cell(nx, ny)]
+                sources = [(nx, ny) for _, nx, ny in WALKABLE_NEIGHBORS[tower.x][tower.y]]
                 if not sources:
                     continue
                 total_cost, damage_cost = self._reverse_weighted_plan(
@@ -662,7 +734,7 @@ class GameState:
         current_value = float(field[ant.player, ant.x, ant.y])
 
         for index, (_, nx, ny) in enumerate(candidates):
-            if self._enemy_tower_at(ant.player, nx, ny) is not None or not _is_ant_walkable_cell(nx, ny):
+            if self._enemy_tower_at(ant.player, nx, ny) is not None or not is_ant_walkable(nx, ny):
                 scores[index] = current_value
                 continue
             if owner[nx, ny] != -1:
@@ -676,9 +748,7 @@ class GameState:
             x, y = queue.popleft()
             owner_index = int(owner[x, y])
             next_distance = int(distance_map[x, y]) + 1
-            for _, nx, ny in neighbors(x, y):
-                if not _is_ant_walkable_cell(nx, ny):
-                    continue
+            for _, nx, ny in WALKABLE_NEIGHBORS[x][y]:
                 if owner[nx, ny] != -1:
                     continue
                 owner[nx, ny] = owner_index
@@ -770,11 +840,7 @@ class GameState:
         return total, raw
 
     def _spawn_cells_for_tower(self, tower: Tower) -> list[tuple[int, int]]:
-        cells: list[tuple[int, int]] = []
-        for _, nx, ny in neighbors(tower.x, tower.y):
-            if is_path(nx, ny):
-                cells.append((nx, ny))
-        return cells
+        return [(nx, ny) for _, nx, ny in PATH_NEIGHBORS[tower.x][tower.y]]
 
     def _initialize_spawned_ant(self, ant: Ant, behavior: AntBehavior) -> None:
         ant.set_behavior(behavior)
@@ -1048,14 +1114,15 @@ class GameState:
         return illegal
 
     def _prepare_ants_for_attack(self) -> None:
+        has_effects = bool(self.active_effects)
         for ant in self.ants:
             if ant.frozen:
                 ant.frozen = False
                 if ant.pending_behavior is not None:
                     self._control_ant(ant, ant.pending_behavior)
                     ant.pending_behavior = None
-            current_deflector = self.is_shielded_by_deflector(ant)
-            current_evasion = any(
+            current_deflector = has_effects and self.is_shielded_by_deflector(ant)
+            current_evasion = has_effects and any(
                 effect.weapon_type == SuperWeaponType.EMERGENCY_EVASION
                 and effect.player == ant.player
                 and effect.in_range(ant.x, ant.y)
@@ -1196,14 +1263,12 @@ class GameState:
         out: list[tuple[int, int, int]] = []
         enemy_base = PLAYER_BASES[1 - ant.player]
         own_base = PLAYER_BASES[ant.player]
-        for direction, nx, ny in neighbors(ant.x, ant.y):
+        for direction, nx, ny in VALID_NEIGHBORS[ant.x][ant.y]:
             if not allow_backtrack and ant.last_move == (direction + 3) % 6:
                 continue
             tower = self._enemy_tower_at(ant.player, nx, ny)
             if tower is None and (nx, ny) not in (enemy_base, own_base) and not is_path(nx, ny):
                 continue
-            if not is_valid_pos(nx, ny):
-                continue
             out.append((direction, nx, ny))
         return out
 
@@ -1497,8 +1562,8 @@ class GameState:
 
     def _move_ants(self) -> None:
         self._begin_move_phase()
+        # Statuses are refreshed in _prepare_ants_for_attack and on every hit or freeze since.
         for ant in self.ants:
-            ant.refresh_status()
             direction = NO_MOVE
             if ant.status == AntStatus.ALIVE:
                 direction = self._choose_ant_move(ant)
@@ -1551,8 +1616,8 @@ class GameState:
     def _resolve_ant_lifecycle(self) -> None:
         remaining: list[Ant] = []
         base_destroyed = False
+        # _resolve_ant_step refreshed every status during the move phase.
         for index, ant in enumerate(self.ants):
-            ant.refresh_status()
             if ant.status == AntStatus.SUCCESS:
                 self.bases[1 - ant.player].hp -= 1
                 self.coins[ant.player] += ANT_BREACH_REWARD
@@ -1567,15 +1632,6 @@ class GameState:
                 self.old_count[ant.player] += 1
             else:
                 remaining.append(ant)
-        if not base_destroyed:
-            survivors: list[Ant] = []
-            for ant in remaining:
-                ant.refresh_status()
-                if ant.status == AntStatus.TOO_OLD:
-                    self.old_count[ant.player] += 1
-                    continue
-                survivors.append(ant)
-            remaining = survivors
         self.ants = remaining
 
     def _draw_spawn_profile(self) -> tuple[AntKind, AntBehavior]:
@@ -1618,38 +1674,45 @@ class GameState:
             tower.reset_cooldown()
 
     def _increase_ant_age(self) -> None:
+        # Only ants whose age-out or behavior timer is running need more than the counter bumps:
+        # every other status was settled by _resolve_ant_lifecycle and cannot change here.
         for ant in self.ants:
             ant.age += 1
             ant.behavior_turns += 1
-            if ant.behavior == AntBehavior.RANDOM and ant.behavior_turns >= RANDOM_ANT_DECAY_TURNS:
+            if ant.behavior != AntBehavior.DEFAULT or ant.behavior_expiry > 0:
+                self._tick_ant_behavior(ant)
+            if ant.age > ANT_AGE_LIMIT and ant.kind != AntKind.COMBAT:
+                ant.refresh_status()
+
+    def _tick_ant_behavior(self, ant: Ant) -> None:
+        if ant.behavior == AntBehavior.RANDOM and ant.behavior_turns >= RANDOM_ANT_DECAY_TURNS:
+            ant.set_behavior(AntBehavior.DEFAULT, force=True)
+        elif (
+            ant.behavior == AntBehavior.BEWITCHED
+            and ant.bewitch_target_x == ant.x
+            and ant.bewitch_target_y == ant.y
+        ):
+            ant.set_behavior(AntBehavior.DEFAULT, force=True)
+        elif ant.behavior_expiry > 0:
+            ant.behavior_expiry -= 1
+            if ant.behavior not in (AntBehavior.DEFAULT, AntBehavior.RANDOM) and ant.behavior_expiry <= 0:
                 ant.set_behavior(AntBehavior.DEFAULT, force=True)
-            else:
-                if (
-                    ant.behavior == AntBehavior.BEWITCHED
-                    and ant.bewitch_target_x == ant.x
-                    and ant.bewitch_target_y == ant.y
-                ):
-                    ant.set_behavior(AntBehavior.DEFAULT, force=True)
-                elif ant.behavior_expiry > 0:
-                    ant.behavior_expiry -= 1
-                    if ant.behavior not in (AntBehavior.DEFAULT, AntBehavior.RANDOM) and ant.behavior_expiry <= 0:
-                        ant.set_behavior(AntBehavior.DEFAULT, force=True)
-            ant.refresh_status()
 
     def _drift_effect(self, effect: WeaponEffect) -> None:
         if effect.weapon_type not in (SuperWeaponType.LIGHTNING_STORM, SuperWeaponType.EMP_BLASTER):
             return
         candidates = [(effect.x, effect.y)]
-        for _, nx, ny in neighbors(effect.x, effect.y):
-            if is_valid_pos(nx, ny):
-                candidates.append((nx, ny))
+        candidates.extend((nx, ny) for _, nx, ny in VALID_NEIGHBORS[effect.x][effect.y])
         effect.x, effect.y = candidates[self._random_index(len(candidates))]
 
-    def _tick_effects(self) -> None:
+    def _tick_weapon_cooldowns(self) -> None:
         for player in range(PLAYER_COUNT):
             for weapon_index in range(1, 5):
                 if self.weapon_cooldowns[player, weapon_index] > 0:
                     self.weapon_cooldowns[player, weapon_index] -= 1
+
+    def _tick_effects(self) -> None:
+        self._tick_weapon_cooldowns()
         next_effects: list[WeaponEffect] = []
         for effect in self.active_effects:
             self._drift_effect(effect)
@@ -1677,6 +1740,23 @@ class GameState:
     def advance_round(self) -> None:
         if self.terminal:
             return
+        self._play_round(keep_static_fields=False)
+
+    def fast_forward(self, rounds: int, stop_when: Callable[[GameState], bool] | None = None) -> FastForwardTrace:
+        # Operation-free rounds only: towers and effects change solely through the round
+        # phases themselves, so the static risk fields survive effect-free ticks.
+        trace = FastForwardTrace.allocate(rounds)
+        played = 0
+        while played < rounds and not self.terminal:
+            self._play_round(keep_static_fields=True)
+            trace.record(played, self)
+            played += 1
+            if stop_when is not None and stop_when(self):
+                trace.stopped = True
+                break
+        return trace.truncate(played)
+
+    def _play_round(self, *, keep_static_fields: bool) -> None:
         self._attack_ants()
         self._move_ants()
         self._update_pheromone()
@@ -1689,7 +1769,10 @@ class GameState:
         if (self.round_index + 1) % BASIC_INCOME_INTERVAL == 0:
             for player in range(PLAYER_COUNT):
                 self.coins[player] += BASIC_INCOME
-        self._tick_effects()
+        if keep_static_fields and not self.active_effects:
+            self._tick_weapon_cooldowns()
+        else:
+            self._tick_effects()
         self.round_index += 1
         if self.round_index >= MAX_ROUND and not self.terminal:
             self.terminal = True
@@ -1746,6 +1829,37 @@ class GameState:
             ],
         )
 
+    def checksum(self, *, public_only: bool = False) -> int:
+        from SDK.backend.checksum import round_checksum
+
+        return round_checksum(
+            self.round_index,
+            self.coins,
+            (self.bases[0].hp, self.bases[1].hp),
+            [
+                (tower.tower_id, tower.player, tower.x, tower.y, int(tower.tower_type), tower.display_cooldown(), tower.hp)
+                for tower in self.towers
+            ],
+            [
+                (
+                    ant.ant_id,
+                    ant.player,
+                    ant.x,
+                    ant.y,
+                    ant.hp,
+                    ant.level,
+                    ant.age,
+                    int(ant.status),
+                    int(ant.behavior),
+                    int(ant.kind),
+                )
+                for ant in self.ants
+            ],
+            pheromone=self.pheromone,
+            rng_state=self.rng_state,
+            public_only=public_only,
+        )
+
     def sync_public_round_state(self, public_state: PublicRoundState) -> None:
         self.round_index = public_state.round_index
         self.coins[0], self.coins[1] = public_state.coins
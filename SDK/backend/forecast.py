@@ -3,7 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import IntEnum
 import math
-from typing import List, Optional, Sequence
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
 
 from SDK.utils.constants import (
     ANT_AGE_LIMIT,
@@ -41,7 +43,7 @@ from SDK.utils.constants import (
     AntStatus,
     tower_build_cost_for_count,
 )
-from SDK.utils.geometry import hex_distance, is_highland, is_path, is_valid_pos
+from SDK.utils.geometry import PATH_NEIGHBORS, hex_distance, is_highland, is_valid_pos
 
 AntState = AntStatus
 BASE_POS = PLAYER_BASES
@@ -50,6 +52,8 @@ PHEROMONE_MIN = PHEROMONE_FLOOR
 PHEROMONE_ATTENUATING_RATIO = PHEROMONE_ATTENUATION
 LEVEL2_BASE_UPGRADE_PRICE, LEVEL3_BASE_UPGRADE_PRICE = BASE_UPGRADE_COST
 NO_MOVE = -1
+ATTENUATED_MASK = np.array([[MAP_PROPERTY[x][y] >= 0 for y in range(MAP_SIZE)] for x in range(MAP_SIZE)], dtype=bool)
+PHEROMONE_ATTENUATION_OFFSET = (1 - PHEROMONE_ATTENUATING_RATIO) * PHEROMONE_INIT
 
 
 class BuildingType(IntEnum):
@@ -331,6 +335,18 @@ class SuperWeapon:
         return copied
 
 
+@dataclass(slots=True)
+class ForecastTrace:
+    base_hp: List[tuple[int, int]] = field(default_factory=list)
+    coins: List[tuple[int, int]] = field(default_factory=list)
+    nearest_hostile: List[int] = field(default_factory=list)
+    halted: bool = False
+    stopped: bool = False
+
+    def __len__(self) -> int:
+        return len(self.base_hp)
+
+
 @dataclass(slots=True, frozen=True)
 class Operation:
     type: OperationType
@@ -354,10 +370,10 @@ class GameInfo:
         self.ants: List[Ant] = []
         self.bases = [Base.create(0), Base.create(1)]
         self.coins = [COIN_INIT, COIN_INIT]
-        self.pheromone = [[[0.0 for _ in range(MAP_SIZE)] for _ in range(MAP_SIZE)] for _ in range(2)]
-        self.building_tag = [[BuildingType.EMPTY for _ in range(MAP_SIZE)] for _ in range(MAP_SIZE)]
+        self.pheromone = np.zeros((2, MAP_SIZE, MAP_SIZE), dtype=np.float64)
+        self.building_tag = np.full((MAP_SIZE, MAP_SIZE), BuildingType.EMPTY, dtype=np.int8)
         self.super_weapons: List[SuperWeapon] = []
-        self.super_weapon_cd = [[0 for _ in range(5)] for _ in range(2)]
+        self.super_weapon_cd = np.zeros((2, 5), dtype=np.int64)
         self.old_count = [0, 0]
         self.die_count = [0, 0]
         self.next_ant_id = 0
@@ -367,10 +383,10 @@ class GameInfo:
         for player in range(2):
             for x in range(MAP_SIZE):
                 for y in range(MAP_SIZE):
-                    self.pheromone[player][x][y] = rng.get() * pow(2, -46) + 8
+                    self.pheromone[player, x, y] = rng.get() * pow(2, -46) + 8
         for player in range(2):
             bx, by = BASE_POS[player]
-            self.building_tag[bx][by] = BuildingType.BASE
+            self.building_tag[bx, by] = BuildingType.BASE
 
     def clone(self) -> GameInfo:
         copied = object.__new__(GameInfo)
@@ -380,16 +396,107 @@ class GameInfo:
         copied.ants = [ant.clone() for ant in self.ants]
         copied.bases = [base.clone() for base in self.bases]
         copied.coins = list(self.coins)
-        copied.pheromone = [[[self.pheromone[p][x][y] for y in range(MAP_SIZE)] for x in range(MAP_SIZE)] for p in range(2)]
-        copied.building_tag = [[self.building_tag[x][y] for y in range(MAP_SIZE)] for x in range(MAP_SIZE)]
+        copied.pheromone = self.pheromone.copy()
+        copied.building_tag = self.building_tag.copy()
         copied.super_weapons = [weapon.clone() for weapon in self.super_weapons]
-        copied.super_weapon_cd = [list(row) for row in self.super_weapon_cd]
+        copied.super_weapon_cd = self.super_weapon_cd.copy()
         copied.old_count = list(self.old_count)
         copied.die_count = list(self.die_count)
         copied.next_ant_id = self.next_ant_id
         copied.next_tower_id = self.next_tower_id
         return copied
 
+    def state_hash(self) -> int:
+        """Hash of everything that can influence later rounds; equal states hash equal."""
+        return hash(
+            (
+                self.round,
+                tuple((tower.id, tower.player, tower.x, tower.y, int(tower.type), tower.cd, tower.emp, tower.hp) for tower in self.towers),
+                tuple(
+                    (
+                        ant.id,
+                        ant.player,
+                        ant.x,
+                        ant.y,
+                        ant.hp,
+                        ant.level,
+                        ant.age,
+                        int(ant.state),
+                        ant.evasion,
+                        ant.deflector,
+                        ant.last_move,
+                        ant.path_len_total,
+                        int(ant.kind),
+                        tuple(ant.trail_cells),
+                    )
+                    for ant in self.ants
+                ),
+                tuple((base.hp, base.gen_speed_level, base.ant_level) for base in self.bases),
+                tuple((int(weapon.type), weapon.player, weapon.x, weapon.y, weapon.left_time, weapon.range) for weapon in self.super_weapons),
+                tuple(self.coins),
+                tuple(self.old_count),
+                tuple(self.die_count),
+                self.next_ant_id,
+                self.next_tower_id,
+                self.pheromone.tobytes(),
+                self.building_tag.tobytes(),
+                self.super_weapon_cd.tobytes(),
+            )
+        )
+
+    def graft(self, source: GameInfo, origin: GameInfo, snapshot: GameInfo, player: int) -> None:
+        """Become ``source`` carried along the idle trajectory ``origin`` -> ``snapshot``.
+
+        ``source`` may differ from ``origin`` only in ``player``'s towers, coins, building tags and
+        base levels, and none of the differing towers may have had a target on the way.
+        """
+        elapsed = snapshot.round - origin.round
+        towers: List[Tower] = []
+        for tower in source.towers:
+            if tower.player != player:
+                continue
+            before = origin.tower_of_id(tower.id)
+            if before is not None and (before.x, before.y, before.type, before.cd, before.hp, before.emp) == (
+                tower.x,
+                tower.y,
+                tower.type,
+                tower.cd,
+                tower.hp,
+                tower.emp,
+            ):
+                carried = snapshot.tower_of_id(tower.id)
+                if carried is not None:
+                    towers.append(carried.clone())
+                    continue
+            moved = tower.clone()
+            for step in range(1, elapsed + 1):
+                moved.emp = any(
+                    weapon.left_time - step > 0
+                    and weapon.type == SuperWeaponType.EMP_BLASTER
+                    and weapon.player != player
+                    and weapon.in_range(moved.x, moved.y)
+                    for weapon in origin.super_weapons
+                )
+                if not moved.emp and moved.cd > 0:
+                    moved.cd -= 1
+            towers.append(moved)
+
+        self.round = snapshot.round
+        self.towers = towers
+        self.ants = [ant.clone() for ant in snapshot.ants]
+        self.bases = [base.clone() for base in snapshot.bases]
+        self.bases[player].gen_speed_level = source.bases[player].gen_speed_level
+        self.bases[player].ant_level = source.bases[player].ant_level
+        self.coins = [snapshot.coins[side] + source.coins[side] - origin.coins[side] for side in range(2)]
+        self.pheromone = snapshot.pheromone.copy()
+        self.building_tag = source.building_tag.copy()
+        self.super_weapons = [weapon.clone() for weapon in snapshot.super_weapons]
+        self.super_weapon_cd = snapshot.super_weapon_cd.copy()
+        self.old_count = list(snapshot.old_count)
+        self.die_count = list(snapshot.die_count)
+        self.next_ant_id = snapshot.next_ant_id
+        self.next_tower_id = source.next_tower_id
+
     def tower_num_of_player(self, player: int) -> int:
         return sum(1 for tower in self.towers if tower.player == player)
 
@@ -407,7 +514,7 @@ class GameInfo:
 
     def build_tower(self, tower_id: int, player: int, x: int, y: int, tower_type: TowerType = TowerType.BASIC) -> None:
         self.towers.append(Tower(tower_id, player, x, y, tower_type))
-        self.building_tag[x][y] = BuildingType.TOWER
+        self.building_tag[x, y] = BuildingType.TOWER
 
     def upgrade_tower(self, tower_id: int, tower_type: TowerType) -> None:
         tower = self.tower_of_id(tower_id)
@@ -421,7 +528,7 @@ class GameInfo:
             if tower.is_downgrade_valid():
                 tower.downgrade()
             else:
-                self.building_tag[tower.x][tower.y] = BuildingType.EMPTY
+                self.building_tag[tower.x, tower.y] = BuildingType.EMPTY
                 self.towers.pop(idx)
             return
 
@@ -463,16 +570,15 @@ class GameInfo:
             AntState.TOO_OLD: -3.0,
         }
         delta = trail_gain.get(ant.state, 0.0)
-        seen = [[False for _ in range(MAP_SIZE)] for _ in range(MAP_SIZE)]
+        pheromone = self.pheromone[ant.player]
+        seen: set[tuple[int, int]] = set()
         for x, y in reversed(_trail_for_pheromone(ant)):
             if not (0 <= x < MAP_SIZE and 0 <= y < MAP_SIZE):
                 continue
-            if seen[x][y]:
+            if (x, y) in seen:
                 continue
-            seen[x][y] = True
-            self.pheromone[ant.player][x][y] += delta
-            if self.pheromone[ant.player][x][y] < PHEROMONE_MIN:
-                self.pheromone[ant.player][x][y] = PHEROMONE_MIN
+            seen.add((x, y))
+            pheromone[x, y] = max(pheromone[x, y] + delta, PHEROMONE_MIN)
 
     def update_pheromone_for_ants(self) -> None:
         for ant in self.ants:
@@ -480,13 +586,11 @@ class GameInfo:
 
     def global_pheromone_attenuation(self) -> None:
         for player in range(2):
-            for x in range(MAP_SIZE):
-                for y in range(MAP_SIZE):
-                    if MAP_PROPERTY[x][y] >= 0:
-                        self.pheromone[player][x][y] = (
-                            PHEROMONE_ATTENUATING_RATIO * self.pheromone[player][x][y]
-                            + (1 - PHEROMONE_ATTENUATING_RATIO) * PHEROMONE_INIT
-                        )
+            self.attenuate_pheromone(player)
+
+    def attenuate_pheromone(self, player: int) -> None:
+        pheromone = self.pheromone[player]
+        pheromone[ATTENUATED_MASK] = PHEROMONE_ATTENUATING_RATIO * pheromone[ATTENUATED_MASK] + PHEROMONE_ATTENUATION_OFFSET
 
     def is_shielded_by_emp(self, player: int, x: int, y: int) -> bool:
         return any(
@@ -508,7 +612,7 @@ class GameInfo:
             return (
                 is_valid_pos(op.arg0, op.arg1)
                 and is_highland(player, op.arg0, op.arg1)
-                and self.building_tag[op.arg0][op.arg1] == BuildingType.EMPTY
+                and self.building_tag[op.arg0, op.arg1] == BuildingType.EMPTY
                 and not self.is_shielded_by_emp(player, op.arg0, op.arg1)
             )
         if op.type == OperationType.UPGRADE_TOWER:
@@ -628,13 +732,10 @@ class GameInfo:
         current = hex_distance(ant.x, ant.y, target_x, target_y)
         weighted = [[-1.0, -1.0] for _ in range(6)]
         attraction = (1.25, 1.0, 0.75)
-        for idx, (off_x, off_y) in enumerate(OFFSET[ant.y % 2]):
-            x = ant.x + off_x
-            y = ant.y + off_y
+        pheromone = self.pheromone[ant.player]
+        for idx, x, y in PATH_NEIGHBORS[ant.x][ant.y]:
             if ant.last_move == (idx + 3) % 6:
                 continue
-            if not is_path(x, y):
-                continue
             next_dist = hex_distance(x, y, target_x, target_y)
             gain = attraction[next_dist - current + 1]
             storm_penalty = 0.0
@@ -648,8 +749,9 @@ class GameInfo:
                     effect_pull += DEFLECTOR_PATH_ATTRACTION
                 elif weapon.player == ant.player and weapon.type == SuperWeaponType.EMERGENCY_EVASION:
                     effect_pull += EMERGENCY_EVASION_PATH_ATTRACTION
-            weighted[idx][0] = gain * self.pheromone[ant.player][x][y] + effect_pull - storm_penalty
-            weighted[idx][1] = self.pheromone[ant.player][x][y]
+            level = float(pheromone[x, y])
+            weighted[idx][0] = gain * level + effect_pull - storm_penalty
+            weighted[idx][1] = level
         return max(range(6), key=lambda idx: (weighted[idx][0], weighted[idx][1], -idx))
 
     @staticmethod
@@ -736,6 +838,16 @@ class Simulator:
         copied.operations = [list(self.operations[0]), list(self.operations[1])]
         return copied
 
+    def state_hash(self) -> int:
+        return self.info.state_hash()
+
+    def ant_cells(self, player: int) -> List[tuple[int, int]]:
+        return [(ant.x, ant.y) for ant in self.info.ants if ant.player == player]
+
+    def graft(self, source: Simulator, origin: Simulator, snapshot: Simulator, player: int) -> None:
+        self.info.graft(source.info, origin.info, snapshot.info, player)
+        self.operations[player].clear()
+
     def add_operation_of_player(self, player: int, op: Operation) -> bool:
         if self.info.is_operation_sequence_valid(player, self.operations[player], op):
             self.operations[player].append(op)
@@ -747,6 +859,45 @@ class Simulator:
             self.info.apply_operation(player, op)
 
     def fast_next_round(self, perspective: int) -> bool:
+        return self._play_round(perspective, prune=True)
+
+    def fast_forward(
+        self,
+        rounds: int,
+        perspective: int,
+        *,
+        stop_when: Callable[[GameInfo], bool] | None = None,
+        anchor: tuple[int, int] | None = None,
+        stop_base_hp: tuple[int, int] | None = None,
+    ) -> ForecastTrace:
+        info = self.info
+        enemy = 1 - perspective
+        anchor_x, anchor_y = anchor if anchor is not None else BASE_POS[perspective]
+        stop_player, stop_hp = stop_base_hp if stop_base_hp is not None else (-1, 0)
+        trace = ForecastTrace()
+        prune = True
+        for _ in range(rounds):
+            if not self._play_round(perspective, prune=prune):
+                trace.halted = True
+                break
+            # Pruning only drops entities operations could have added; none are applied here.
+            prune = False
+            nearest = 32
+            for ant in info.ants:
+                if ant.player == enemy:
+                    nearest = min(nearest, hex_distance(ant.x, ant.y, anchor_x, anchor_y))
+            trace.base_hp.append((info.bases[0].hp, info.bases[1].hp))
+            trace.coins.append((info.coins[0], info.coins[1]))
+            trace.nearest_hostile.append(nearest)
+            if stop_player >= 0 and info.bases[stop_player].hp <= stop_hp:
+                trace.stopped = True
+                break
+            if stop_when is not None and stop_when(info):
+                trace.stopped = True
+                break
+        return trace
+
+    def _play_round(self, perspective: int, *, prune: bool) -> bool:
         if self.info.round >= MAX_ROUND:
             return False
 
@@ -772,8 +923,9 @@ class Simulator:
                 surviving_towers.append(tower)
             self.info.towers = surviving_towers
 
-        self.info.ants = [ant for ant in self.info.ants if ant.player != perspective]
-        self.info.towers = [tower for tower in self.info.towers if tower.player == perspective]
+        if prune:
+            self.info.ants = [ant for ant in self.info.ants if ant.player != perspective]
+            self.info.towers = [tower for tower in self.info.towers if tower.player == perspective]
 
         for ant in self.info.ants:
             ant.deflector = False
@@ -823,10 +975,7 @@ class Simulator:
                 ant.state = AntState.ALIVE
 
         enemy = 1 - perspective
-        for x in range(MAP_SIZE):
-            for y in range(MAP_SIZE):
-                if MAP_PROPERTY[x][y] >= 0:
-                    self.info.pheromone[enemy][x][y] = PHEROMONE_ATTENUATING_RATIO * self.info.pheromone[enemy][x][y] + (1 - PHEROMONE_ATTENUATING_RATIO) * PHEROMONE_INIT
+        self.info.attenuate_pheromone(enemy)
         for ant in self.info.ants:
             self.info.update_pheromone(ant)
 
@@ -861,6 +1010,59 @@ class Simulator:
         return True
 
 
+def _forecast_tower(tower) -> Tower:
+    return Tower(
+        id=tower.tower_id,
+        player=tower.player,
+        x=tower.x,
+        y=tower.y,
+        type=TowerType(int(tower.tower_type)),
+        cd=tower.display_cooldown(),
+    )
+
+
+def _forecast_ant(ant) -> Ant:
+    return Ant(
+        id=ant.ant_id,
+        player=ant.player,
+        x=ant.x,
+        y=ant.y,
+        hp=ant.hp,
+        level=ant.level,
+        age=ant.age,
+        state=AntState(int(ant.status)),
+        evasion=2 if ant.evasion else 0,
+        deflector=bool(ant.deflector),
+        trail_cells=list(ant.trail_cells),
+        last_move=int(ant.last_move),
+        path_len_total=int(ant.path_len_total),
+        kind=AntKind(int(ant.kind)),
+    )
+
+
+def _forecast_weapons(state) -> List[SuperWeapon]:
+    weapons: List[SuperWeapon] = []
+    for effect in state.active_effects:
+        weapon = SuperWeapon(
+            type=SuperWeaponType(int(effect.weapon_type)),
+            player=effect.player,
+            x=effect.x,
+            y=effect.y,
+        )
+        weapon.left_time = effect.remaining_turns
+        weapons.append(weapon)
+    return weapons
+
+
+def _building_tags(bases: Sequence[Base], towers: Sequence[Tower]) -> np.ndarray:
+    tags = np.full((MAP_SIZE, MAP_SIZE), BuildingType.EMPTY, dtype=np.int8)
+    for base in bases:
+        tags[base.x, base.y] = BuildingType.BASE
+    for tower in towers:
+        tags[tower.x, tower.y] = BuildingType.TOWER
+    return tags
+
+
 def build_forecast_state(state) -> GameInfo:
     info = GameInfo(int(state.seed))
     info.round = int(state.round_index)
@@ -869,8 +1071,7 @@ def build_forecast_state(state) -> GameInfo:
     info.die_count = [int(value) for value in state.die_count]
     info.next_ant_id = int(state.next_ant_id)
     info.next_tower_id = int(state.next_tower_id)
-    info.super_weapon_cd = [[int(value) for value in row] for row in state.weapon_cooldowns.tolist()]
-
+    info.super_weapon_cd = np.array(state.weapon_cooldowns, dtype=np.int64)
     info.bases = [
         Base(
             player=base.player,
@@ -882,64 +1083,117 @@ def build_forecast_state(state) -> GameInfo:
         )
         for base in state.bases
     ]
+    info.towers = [_forecast_tower(tower) for tower in state.towers]
+    info.building_tag = _building_tags(info.bases, info.towers)
+    info.ants = [_forecast_ant(ant) for ant in state.ants]
+    info.pheromone = np.asarray(state.pheromone) / float(PHEROMONE_SCALE)
+    info.super_weapons = _forecast_weapons(state)
+    return info
 
-    info.building_tag = [[BuildingType.EMPTY for _ in range(MAP_SIZE)] for _ in range(MAP_SIZE)]
-    for base in info.bases:
-        info.building_tag[base.x][base.y] = BuildingType.BASE
-
-    info.towers = []
-    for tower in state.towers:
-        info.towers.append(
-            Tower(
-                id=tower.tower_id,
-                player=tower.player,
-                x=tower.x,
-                y=tower.y,
-                type=TowerType(int(tower.tower_type)),
-                cd=tower.display_cooldown(),
-            )
-        )
-        info.building_tag[tower.x][tower.y] = BuildingType.TOWER
-
-    info.ants = [
-        Ant(
-            id=ant.ant_id,
-            player=ant.player,
-            x=ant.x,
-            y=ant.y,
-            hp=ant.hp,
-            level=ant.level,
-            age=ant.age,
-            state=AntState(int(ant.status)),
-            evasion=2 if ant.evasion else 0,
-            deflector=bool(ant.deflector),
-            trail_cells=list(ant.trail_cells),
-            last_move=int(ant.last_move),
-            path_len_total=int(ant.path_len_total),
-            kind=AntKind(int(ant.kind)),
-        )
-        for ant in state.ants
-    ]
 
-    info.pheromone = [
-        [
-            [state.pheromone[player, x, y] / float(PHEROMONE_SCALE) for y in range(MAP_SIZE)]
-            for x in range(MAP_SIZE)
-        ]
-        for player in range(2)
-    ]
+class ForecastMirror:
+    """Persistent GameInfo kept equal to build_forecast_state(state) by patching what changed.
 
-    info.super_weapons = []
-    for effect in state.active_effects:
-        weapon = SuperWeapon(
-            type=SuperWeaponType(int(effect.weapon_type)),
-            player=effect.player,
-            x=effect.x,
-            y=effect.y,
-        )
-        weapon.left_time = effect.remaining_turns
-        info.super_weapons.append(weapon)
-    return info
+    The mirrored info is shared between turns: read it, or clone it before simulating.
+    """
+
+    __slots__ = ("info", "_towers", "_ants")
+
+    def __init__(self, state) -> None:
+        self.info = build_forecast_state(state)
+        self._towers = {
+            tower.id: (_tower_key(source), tower) for source, tower in zip(state.towers, self.info.towers)
+        }
+        self._ants = {ant.id: ant for ant in self.info.ants}
+
+    def sync(self, state) -> GameInfo:
+        info = self.info
+        info.round = int(state.round_index)
+        info.coins = [int(value) for value in state.coins]
+        info.old_count = [int(value) for value in state.old_count]
+        info.die_count = [int(value) for value in state.die_count]
+        info.next_ant_id = int(state.next_ant_id)
+        info.next_tower_id = int(state.next_tower_id)
+        info.super_weapon_cd[...] = state.weapon_cooldowns
+        for base, source in zip(info.bases, state.bases):
+            base.hp = source.hp
+            base.gen_speed_level = source.generation_level
+            base.ant_level = source.ant_level
+        self._sync_towers(state.towers)
+        self._sync_ants(state.ants)
+        np.divide(state.pheromone, float(PHEROMONE_SCALE), out=info.pheromone)
+        info.super_weapons = _forecast_weapons(state)
+        return info
+
+    def _sync_towers(self, sources) -> None:
+        cached = self._towers
+        towers: dict[int, tuple[tuple[int, ...], Tower]] = {}
+        layout_changed = len(sources) != len(cached)
+        for source in sources:
+            key = _tower_key(source)
+            entry = cached.get(source.tower_id)
+            if entry is None or entry[0] != key:
+                if entry is None or entry[0][1:4] != key[1:4]:
+                    layout_changed = True
+                entry = (key, _forecast_tower(source))
+            towers[source.tower_id] = entry
+        self._towers = towers
+        self.info.towers = [tower for _, tower in towers.values()]
+        if layout_changed:
+            self.info.building_tag = _building_tags(self.info.bases, self.info.towers)
+
+    def _sync_ants(self, sources) -> None:
+        cached = self._ants
+        ants: dict[int, Ant] = {}
+        for source in sources:
+            ant = cached.get(source.ant_id)
+            if ant is None:
+                ant = _forecast_ant(source)
+            else:
+                ant.x = source.x
+                ant.y = source.y
+                ant.hp = source.hp
+                ant.level = source.level
+                ant.age = source.age
+                ant.state = AntState(int(source.status))
+                ant.evasion = 2 if source.evasion else 0
+                ant.deflector = bool(source.deflector)
+                ant.last_move = int(source.last_move)
+                ant.path_len_total = int(source.path_len_total)
+                ant.kind = AntKind(int(source.kind))
+                trail = ant.trail_cells
+                known = len(trail)
+                if source.trail_cells[:known] == trail:
+                    trail.extend(source.trail_cells[known:])
+                else:
+                    trail[:] = source.trail_cells
+            ants[source.ant_id] = ant
+        self._ants = ants
+        self.info.ants = list(ants.values())
+
+
+def _tower_key(tower) -> tuple[int, ...]:
+    return (tower.tower_id, tower.player, tower.x, tower.y, int(tower.tower_type), tower.display_cooldown())
+
+
+FORECAST_BACKENDS = ("python", "native", "auto")
+
+
+def load_forecast_simulator(backend: str = "auto"):
+    """Return the simulator class for ``backend``; "auto" prefers native and falls back to Python."""
+    if backend not in FORECAST_BACKENDS:
+        raise ValueError(f"unknown forecast backend: {backend!r}")
+    if backend == "python":
+        return Simulator
+    try:
+        from SDK.native_adapter import NativeForecastSimulator
+    except Exception as exc:  # pragma: no cover - optional acceleration path
+        if backend == "native":
+            from SDK.backend.core import NativeBackendUnavailable
+
+            raise NativeBackendUnavailable(str(exc)) from exc
+        return Simulator
+    return NativeForecastSimulator
 
 
 ForecastState = GameInfo
@@ -953,9 +1207,12 @@ __all__ = [
     "BASE_POS",
     "Base",
     "BuildingType",
+    "FORECAST_BACKENDS",
+    "ForecastMirror",
     "ForecastOperation",
     "ForecastSimulator",
     "ForecastState",
+    "ForecastTrace",
     "GameInfo",
     "MAP_PROPERTY",
     "MAP_SIZE",
@@ -970,4 +1227,5 @@ __all__ = [
     "build_forecast_state",
     "hex_distance",
     "is_valid_pos",
+    "load_forecast_simulator",
 ]
@@ -3,7 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable
 
+from SDK.backend.checksum import public_state_checksum
 from SDK.backend.core import EngineBackend, load_backend
+from SDK.backend.forecast import ForecastMirror, GameInfo
 from SDK.backend.state import BackendState
 from SDK.backend.engine import PublicRoundState
 from SDK.backend.model import Operation
@@ -13,6 +15,11 @@ from SDK.backend.model import Operation
 class MatchRuntime:
     player: int
     state: BackendState
+    verify_checksums: bool = False
+    checksum_checks: int = 0
+    checksum_mismatches: int = 0
+    forecast: ForecastMirror | None = None
+    forecast_dirty: bool = True
 
     @classmethod
     def create(
@@ -22,15 +29,17 @@ class MatchRuntime:
         *,
         prefer_native: bool = False,
         backend: EngineBackend | None = None,
+        verify_checksums: bool = False,
     ) -> MatchRuntime:
         engine = backend or load_backend(prefer_native=prefer_native)
-        return cls(player=player, state=engine.initial_state(seed=seed))
+        return cls(player=player, state=engine.initial_state(seed=seed), verify_checksums=verify_checksums)
 
     @property
     def opponent(self) -> int:
         return 1 - self.player
 
     def apply_operations(self, player: int, operations: Iterable[Operation]) -> list[Operation]:
+        self.forecast_dirty = True
         return self.state.apply_operation_list(player, operations)
 
     def apply_self_operations(self, operations: Iterable[Operation]) -> list[Operation]:
@@ -39,6 +48,30 @@ class MatchRuntime:
     def apply_opponent_operations(self, operations: Iterable[Operation]) -> list[Operation]:
         return self.apply_operations(self.opponent, operations)
 
+    def forecast_state(self) -> GameInfo:
+        if self.forecast is None:
+            self.forecast = ForecastMirror(self.state)
+        elif self.forecast_dirty:
+            self.forecast.sync(self.state)
+        self.forecast_dirty = False
+        return self.forecast.info
+
+    def fork(self) -> MatchRuntime:
+        return MatchRuntime(player=self.player, state=self.state.clone())
+
+    def finish_round_locally(self) -> PublicRoundState:
+        """Finish the round as if the judge's public state agreed with the local engine."""
+        self.forecast_dirty = True
+        self.state.advance_round()
+        public_round_state = self.state.to_public_round_state()
+        self.state.sync_public_round_state(public_round_state)
+        return public_round_state
+
     def finish_round(self, public_round_state: PublicRoundState) -> None:
+        self.forecast_dirty = True
         self.state.advance_round()
+        if self.verify_checksums:
+            self.checksum_checks += 1
+            if self.state.checksum(public_only=True) != public_state_checksum(public_round_state):
+                self.checksum_mismatches += 1
         self.state.sync_public_round_state(public_round_state)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from SDK.backend.model import Ant, Base, Tower, WeaponEffect
+from SDK.utils.constants import MAP_SIZE, PLAYER_COUNT, AntBehavior, AntKind, AntStatus, SuperWeaponType, TowerType
+
+if TYPE_CHECKING:
+    from SDK.backend.engine import GameState
+
+# Layout (all little-endian):
+#   header     HEADER_STRUCT
+#   towers     TOWER_DTYPE  x tower_count
+#   ants       ANT_DTYPE    x ant_count
+#   bases      BASE_DTYPE   x base_count
+#   effects    EFFECT_DTYPE x effect_count
+#   trails     int8 (trail_count, 2), concatenated in ant order
+#   fields     pheromone int32, damage/control/effect fields float32, weapon cooldowns int16
+SNAPSHOT_MAGIC = b"AWGS"
+SNAPSHOT_VERSION = 1
+
+HEADER_STRUCT = struct.Struct("<4sHBBqiiiiQ10q5I")
+
+FLAG_COLD_HANDLE_RULE_ILLEGAL = 1
+FLAG_TERMINAL = 2
+FLAG_RISK_FIELDS_DIRTY = 4
+
+MOVEMENT_POLICY_CODES = {"legacy": 0, "enhanced": 1}
+MOVEMENT_POLICY_NAMES = {code: name for name, code in MOVEMENT_POLICY_CODES.items()}
+
+ANT_FLAG_EVASION_GRANTS_CONTROL_FREE = 1
+ANT_FLAG_DEFLECTOR = 2
+ANT_FLAG_FROZEN = 4
+ANT_FLAG_EVASION = 8
+
+TOWER_DTYPE = np.dtype(
+    [
+        ("tower_id", "<i4"),
+        ("player", "i1"),
+        ("x", "i1"),
+        ("y", "i1"),
+        ("tower_type", "<i2"),
+        ("cooldown_clock", "<f8"),
+        ("hp", "<i4"),
+    ]
+)
+ANT_DTYPE = np.dtype(
+    [
+        ("ant_id", "<i4"),
+        ("player", "i1"),
+        ("x", "i1"),
+        ("y", "i1"),
+        ("hp", "<i4"),
+        ("level", "i1"),
+        ("kind", "i1"),
+        ("age", "<i4"),
+        ("status", "i1"),
+        ("last_move", "i1"),
+        ("path_len_total", "<i4"),
+        ("shield", "<i4"),
+        ("flags", "u1"),
+        ("behavior", "i1"),
+        ("behavior_turns", "<i4"),
+        ("behavior_expiry", "<i4"),
+        ("bewitch_target_x", "i1"),
+        ("bewitch_target_y", "i1"),
+        ("pending_behavior", "i1"),
+        ("trail_length", "<i4"),
+    ]
+)
+BASE_DTYPE = np.dtype(
+    [
+        ("player", "i1"),
+        ("x", "i1"),
+        ("y", "i1"),
+        ("hp", "<i4"),
+        ("generation_level", "i1"),
+        ("ant_level", "i1"),
+    ]
+)
+EFFECT_DTYPE = np.dtype(
+    [
+        ("weapon_type", "i1"),
+        ("player", "i1"),
+        ("x", "i1"),
+        ("y", "i1"),
+        ("remaining_turns", "<i4"),
+        ("last_trigger_round", "<i4"),
+    ]
+)
+FIELD_LAYOUT = (
+    ("pheromone", np.dtype("<i4"), (PLAYER_COUNT, MAP_SIZE, MAP_SIZE)),
+    ("damage_risk_field", np.dtype("<f4"), (PLAYER_COUNT, MAP_SIZE, MAP_SIZE)),
+    ("control_risk_field", np.dtype("<f4"), (PLAYER_COUNT, MAP_SIZE, MAP_SIZE)),
+    ("effect_pull_field", np.dtype("<f4"), (PLAYER_COUNT, MAP_SIZE, MAP_SIZE)),
+    ("weapon_cooldowns", np.dtype("<i2"), (PLAYER_COUNT, 5)),
+)
+
+
+def _field_slots() -> tuple[tuple[str, np.dtype, tuple[int, ...], int, int], ...]:
+    slots = []
+    offset = 0
+    for name, dtype, shape in FIELD_LAYOUT:
+        count = int(np.prod(shape))
+        slots.append((name, dtype, shape, count, offset))
+        offset += dtype.itemsize * count
+    return tuple(slots)
+
+
+FIELD_SLOTS = _field_slots()
+FIELD_BLOCK_SIZE = sum(dtype.itemsize * count for _, dtype, _, count, _ in FIELD_SLOTS)
+
+_TOWER_TYPES = {int(member): member for member in TowerType}
+_ANT_KINDS = {int(member): member for member in AntKind}
+_ANT_STATUSES = {int(member): member for member in AntStatus}
+_ANT_BEHAVIORS = {int(member): member for member in AntBehavior}
+_WEAPON_TYPES = {int(member): member for member in SuperWeaponType}
+
+
+def _ant_row(ant: Ant) -> tuple:
+    flags = (
+        (ANT_FLAG_EVASION_GRANTS_CONTROL_FREE if ant.evasion_grants_control_free else 0)
+        | (ANT_FLAG_DEFLECTOR if ant.deflector else 0)
+        | (ANT_FLAG_FROZEN if ant.frozen else 0)
+        | (ANT_FLAG_EVASION if ant.evasion else 0)
+    )
+    return (
+        ant.ant_id,
+        ant.player,
+        ant.x,
+        ant.y,
+        ant.hp,
+        ant.level,
+        ant.kind,
+        ant.age,
+        ant.status,
+        ant.last_move,
+        ant.path_len_total,
+        ant.shield,
+        flags,
+        ant.behavior,
+        ant.behavior_turns,
+        ant.behavior_expiry,
+        ant.bewitch_target_x,
+        ant.bewitch_target_y,
+        -1 if ant.pending_behavior is None else ant.pending_behavior,
+        len(ant.trail_cells),
+    )
+
+
+def encode_state(state: GameState) -> bytes:
+    towers = np.array(
+        [
+            (tower.tower_id, tower.player, tower.x, tower.y, tower.tower_type, tower.cooldown_clock, tower.hp)
+            for tower in state.towers
+        ],
+        dtype=TOWER_DTYPE,
+    )
+    ants = np.array([_ant_row(ant) for ant in state.ants], dtype=ANT_DTYPE)
+    bases = np.array(
+        [(base.player, base.x, base.y, base.hp, base.generation_level, base.ant_level) for base in state.bases],
+        dtype=BASE_DTYPE,
+    )
+    effects = np.array(
+        [
+            (effect.weapon_type, effect.player, effect.x, effect.y, effect.remaining_turns, effect.last_trigger_round)
+            for effect in state.active_effects
+        ],
+        dtype=EFFECT_DTYPE,
+    )
+    trails = np.array([cell for ant in state.ants for cell in ant.trail_cells], dtype=np.int8).reshape(-1, 2)
+    flags = (
+        (FLAG_COLD_HANDLE_RULE_ILLEGAL if state.cold_handle_rule_illegal else 0)
+        | (FLAG_TERMINAL if state.terminal else 0)
+        | (FLAG_RISK_FIELDS_DIRTY if state.risk_fields_dirty else 0)
+    )
+    header = HEADER_STRUCT.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        flags,
+        MOVEMENT_POLICY_CODES[state.movement_policy],
+        state.seed,
+        state.round_index,
+        state.next_ant_id,
+        state.next_tower_id,
+        -1 if state.winner is None else state.winner,
+        state.rng_state,
+        *state.coins,
+        *state.old_count,
+        *state.die_count,
+        *state.super_weapon_usage,
+        *state.ai_time,
+        len(towers),
+        len(ants),
+        len(bases),
+        len(effects),
+        len(trails),
+    )
+    chunks = [header, towers.tobytes(), ants.tobytes(), bases.tobytes(), effects.tobytes(), trails.tobytes()]
+    for name, dtype, shape in FIELD_LAYOUT:
+        chunks.append(np.ascontiguousarray(getattr(state, name), dtype=dtype).tobytes())
+    return b"".join(chunks)
+
+
+def decode_state(data: bytes | bytearray | memoryview) -> GameState:
+    from SDK.backend.engine import GameState
+
+    buffer = memoryview(data)
+    if len(buffer) < HEADER_STRUCT.size:
+        raise ValueError("state snapshot is truncated")
+    (
+        magic,
+        version,
+        flags,
+        policy_code,
+        seed,
+        round_index,
+        next_ant_id,
+        next_tower_id,
+        winner,
+        rng_state,
+        coins0,
+        coins1,
+        old0,
+        old1,
+        die0,
+        die1,
+        usage0,
+        usage1,
+        time0,
+        time1,
+        tower_count,
+        ant_count,
+        base_count,
+        effect_count,
+        trail_count,
+    ) = HEADER_STRUCT.unpack_from(buffer)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a game state snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported state snapshot version {version}")
+
+    offset = HEADER_STRUCT.size
+
+    def take(dtype: np.dtype, count: int) -> np.ndarray:
+        nonlocal offset
+        table = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        offset += dtype.itemsize * count
+        return table
+
+    tower_rows = take(TOWER_DTYPE, tower_count).tolist()
+    ant_rows = take(ANT_DTYPE, ant_count).tolist()
+    base_rows = take(BASE_DTYPE, base_count).tolist()
+    effect_rows = take(EFFECT_DTYPE, effect_count).tolist()
+    trails = take(np.dtype("i1"), trail_count * 2)
+    trail_x = trails[0::2].tolist()
+    trail_y = trails[1::2].tolist()
+    if len(buffer) - offset != FIELD_BLOCK_SIZE:
+        raise ValueError("state snapshot field block has the wrong size")
+    # One writable copy of the whole field block; every array is a view into it.
+    block = bytearray(buffer[offset:])
+    fields = {
+        name: np.frombuffer(block, dtype=dtype, count=count, offset=field_offset).reshape(shape)
+        for name, dtype, shape, count, field_offset in FIELD_SLOTS
+    }
+
+    towers = [
+        Tower(tower_id, player, x, y, _TOWER_TYPES[tower_type], cooldown_clock, hp)
+        for tower_id, player, x, y, tower_type, cooldown_clock, hp in tower_rows
+    ]
+    ants: list[Ant] = []
+    cursor = 0
+    for (
+        ant_id,
+        player,
+        x,
+        y,
+        hp,
+        level,
+        kind,
+        age,
+        status,
+        last_move,
+        path_len_total,
+        shield,
+        ant_flags,
+        behavior,
+        behavior_turns,
+        behavior_expiry,
+        bewitch_target_x,
+        bewitch_target_y,
+        pending_behavior,
+        trail_length,
+    ) in ant_rows:
+        end = cursor + trail_length
+        ants.append(
+            Ant(
+                ant_id,
+                player,
+                x,
+                y,
+                hp,
+                level,
+                _ANT_KINDS[kind],
+                age,
+                _ANT_STATUSES[status],
+                list(zip(trail_x[cursor:end], trail_y[cursor:end])),
+                last_move,
+                path_len_total,
+                shield,
+                bool(ant_flags & ANT_FLAG_EVASION_GRANTS_CONTROL_FREE),
+                bool(ant_flags & ANT_FLAG_DEFLECTOR),
+                bool(ant_flags & ANT_FLAG_FROZEN),
+                bool(ant_flags & ANT_FLAG_EVASION),
+                _ANT_BEHAVIORS[behavior],
+                behavior_turns,
+                behavior_expiry,
+                bewitch_target_x,
+                bewitch_target_y,
+                None if pending_behavior < 0 else _ANT_BEHAVIORS[pending_behavior],
+            )
+        )
+        cursor = end
+    bases = [Base(*row) for row in base_rows]
+    effects = [
+        WeaponEffect(_WEAPON_TYPES[weapon_type], player, x, y, remaining_turns, last_trigger_round)
+        for weapon_type, player, x, y, remaining_turns, last_trigger_round in effect_rows
+    ]
+    return GameState(
+        seed=seed,
+        movement_policy=MOVEMENT_POLICY_NAMES[policy_code],
+        cold_handle_rule_illegal=bool(flags & FLAG_COLD_HANDLE_RULE_ILLEGAL),
+        round_index=round_index,
+        towers=towers,
+        ants=ants,
+        bases=bases,
+        coins=[coins0, coins1],
+        old_count=[old0, old1],
+        die_count=[die0, die1],
+        super_weapon_usage=[usage0, usage1],
+        ai_time=[time0, time1],
+        next_ant_id=next_ant_id,
+        next_tower_id=next_tower_id,
+        terminal=bool(flags & FLAG_TERMINAL),
+        winner=None if winner < 0 else winner,
+        rng_state=rng_state,
+        risk_fields_dirty=bool(flags & FLAG_RISK_FIELDS_DIRTY),
+        **fields,
+    )
+
+
+__all__ = [
+    "SNAPSHOT_MAGIC",
+    "SNAPSHOT_VERSION",
+    "decode_state",
+    "encode_state",
+]
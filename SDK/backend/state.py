@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Iterable, Protocol, runtime_checkable
+from typing import Callable, Iterable, Protocol, runtime_checkable
 
 import numpy as np
 
-from SDK.backend.engine import DEFAULT_MOVEMENT_POLICY, GameState, PublicRoundState, TurnResolution
+from SDK.backend.engine import DEFAULT_MOVEMENT_POLICY, FastForwardTrace, GameState, PublicRoundState, TurnResolution
 from SDK.backend.model import Ant, Base, Operation, Tower, WeaponEffect
 
 
@@ -30,6 +30,8 @@ class BackendState(Protocol):
     next_tower_id: int
 
     def clone(self) -> BackendState: ...
+    def to_bytes(self) -> bytes: ...
+    def checksum(self, *, public_only: bool = False) -> int: ...
     def tower_count(self, player: int) -> int: ...
     def towers_of(self, player: int) -> list[Tower]: ...
     def ants_of(self, player: int) -> list[Ant]: ...
@@ -39,7 +41,7 @@ class BackendState(Protocol):
     def build_tower_cost(self, tower_count: int | None = None) -> int: ...
     def upgrade_tower_cost(self, target_type) -> int: ...
     def destroy_tower_income(self, tower_count: int, tower: Tower | None = None) -> int: ...
-    def downgrade_tower_income(self, tower_type) -> int: ...
+    def downgrade_tower_income(self, tower_type, tower: Tower | None = None) -> int: ...
     def upgrade_base_cost(self, level: int) -> int: ...
     def weapon_cost(self, weapon_type) -> int: ...
     def nearest_ant_distance(self, player: int) -> int: ...
@@ -59,6 +61,7 @@ class BackendState(Protocol):
     def apply_operation(self, player: int, operation: Operation) -> None: ...
     def apply_operation_list(self, player: int, operations: Iterable[Operation]) -> list[Operation]: ...
     def advance_round(self) -> None: ...
+    def fast_forward(self, rounds: int, stop_when: Callable[[GameState], bool] | None = None) -> FastForwardTrace: ...
     def resolve_turn(self, operations0: Iterable[Operation], operations1: Iterable[Operation]) -> TurnResolution: ...
     def to_public_round_state(self) -> PublicRoundState: ...
     def sync_public_round_state(self, public_state: PublicRoundState) -> None: ...
@@ -184,6 +187,16 @@ class PythonBackendState:
     def clone(self) -> PythonBackendState:
         return PythonBackendState(self._state.clone())
 
+    def to_bytes(self) -> bytes:
+        return self._state.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> PythonBackendState:
+        return cls(GameState.from_bytes(data))
+
+    def checksum(self, *, public_only: bool = False) -> int:
+        return self._state.checksum(public_only=public_only)
+
     def tower_count(self, player: int) -> int:
         return self._state.tower_count(player)
 
@@ -211,8 +224,8 @@ class PythonBackendState:
     def destroy_tower_income(self, tower_count: int, tower: Tower | None = None) -> int:
         return self._state.destroy_tower_income(tower_count, tower)
 
-    def downgrade_tower_income(self, tower_type) -> int:
-        return self._state.downgrade_tower_income(tower_type)
+    def downgrade_tower_income(self, tower_type, tower: Tower | None = None) -> int:
+        return self._state.downgrade_tower_income(tower_type, tower)
 
     def upgrade_base_cost(self, level: int) -> int:
         return self._state.upgrade_base_cost(level)
@@ -261,6 +274,9 @@ class PythonBackendState:
     def advance_round(self) -> None:
         self._state.advance_round()
 
+    def fast_forward(self, rounds: int, stop_when: Callable[[GameState], bool] | None = None) -> FastForwardTrace:
+        return self._state.fast_forward(rounds, stop_when)
+
     def resolve_turn(self, operations0: Iterable[Operation], operations1: Iterable[Operation]) -> TurnResolution:
         return self._state.resolve_turn(operations0, operations1)
 
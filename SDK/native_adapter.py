@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Callable
 
 import numpy as np
 
 from SDK import native_antwar
 from SDK.backend.engine import DEFAULT_MOVEMENT_POLICY
 from SDK.utils.constants import AntBehavior, AntKind, AntStatus, OperationType, SuperWeaponType, TowerType
-from SDK.backend.engine import GameState, PublicRoundState, TurnResolution
+from SDK.backend.engine import FastForwardTrace, GameState, PublicRoundState, TurnResolution
+from SDK.backend.forecast import (
+    BASE_POS,
+    Ant as ForecastAnt,
+    Base as ForecastBase,
+    ForecastOperation,
+    ForecastTrace,
+    GameInfo,
+    SuperWeapon,
+    Tower as ForecastTower,
+)
 from SDK.backend.model import Ant, Base, Operation, Tower, WeaponEffect
 
 
@@ -151,6 +162,9 @@ class NativeGameStateAdapter:
         clone._refresh_cache()
         return clone
 
+    def checksum(self, *, public_only: bool = False) -> int:
+        return int(self.native.checksum(public_only))
+
     def apply_operation_list(self, player: int, operations) -> list[Operation]:
         operation_list = list(operations)
         illegal = self.native.apply_operation_list(player, [_to_native_operation(operation) for operation in operation_list])
@@ -174,6 +188,18 @@ class NativeGameStateAdapter:
         self._shadow.advance_round()
         self._refresh_cache()
 
+    def fast_forward(self, rounds: int, stop_when=None) -> FastForwardTrace:
+        trace = FastForwardTrace.allocate(rounds)
+        played = 0
+        while played < rounds and not self._shadow.terminal:
+            self.advance_round()
+            trace.record(played, self._shadow)
+            played += 1
+            if stop_when is not None and stop_when(self._shadow):
+                trace.stopped = True
+                break
+        return trace.truncate(played)
+
     def resolve_turn(self, operations0, operations1) -> TurnResolution:
         operations0 = list(operations0)
         operations1 = list(operations1)
@@ -240,3 +266,221 @@ class NativeGameStateAdapter:
         )
         self._shadow.sync_public_round_state(public_state)
         self._refresh_cache()
+
+
+def _native_forecast(info: GameInfo) -> native_antwar.NativeForecast:
+    return native_antwar.NativeForecast(
+        int(info.seed),
+        int(info.round),
+        [
+            (tower.id, tower.player, tower.x, tower.y, int(tower.type), tower.cd, int(tower.emp), tower.hp)
+            for tower in info.towers
+        ],
+        [
+            (
+                ant.id,
+                ant.player,
+                ant.x,
+                ant.y,
+                ant.hp,
+                ant.level,
+                ant.age,
+                int(ant.state),
+                ant.evasion,
+                int(ant.deflector),
+                ant.last_move,
+                ant.path_len_total,
+                int(ant.kind),
+            )
+            for ant in info.ants
+        ],
+        [ant.trail_cells for ant in info.ants],
+        [(base.player, base.x, base.y, base.hp, base.gen_speed_level, base.ant_level) for base in info.bases],
+        [int(value) for value in info.coins],
+        info.pheromone,
+        info.building_tag,
+        [
+            (int(weapon.type), weapon.player, weapon.x, weapon.y, weapon.left_time, weapon.range)
+            for weapon in info.super_weapons
+        ],
+        info.super_weapon_cd,
+        [int(value) for value in info.old_count],
+        [int(value) for value in info.die_count],
+        int(info.next_ant_id),
+        int(info.next_tower_id),
+    )
+
+
+def _sync_forecast_info(info: GameInfo, native: native_antwar.NativeForecast) -> None:
+    (
+        round_index,
+        tower_rows,
+        ant_rows,
+        trails,
+        base_rows,
+        coins,
+        pheromone,
+        building_tag,
+        weapon_rows,
+        weapon_cooldowns,
+        old_count,
+        die_count,
+        next_ant_id,
+        next_tower_id,
+    ) = native.snapshot()
+    info.round = round_index
+    towers: list[ForecastTower] = []
+    for tower_id, player, x, y, tower_type, cd, emp, hp in tower_rows:
+        tower = ForecastTower(tower_id, player, x, y, TowerType(tower_type), cd, hp=hp)
+        tower.emp = bool(emp)
+        towers.append(tower)
+    info.towers = towers
+    info.ants = [
+        ForecastAnt(
+            ant_id,
+            player,
+            x,
+            y,
+            hp,
+            level,
+            age,
+            AntStatus(status),
+            evasion,
+            bool(deflector),
+            trail,
+            last_move,
+            path_len_total,
+            AntKind(kind),
+        )
+        for (ant_id, player, x, y, hp, level, age, status, evasion, deflector, last_move, path_len_total, kind), trail in zip(
+            ant_rows, trails
+        )
+    ]
+    info.bases = [ForecastBase(*row) for row in base_rows]
+    info.coins = list(coins)
+    info.pheromone = pheromone
+    info.building_tag = building_tag
+    weapons: list[SuperWeapon] = []
+    for weapon_type, player, x, y, left_time, weapon_range in weapon_rows:
+        weapon = SuperWeapon(SuperWeaponType(weapon_type), player, x, y)
+        weapon.left_time = left_time
+        weapon.range = weapon_range
+        weapons.append(weapon)
+    info.super_weapons = weapons
+    info.super_weapon_cd = weapon_cooldowns
+    info.old_count = list(old_count)
+    info.die_count = list(die_count)
+    info.next_ant_id = next_ant_id
+    info.next_tower_id = next_tower_id
+
+
+def _operation_tuple(operation: ForecastOperation) -> tuple[int, int, int]:
+    return int(operation.type), operation.arg0, operation.arg1
+
+
+class NativeForecastSimulator:
+    """ForecastSimulator backed by native_antwar.NativeForecast.
+
+    ``info`` is a GameInfo view of the native state. Once read it is kept current in place
+    after every step; edits made to it are not written back.
+    """
+
+    __slots__ = ("native", "operations", "_info")
+
+    def __init__(self, info: GameInfo | None = None) -> None:
+        self.native = _native_forecast(info) if info is not None else None
+        self.operations: list[list[ForecastOperation]] = [[], []]
+        self._info: GameInfo | None = None
+
+    @property
+    def info(self) -> GameInfo:
+        if self._info is None:
+            info = object.__new__(GameInfo)
+            info.seed = int(self.native.seed)
+            _sync_forecast_info(info, self.native)
+            self._info = info
+        return self._info
+
+    def _refresh_info(self) -> None:
+        if self._info is not None:
+            _sync_forecast_info(self._info, self.native)
+
+    def clone(self) -> NativeForecastSimulator:
+        copied = NativeForecastSimulator()
+        copied.native = self.native.clone()
+        copied.operations = [list(self.operations[0]), list(self.operations[1])]
+        return copied
+
+    def state_hash(self) -> int:
+        return self.native.state_hash()
+
+    def ant_cells(self, player: int) -> list[tuple[int, int]]:
+        return self.native.ant_cells(player)
+
+    def graft(
+        self,
+        source: NativeForecastSimulator,
+        origin: NativeForecastSimulator,
+        snapshot: NativeForecastSimulator,
+        player: int,
+    ) -> None:
+        self.native.graft(source.native, origin.native, snapshot.native, player)
+        self.operations[player].clear()
+        self._refresh_info()
+
+    def add_operation_of_player(self, player: int, op: ForecastOperation) -> bool:
+        pending = [_operation_tuple(operation) for operation in self.operations[player]]
+        if self.native.is_operation_sequence_valid(player, pending, _operation_tuple(op)):
+            self.operations[player].append(op)
+            return True
+        return False
+
+    def apply_operations_of_player(self, player: int) -> None:
+        self.native.apply_operations(player, [_operation_tuple(operation) for operation in self.operations[player]])
+        self._refresh_info()
+
+    def fast_next_round(self, perspective: int) -> bool:
+        advanced = self.native.fast_next_round(perspective)
+        if advanced:
+            self.operations[perspective].clear()
+        self._refresh_info()
+        return advanced
+
+    def fast_forward(
+        self,
+        rounds: int,
+        perspective: int,
+        *,
+        stop_when: Callable[[GameInfo], bool] | None = None,
+        anchor: tuple[int, int] | None = None,
+        stop_base_hp: tuple[int, int] | None = None,
+    ) -> ForecastTrace:
+        anchor_x, anchor_y = anchor if anchor is not None else BASE_POS[perspective]
+        stop_player, stop_hp = stop_base_hp if stop_base_hp is not None else (-1, 0)
+        if stop_when is None:
+            trace = self._record(self.native.fast_forward(rounds, perspective, anchor_x, anchor_y, stop_player, stop_hp))
+        else:
+            # Arbitrary predicates need the Python view, so step one round at a time. Later
+            # rounds prune nothing, matching Simulator.fast_forward.
+            trace = ForecastTrace()
+            for _ in range(rounds):
+                step = self.native.fast_forward(1, perspective, anchor_x, anchor_y, stop_player, stop_hp)
+                trace.base_hp.extend(step["base_hp"])
+                trace.coins.extend(step["coins"])
+                trace.nearest_hostile.extend(step["nearest_hostile"])
+                if step["halted"] or step["stopped"]:
+                    trace.halted = step["halted"]
+                    trace.stopped = step["stopped"]
+                    break
+                self._refresh_info()
+                if stop_when(self.info):
+                    trace.stopped = True
+                    break
+        if trace.base_hp:
+            self.operations[perspective].clear()
+        self._refresh_info()
+        return trace
+
+    @staticmethod
+    def _record(raw: dict) -> ForecastTrace:
+        return ForecastTrace(raw["base_hp"], raw["coins"], raw["nearest_hostile"], raw["halted"], raw["stopped"])
@@ -1,13 +1,18 @@
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
 
 #include <algorithm>
 #include <array>
 #include <cmath>
+#include <cstdint>
+#include <cstring>
 #include <stdexcept>
 #include <string>
+#include <tuple>
 #include <unordered_map>
 #include <unordered_set>
+#include <utility>
 #include <vector>
 
 #define private public
@@ -20,6 +25,8 @@ namespace {
 
 constexpr int INITIAL_COIN = 50;
 constexpr int SPECIAL_BEHAVIOR_DECAY_TURNS = 5;
+constexpr unsigned long long RNG_MASK = (1ULL << 48) - 1;
+constexpr unsigned long long RNG_MULTIPLIER = 25214903917ULL;
 
 int tower_build_cost_for_count(int tower_count) {
     tower_count = std::max(tower_count, 0);
@@ -119,7 +126,7 @@ void init_game(Game &game, unsigned long long seed,
     game.cold_handle_rule_illegal = cold_handle_rule_illegal;
     game.enhanced_move_phase_active = false;
     game.enhanced_move_cache_dirty = true;
-    game.rng_state = seed & ((1ULL << 48) - 1);
+    game.rng_state = (static_cast<unsigned long long>(seed) ^ RNG_MULTIPLIER) & RNG_MASK;
     game.record_file.clear();
     game.player0 = Player();
     game.player1 = Player();
@@ -244,6 +251,67 @@ std::vector<std::vector<int>> effect_rows(const Game &game) {
     return rows;
 }
 
+// Mirrors SDK/backend/checksum.py; keep the section order and columns in sync.
+constexpr std::uint64_t CHECKSUM_GOLDEN = 0x9E3779B97F4A7C15ULL;
+constexpr std::uint64_t CHECKSUM_SEED = 0x416E7457617243ULL;
+
+std::uint64_t splitmix64(std::uint64_t value) {
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EBULL;
+    return value ^ (value >> 31);
+}
+
+std::uint64_t section_hash(const std::vector<long long> &values) {
+    std::uint64_t total = 0;
+    for (std::size_t index = 0; index < values.size(); ++index) {
+        const std::uint64_t salt = static_cast<std::uint64_t>(index + 1) * CHECKSUM_GOLDEN;
+        total += splitmix64(static_cast<std::uint64_t>(values[index]) ^ salt);
+    }
+    return values.empty() ? 0 : total ^ static_cast<std::uint64_t>(values.size());
+}
+
+std::vector<long long> flatten_rows(std::vector<std::vector<int>> rows, std::size_t columns) {
+    std::sort(rows.begin(), rows.end(), [](const auto &lhs, const auto &rhs) { return lhs[0] < rhs[0]; });
+    std::vector<long long> flat;
+    flat.reserve(rows.size() * columns);
+    for (const auto &row : rows) {
+        for (std::size_t column = 0; column < columns && column < row.size(); ++column)
+            flat.push_back(row[column]);
+    }
+    return flat;
+}
+
+std::uint64_t round_checksum(const Game &game, bool public_only) {
+    const std::size_t tower_columns = public_only ? 6 : 7;
+    const std::size_t ant_columns = public_only ? 8 : 10;
+    std::vector<std::uint64_t> sections;
+    sections.push_back(section_hash({
+        game.round,
+        game.player0.coin.get_coin(),
+        game.player1.coin.get_coin(),
+        game.base_camp0.get_hp(),
+        game.base_camp1.get_hp(),
+    }));
+    sections.push_back(section_hash(flatten_rows(tower_rows(game), tower_columns)));
+    sections.push_back(section_hash(flatten_rows(ant_rows(game), ant_columns)));
+    if (!public_only) {
+        std::vector<long long> pheromone;
+        pheromone.reserve(2 * MAP_SIZE * MAP_SIZE);
+        for (int player = 0; player < 2; ++player) {
+            for (int x = 0; x < MAP_SIZE; ++x) {
+                for (int y = 0; y < MAP_SIZE; ++y)
+                    pheromone.push_back(game.map.map[x][y].pheromone[player]);
+            }
+        }
+        sections.push_back(section_hash(pheromone));
+        sections.push_back(section_hash({static_cast<long long>(game.rng_state)}));
+    }
+    std::uint64_t checksum = CHECKSUM_SEED;
+    for (const auto section : sections)
+        checksum = splitmix64(checksum ^ section);
+    return checksum;
+}
+
 bool is_tower_operation(int type) { return type == 11 || type == 12 || type == 13; }
 
 bool is_base_upgrade_operation(int type) { return type == 31 || type == 32; }
@@ -308,6 +376,8 @@ struct NativeState {
 
     int next_tower_id() const { return game.tower_id; }
 
+    std::uint64_t checksum(bool public_only) const { return round_checksum(game, public_only); }
+
     std::vector<BoundOperation> apply_operation_list(int player_id, const std::vector<BoundOperation> &operations) {
         std::vector<BoundOperation> illegal;
         illegal.reserve(operations.size());
@@ -556,6 +626,1015 @@ struct NativeState {
     }
 };
 
+namespace {
+
+// Port of SDK/backend/forecast.py (GameInfo + Simulator). The forecast rules are a
+// simplified, single-perspective model and intentionally differ from Game; every
+// branch below mirrors the Python code so both backends produce identical rollouts.
+namespace forecast {
+
+constexpr int ANT_AGE_LIMIT = 64;
+constexpr int COMBAT_ANT_HP = 30;
+constexpr int COMBAT_ANT_KILL_REWARD = 18;
+constexpr int ANT_MAX_HP[3] = {20, 25, 25};
+constexpr int ANT_KILL_REWARD[3] = {6, 10, 14};
+constexpr int ANT_GENERATION_SCHEDULE[3][2] = {{9, 2}, {4, 1}, {7, 2}};
+constexpr int BASIC_INCOME = 3;
+constexpr int BASIC_INCOME_INTERVAL = 2;
+constexpr int BASE_UPGRADE_COST[2] = {200, 250};
+constexpr int BASE_POS[2][2] = {{PLAYER_0_BASE_CAMP_X, PLAYER_0_BASE_CAMP_Y}, {PLAYER_1_BASE_CAMP_X, PLAYER_1_BASE_CAMP_Y}};
+constexpr int OFFSET[2][6][2] = {
+    {{0, 1}, {-1, 0}, {0, -1}, {1, -1}, {1, 0}, {1, 1}},
+    {{-1, 1}, {-1, 0}, {-1, -1}, {0, -1}, {1, 0}, {0, 1}},
+};
+constexpr double PHEROMONE_ATTENUATION = 0.97;
+constexpr double PHEROMONE_INIT = 10.0;
+constexpr double PHEROMONE_FLOOR = 0.0;
+constexpr double ATTRACTION[3] = {1.25, 1.0, 0.75};
+constexpr double DEFLECTOR_PATH_ATTRACTION = 1.0;
+constexpr double EMERGENCY_EVASION_PATH_ATTRACTION = 1.35;
+constexpr int LIGHTNING_STORM_ANT_DAMAGE = 20;
+constexpr int LIGHTNING_STORM_TOWER_DAMAGE = 3;
+constexpr int LIGHTNING_STORM_TOWER_INTERVAL = 5;
+constexpr double TOWER_DOWNGRADE_REFUND_RATIO = 0.9;
+constexpr int NO_MOVE = -1;
+
+enum AntState { ALIVE = 0, SUCCESS = 1, FAIL = 2, TOO_OLD = 3, FROZEN = 4 };
+enum AntKind { WORKER = 0, COMBAT = 1 };
+enum WeaponType { LIGHTNING_STORM = 1, EMP_BLASTER = 2, DEFLECTOR = 3, EMERGENCY_EVASION = 4 };
+enum BuildingType { EMPTY = 0, TOWER = 1, BASE = 2 };
+
+// Indexed by weapon type: duration, range, cooldown, cost.
+constexpr int WEAPON_STATS[5][4] = {{0, 0, 0, 0}, {15, 3, 35, 90}, {10, 3, 45, 135}, {10, 3, 25, 60}, {1, 3, 25, 60}};
+
+constexpr int TERRAIN[MAP_SIZE][MAP_SIZE] = {
+    {-1, -1, -1, -1, -1, -1, -1, -1,  0,  1,  0, -1, -1, -1, -1, -1, -1, -1, -1},
+    {-1, -1, -1, -1, -1, -1,  0,  0,  1,  0,  1,  0,  0, -1, -1, -1, -1, -1, -1},
+    {-1, -1, -1, -1,  0,  0,  0,  1,  1,  0,  1,  1,  0,  0,  0, -1, -1, -1, -1},
+    {-1, -1,  0,  0,  0,  1,  1,  0,  0,  0,  0,  0,  1,  1,  0,  0,  0, -1, -1},
+    { 0,  0,  2,  2,  0,  1,  0,  0,  0,  2,  0,  0,  0,  1,  0,  2,  2,  0,  0},
+    { 0,  0,  0,  2,  0,  0,  2,  2,  0,  2,  0,  2,  2,  0,  0,  2,  0,  0,  0},
+    { 0,  2,  2,  0,  2,  0,  0,  2,  0,  2,  0,  2,  0,  0,  2,  0,  2,  2,  0},
+    { 0,  2,  0,  0,  0,  2,  0,  0,  2,  0,  2,  0,  0,  2,  0,  0,  0,  2,  0},
+    { 0,  0,  2,  0,  2,  0,  0,  2,  0,  0,  0,  2,  0,  0,  2,  0,  2,  0,  0},
+    { 0,  1,  3,  0,  3,  1,  0,  1,  0,  1,  0,  1,  0,  1,  3,  0,  3,  1,  0},
+    { 0,  0,  0,  0,  0,  0,  0,  3,  3,  0,  3,  3,  0,  0,  0,  0,  0,  0,  0},
+    { 0,  3,  3,  0,  3,  3,  0,  0,  0,  0,  0,  0,  0,  3,  3,  0,  3,  3,  0},
+    { 0,  3,  0,  0,  0,  0,  3,  3,  0,  3,  0,  3,  3,  0,  0,  0,  0,  3,  0},
+    { 0,  0,  3,  3,  0,  0,  0,  3,  0,  3,  0,  3,  0,  0,  0,  3,  3,  0,  0},
+    {-1,  0,  0,  3,  0,  1,  1,  0,  0,  3,  0,  0,  1,  1,  0,  3,  0,  0, -1},
+    {-1, -1, -1,  0,  0,  1,  0,  0,  1,  0,  1,  0,  0,  1,  0,  0, -1, -1, -1},
+    {-1, -1, -1, -1, -1,  0,  0,  1,  1,  0,  1,  1,  0,  0, -1, -1, -1, -1, -1},
+    {-1, -1, -1, -1, -1, -1, -1,  0,  0,  0,  0,  0, -1, -1, -1, -1, -1, -1, -1},
+    {-1, -1, -1, -1, -1, -1, -1, -1, -1,  1, -1, -1, -1, -1, -1, -1, -1, -1, -1},
+};
+
+struct TowerStats {
+    int damage;
+    double speed;
+    int range;
+    int max_hp;
+};
+
+TowerStats tower_stats(int type) {
+    switch (type) {
+    case 0: return {5, 2.0, 1, 10};
+    case 1: return {12, 2.0, 1, 15};
+    case 2: return {6, 1.0, 1, 15};
+    case 3: return {12, 4.0, 2, 15};
+    case 11: return {24, 2.0, 1, 15};
+    case 12: return {12, 2.0, 2, 15};
+    case 13: return {14, 2.0, 2, 15};
+    case 21: return {6, 0.5, 1, 15};
+    case 22: return {6, 2.0, 3, 15};
+    case 23: return {10, 2.0, 4, 15};
+    case 31: return {18, 4.0, 2, 15};
+    case 32: return {14, 4.0, 2, 15};
+    case 33: return {18, 6.0, 3, 15};
+    default: return {0, 0.0, 0, 15};
+    }
+}
+
+bool is_upgrade_target(int type, int target) {
+    if (type == 0)
+        return target >= 1 && target <= 4;
+    if (type >= 1 && type <= 4)
+        return target / 10 == type && target % 10 >= 1 && target % 10 <= 3;
+    return false;
+}
+
+int hex_distance(int x0, int y0, int x1, int y1) {
+    const int dy = std::abs(y0 - y1);
+    int dx;
+    if (dy % 2) {
+        if (x0 > x1)
+            dx = std::max(0, std::abs(x0 - x1) - dy / 2 - (y0 % 2));
+        else
+            dx = std::max(0, std::abs(x0 - x1) - dy / 2 - (1 - (y0 % 2)));
+    } else {
+        dx = std::max(0, std::abs(x0 - x1) - dy / 2);
+    }
+    return dx + dy;
+}
+
+bool in_bounds(int x, int y) { return 0 <= x && x < MAP_SIZE && 0 <= y && y < MAP_SIZE; }
+
+bool is_valid_pos(int x, int y) { return in_bounds(x, y) && TERRAIN[x][y] != -1; }
+
+bool is_path(int x, int y) { return in_bounds(x, y) && TERRAIN[x][y] == 0; }
+
+bool is_highland(int player, int x, int y) { return in_bounds(x, y) && TERRAIN[x][y] == (player == 0 ? 2 : 3); }
+
+int build_tower_cost(int tower_num) { return tower_build_cost_for_count(tower_num); }
+
+int upgrade_tower_cost(int type) {
+    if (type == 1 || type == 2 || type == 3)
+        return 60;
+    if (type == 11 || type == 12 || type == 13 || type == 21 || type == 22 || type == 23 || type == 31 ||
+        type == 32 || type == 33)
+        return 200;
+    return -1;
+}
+
+int upgrade_base_cost(int level) {
+    if (level == 0)
+        return BASE_UPGRADE_COST[0];
+    if (level == 1)
+        return BASE_UPGRADE_COST[1];
+    return -1;
+}
+
+bool is_weapon_operation(int type) { return type >= 21 && type <= 24; }
+
+struct TrailCell {
+    int x;
+    int y;
+};
+
+struct ForecastAnt {
+    int id = 0;
+    int player = 0;
+    int x = 0;
+    int y = 0;
+    int hp = 0;
+    int level = 0;
+    int age = 0;
+    int state = ALIVE;
+    int evasion = 0;
+    bool deflector = false;
+    std::vector<TrailCell> trail;
+    int last_move = NO_MOVE;
+    int path_len_total = 0;
+    int kind = WORKER;
+
+    int max_hp() const { return kind == COMBAT ? COMBAT_ANT_HP : ANT_MAX_HP[level]; }
+    int reward() const { return kind == COMBAT ? COMBAT_ANT_KILL_REWARD : ANT_KILL_REWARD[level]; }
+    bool is_alive() const { return state == ALIVE || state == FROZEN; }
+    bool in_range(int cx, int cy, int radius) const { return hex_distance(x, y, cx, cy) <= radius; }
+    bool is_attackable_from(int other, int cx, int cy, int radius) const {
+        return player != other && is_alive() && in_range(cx, cy, radius);
+    }
+
+    void record_move(int direction) {
+        ++path_len_total;
+        if (direction == NO_MOVE) {
+            last_move = NO_MOVE;
+            return;
+        }
+        const int parity = y % 2;
+        x += OFFSET[parity][direction][0];
+        y += OFFSET[parity][direction][1];
+        last_move = direction;
+        trail.push_back({x, y});
+    }
+};
+
+struct ForecastTower {
+    int id = 0;
+    int player = 0;
+    int x = 0;
+    int y = 0;
+    int type = 0;
+    int cd = 0;
+    bool emp = false;
+    int damage = 0;
+    int range = 0;
+    double speed = 0.0;
+    int hp = 0;
+
+    int max_hp() const { return tower_stats(type).max_hp; }
+
+    void reset_cd() { cd = speed > 1 ? static_cast<int>(speed) : 1; }
+
+    void refresh_stats() {
+        const TowerStats stats = tower_stats(type);
+        damage = stats.damage;
+        speed = stats.speed;
+        range = stats.range;
+        reset_cd();
+    }
+
+    void upgrade(int new_type) {
+        type = new_type;
+        refresh_stats();
+        hp = max_hp();
+    }
+
+    void downgrade() {
+        const int previous_hp = std::max(0, hp);
+        const int previous_max_hp = max_hp();
+        type = type / 10;
+        refresh_stats();
+        if (previous_max_hp > 0)
+            hp = std::max(1, static_cast<int>(std::ceil(static_cast<double>(max_hp() * previous_hp) / previous_max_hp)));
+        else
+            hp = max_hp();
+    }
+
+    void attackable(const std::vector<ForecastAnt> &ants, int cx, int cy, std::vector<int> &out) const {
+        for (int idx = 0; idx < static_cast<int>(ants.size()); ++idx) {
+            if (ants[idx].is_attackable_from(player, cx, cy, range))
+                out.push_back(idx);
+        }
+    }
+
+    void action(ForecastAnt &ant) const {
+        if (ant.evasion > 0) {
+            --ant.evasion;
+            return;
+        }
+        if (ant.deflector && damage < ant.max_hp() / 2)
+            return;
+        ant.hp -= damage;
+        if (type == 12)
+            ant.state = FROZEN;
+        if (ant.hp <= 0)
+            ant.state = FAIL;
+    }
+
+    std::vector<int> attack(std::vector<ForecastAnt> &ants) {
+        std::vector<int> attacked;
+        if (cd > 0)
+            --cd;
+        if (cd > 0 || speed <= 0 || range <= 0 || damage <= 0)
+            return attacked;
+        int loops = speed >= 1 ? 1 : static_cast<int>(std::nearbyint(1 / speed));
+        const std::size_t target_num = type == 22 ? 2 : 1;
+        std::vector<int> targets;
+        std::vector<int> hits;
+        while (loops > 0) {
+            --loops;
+            targets.clear();
+            attackable(ants, x, y, targets);
+            std::stable_sort(targets.begin(), targets.end(), [&](int lhs, int rhs) {
+                return hex_distance(ants[lhs].x, ants[lhs].y, x, y) < hex_distance(ants[rhs].x, ants[rhs].y, x, y);
+            });
+            if (targets.size() > target_num)
+                targets.resize(target_num);
+            hits.clear();
+            for (const int idx : targets) {
+                if (type == 3 || type == 31 || type == 33)
+                    attackable(ants, ants[idx].x, ants[idx].y, hits);
+                else if (type == 32)
+                    attackable(ants, x, y, hits);
+                else
+                    hits.push_back(idx);
+            }
+            for (const int idx : hits)
+                action(ants[idx]);
+            attacked.insert(attacked.end(), hits.begin(), hits.end());
+        }
+        if (!attacked.empty()) {
+            std::sort(attacked.begin(), attacked.end());
+            attacked.erase(std::unique(attacked.begin(), attacked.end()), attacked.end());
+            reset_cd();
+        }
+        return attacked;
+    }
+};
+
+struct ForecastBase {
+    int player = 0;
+    int x = 0;
+    int y = 0;
+    int hp = 50;
+    int gen_speed_level = 0;
+    int ant_level = 0;
+};
+
+struct ForecastWeapon {
+    int type = 0;
+    int player = 0;
+    int x = 0;
+    int y = 0;
+    int left_time = 0;
+    int range = 0;
+
+    bool in_range(int cx, int cy) const { return hex_distance(cx, cy, x, y) <= range; }
+};
+
+struct ForecastOperation {
+    int type = -1;
+    int arg0 = -1;
+    int arg1 = -1;
+};
+
+} // namespace forecast
+
+} // namespace
+
+struct NativeForecast {
+    using OperationTuple = std::tuple<int, int, int>;
+
+    long long seed = 0;
+    int round = 0;
+    std::vector<forecast::ForecastTower> towers;
+    std::vector<forecast::ForecastAnt> ants;
+    std::array<forecast::ForecastBase, 2> bases;
+    std::array<long long, 2> coins = {0, 0};
+    double pheromone[2][MAP_SIZE][MAP_SIZE] = {};
+    std::int8_t building_tag[MAP_SIZE][MAP_SIZE] = {};
+    std::vector<forecast::ForecastWeapon> super_weapons;
+    long long super_weapon_cd[2][5] = {};
+    std::array<long long, 2> old_count = {0, 0};
+    std::array<long long, 2> die_count = {0, 0};
+    long long next_ant_id = 0;
+    long long next_tower_id = 0;
+
+    NativeForecast() = default;
+
+    NativeForecast(long long seed_,
+                   int round_,
+                   const std::vector<std::vector<long long>> &tower_rows_in,
+                   const std::vector<std::vector<long long>> &ant_rows_in,
+                   const std::vector<std::vector<std::pair<int, int>>> &trails_in,
+                   const std::vector<std::vector<long long>> &base_rows_in,
+                   const std::vector<long long> &coins_in,
+                   py::array_t<double, py::array::c_style | py::array::forcecast> pheromone_in,
+                   py::array_t<std::int8_t, py::array::c_style | py::array::forcecast> building_tag_in,
+                   const std::vector<std::vector<long long>> &weapon_rows_in,
+                   py::array_t<long long, py::array::c_style | py::array::forcecast> weapon_cd_in,
+                   const std::vector<long long> &old_count_in,
+                   const std::vector<long long> &die_count_in,
+                   long long next_ant_id_,
+                   long long next_tower_id_)
+        : seed(seed_), round(round_), next_ant_id(next_ant_id_), next_tower_id(next_tower_id_) {
+        if (pheromone_in.size() != 2 * MAP_SIZE * MAP_SIZE || building_tag_in.size() != MAP_SIZE * MAP_SIZE ||
+            weapon_cd_in.size() != 10)
+            throw std::invalid_argument("forecast arrays have unexpected shapes");
+        std::copy(pheromone_in.data(), pheromone_in.data() + pheromone_in.size(), &pheromone[0][0][0]);
+        std::copy(building_tag_in.data(), building_tag_in.data() + building_tag_in.size(), &building_tag[0][0]);
+        std::copy(weapon_cd_in.data(), weapon_cd_in.data() + weapon_cd_in.size(), &super_weapon_cd[0][0]);
+        for (const auto &row : tower_rows_in) {
+            forecast::ForecastTower tower;
+            tower.id = static_cast<int>(row.at(0));
+            tower.player = static_cast<int>(row.at(1));
+            tower.x = static_cast<int>(row.at(2));
+            tower.y = static_cast<int>(row.at(3));
+            tower.type = static_cast<int>(row.at(4));
+            tower.refresh_stats();
+            tower.cd = static_cast<int>(row.at(5));
+            tower.emp = row.at(6) != 0;
+            tower.hp = static_cast<int>(row.at(7));
+            towers.push_back(tower);
+        }
+        if (trails_in.size() != ant_rows_in.size())
+            throw std::invalid_argument("every forecast ant needs a trail");
+        for (std::size_t index = 0; index < ant_rows_in.size(); ++index) {
+            const auto &row = ant_rows_in[index];
+            forecast::ForecastAnt ant;
+            ant.id = static_cast<int>(row.at(0));
+            ant.player = static_cast<int>(row.at(1));
+            ant.x = static_cast<int>(row.at(2));
+            ant.y = static_cast<int>(row.at(3));
+            ant.hp = static_cast<int>(row.at(4));
+            ant.level = static_cast<int>(row.at(5));
+            ant.age = static_cast<int>(row.at(6));
+            ant.state = static_cast<int>(row.at(7));
+            ant.evasion = static_cast<int>(row.at(8));
+            ant.deflector = row.at(9) != 0;
+            ant.last_move = static_cast<int>(row.at(10));
+            ant.path_len_total = static_cast<int>(row.at(11));
+            ant.kind = static_cast<int>(row.at(12));
+            for (const auto &cell : trails_in[index])
+                ant.trail.push_back({cell.first, cell.second});
+            ants.push_back(std::move(ant));
+        }
+        for (const auto &row : base_rows_in) {
+            const int player = static_cast<int>(row.at(0));
+            if (player < 0 || player >= 2)
+                continue;
+            bases[player] = {player, static_cast<int>(row.at(1)), static_cast<int>(row.at(2)),
+                             static_cast<int>(row.at(3)), static_cast<int>(row.at(4)), static_cast<int>(row.at(5))};
+        }
+        for (int player = 0; player < 2; ++player) {
+            coins[player] = coins_in.at(player);
+            old_count[player] = old_count_in.at(player);
+            die_count[player] = die_count_in.at(player);
+        }
+        for (const auto &row : weapon_rows_in) {
+            super_weapons.push_back({static_cast<int>(row.at(0)), static_cast<int>(row.at(1)), static_cast<int>(row.at(2)),
+                                     static_cast<int>(row.at(3)), static_cast<int>(row.at(4)), static_cast<int>(row.at(5))});
+        }
+    }
+
+    NativeForecast clone() const { return *this; }
+
+    int tower_num_of_player(int player) const {
+        int count = 0;
+        for (const auto &tower : towers)
+            count += tower.player == player;
+        return count;
+    }
+
+    forecast::ForecastTower *tower_of_id(int tower_id) {
+        for (auto &tower : towers) {
+            if (tower.id == tower_id)
+                return &tower;
+        }
+        return nullptr;
+    }
+
+    bool is_shielded_by_emp(int player, int x, int y) const {
+        for (const auto &weapon : super_weapons) {
+            if (weapon.type == forecast::EMP_BLASTER && weapon.player != player && weapon.in_range(x, y))
+                return true;
+        }
+        return false;
+    }
+
+    static int destroy_tower_income(int tower_num, const forecast::ForecastTower &tower) {
+        const double refund = forecast::build_tower_cost(tower_num - 1) * forecast::TOWER_DOWNGRADE_REFUND_RATIO;
+        return static_cast<int>(refund * std::max(tower.hp, 0) / std::max(tower.max_hp(), 1));
+    }
+
+    static int downgrade_tower_income(int tower_type, const forecast::ForecastTower &tower) {
+        const double refund = forecast::upgrade_tower_cost(tower_type) * forecast::TOWER_DOWNGRADE_REFUND_RATIO;
+        return static_cast<int>(refund * std::max(tower.hp, 0) / std::max(tower.max_hp(), 1));
+    }
+
+    bool is_operation_valid(int player, const forecast::ForecastOperation &op) {
+        using namespace forecast;
+        if (op.type == 11) {
+            return is_valid_pos(op.arg0, op.arg1) && is_highland(player, op.arg0, op.arg1) &&
+                   building_tag[op.arg0][op.arg1] == EMPTY && !is_shielded_by_emp(player, op.arg0, op.arg1);
+        }
+        if (op.type == 12) {
+            const auto *tower = tower_of_id(op.arg0);
+            return tower != nullptr && tower->player == player && is_upgrade_target(tower->type, op.arg1) &&
+                   !is_shielded_by_emp(tower->player, tower->x, tower->y);
+        }
+        if (op.type == 13) {
+            const auto *tower = tower_of_id(op.arg0);
+            return tower != nullptr && tower->player == player && !is_shielded_by_emp(tower->player, tower->x, tower->y);
+        }
+        if (is_weapon_operation(op.type))
+            return is_valid_pos(op.arg0, op.arg1) && super_weapon_cd[player][op.type % 10] <= 0;
+        if (op.type == 31)
+            return bases[player].gen_speed_level < 2;
+        if (op.type == 32)
+            return bases[player].ant_level < 2;
+        return false;
+    }
+
+    long long operation_income(int player, const forecast::ForecastOperation &op) {
+        using namespace forecast;
+        if (op.type == 11)
+            return -build_tower_cost(tower_num_of_player(player));
+        if (op.type == 12)
+            return -upgrade_tower_cost(op.arg1);
+        if (op.type == 13) {
+            const auto *tower = tower_of_id(op.arg0);
+            if (tower == nullptr)
+                return 0;
+            if (tower->type == 0)
+                return destroy_tower_income(tower_num_of_player(player), *tower);
+            return downgrade_tower_income(tower->type, *tower);
+        }
+        if (is_weapon_operation(op.type))
+            return -WEAPON_STATS[op.type % 10][3];
+        if (op.type == 31) {
+            const int level = bases[player].gen_speed_level;
+            return level < 2 ? -upgrade_base_cost(level) : 0;
+        }
+        if (op.type == 32) {
+            const int level = bases[player].ant_level;
+            return level < 2 ? -upgrade_base_cost(level) : 0;
+        }
+        return 0;
+    }
+
+    bool check_affordable(int player, const std::vector<forecast::ForecastOperation> &ops) {
+        long long income = 0;
+        int tower_num = tower_num_of_player(player);
+        for (const auto &op : ops) {
+            if (op.type == 11) {
+                income -= forecast::build_tower_cost(tower_num);
+                ++tower_num;
+            } else if (op.type == 13) {
+                const auto *tower = tower_of_id(op.arg0);
+                if (tower == nullptr)
+                    continue;
+                if (tower->type == 0) {
+                    income += destroy_tower_income(tower_num, *tower);
+                    --tower_num;
+                } else {
+                    income += downgrade_tower_income(tower->type, *tower);
+                }
+            } else {
+                income += operation_income(player, op);
+            }
+        }
+        return income + coins[player] >= 0;
+    }
+
+    bool is_operation_sequence_valid(int player, const std::vector<OperationTuple> &pending, const OperationTuple &fresh_in) {
+        const forecast::ForecastOperation fresh{std::get<0>(fresh_in), std::get<1>(fresh_in), std::get<2>(fresh_in)};
+        std::vector<forecast::ForecastOperation> ops;
+        ops.reserve(pending.size() + 1);
+        for (const auto &item : pending)
+            ops.push_back({std::get<0>(item), std::get<1>(item), std::get<2>(item)});
+        bool collide = false;
+        for (const auto &op : ops) {
+            if (fresh.type == 11)
+                collide |= op.type == 11 && op.arg0 == fresh.arg0 && op.arg1 == fresh.arg1;
+            else if (fresh.type == 12 || fresh.type == 13)
+                collide |= (op.type == 12 || op.type == 13) && op.arg0 == fresh.arg0;
+            else if (fresh.type == 31 || fresh.type == 32)
+                collide |= op.type == 31 || op.type == 32;
+            else if (forecast::is_weapon_operation(fresh.type))
+                collide |= op.type == fresh.type;
+        }
+        if (fresh.type != 11 && fresh.type != 12 && fresh.type != 13 && fresh.type != 31 && fresh.type != 32 &&
+            !forecast::is_weapon_operation(fresh.type))
+            return false;
+        if (collide || !is_operation_valid(player, fresh))
+            return false;
+        ops.push_back(fresh);
+        return check_affordable(player, ops);
+    }
+
+    void apply_operation(int player, int type, int arg0, int arg1) {
+        using namespace forecast;
+        const ForecastOperation op{type, arg0, arg1};
+        coins[player] += operation_income(player, op);
+        if (type == 11) {
+            ForecastTower tower;
+            tower.id = static_cast<int>(next_tower_id);
+            tower.player = player;
+            tower.x = arg0;
+            tower.y = arg1;
+            tower.type = 0;
+            tower.refresh_stats();
+            tower.hp = tower.max_hp();
+            towers.push_back(tower);
+            building_tag[arg0][arg1] = TOWER;
+            ++next_tower_id;
+        } else if (type == 12) {
+            if (auto *tower = tower_of_id(arg0))
+                tower->upgrade(arg1);
+        } else if (type == 13) {
+            for (auto it = towers.begin(); it != towers.end(); ++it) {
+                if (it->id != arg0)
+                    continue;
+                if (it->type != 0) {
+                    it->downgrade();
+                } else {
+                    building_tag[it->x][it->y] = EMPTY;
+                    towers.erase(it);
+                }
+                break;
+            }
+        } else if (is_weapon_operation(type)) {
+            const int weapon_type = type % 10;
+            ForecastWeapon weapon{weapon_type, player, arg0, arg1, WEAPON_STATS[weapon_type][0] + 1, WEAPON_STATS[weapon_type][1]};
+            if (weapon_type == EMERGENCY_EVASION) {
+                for (auto &ant : ants) {
+                    if (ant.player == player && weapon.in_range(ant.x, ant.y))
+                        ant.evasion = 2;
+                }
+            }
+            super_weapons.push_back(weapon);
+            super_weapon_cd[player][weapon_type] = WEAPON_STATS[weapon_type][2];
+        } else if (type == 31) {
+            ++bases[player].gen_speed_level;
+        } else if (type == 32) {
+            ++bases[player].ant_level;
+        }
+    }
+
+    void apply_operations(int player, const std::vector<OperationTuple> &ops) {
+        for (const auto &op : ops)
+            apply_operation(player, std::get<0>(op), std::get<1>(op), std::get<2>(op));
+    }
+
+    int next_move(const forecast::ForecastAnt &ant) const {
+        using namespace forecast;
+        const int target_x = BASE_POS[1 - ant.player][0];
+        const int target_y = BASE_POS[1 - ant.player][1];
+        const int current = hex_distance(ant.x, ant.y, target_x, target_y);
+        double weighted[6][2];
+        for (auto &row : weighted) {
+            row[0] = -1.0;
+            row[1] = -1.0;
+        }
+        for (int idx = 0; idx < 6; ++idx) {
+            const int x = ant.x + OFFSET[ant.y % 2][idx][0];
+            const int y = ant.y + OFFSET[ant.y % 2][idx][1];
+            if (!is_path(x, y) || ant.last_move == (idx + 3) % 6)
+                continue;
+            const int next_dist = hex_distance(x, y, target_x, target_y);
+            const double gain = ATTRACTION[next_dist - current + 1];
+            double storm_penalty = 0.0;
+            double effect_pull = 0.0;
+            for (const auto &weapon : super_weapons) {
+                if (!weapon.in_range(x, y))
+                    continue;
+                if (weapon.type == LIGHTNING_STORM && weapon.player != ant.player)
+                    storm_penalty += LIGHTNING_STORM_ANT_DAMAGE / 25.0;
+                else if (weapon.player == ant.player && weapon.type == DEFLECTOR)
+                    effect_pull += DEFLECTOR_PATH_ATTRACTION;
+                else if (weapon.player == ant.player && weapon.type == EMERGENCY_EVASION)
+                    effect_pull += EMERGENCY_EVASION_PATH_ATTRACTION;
+            }
+            const double level = pheromone[ant.player][x][y];
+            const double attracted = gain * level;
+            weighted[idx][0] = attracted + effect_pull - storm_penalty;
+            weighted[idx][1] = level;
+        }
+        int best = 0;
+        for (int idx = 1; idx < 6; ++idx) {
+            if (weighted[idx][0] > weighted[best][0] ||
+                (weighted[idx][0] == weighted[best][0] && weighted[idx][1] > weighted[best][1]))
+                best = idx;
+        }
+        return best;
+    }
+
+    void update_pheromone(const forecast::ForecastAnt &ant) {
+        using namespace forecast;
+        double delta;
+        if (ant.state == SUCCESS)
+            delta = 10.0;
+        else if (ant.state == FAIL)
+            delta = -5.0;
+        else if (ant.state == TOO_OLD)
+            delta = -3.0;
+        else if (ant.state == ALIVE || ant.state == FROZEN)
+            return;
+        else
+            delta = 0.0;
+        std::array<bool, MAP_SIZE * MAP_SIZE> seen{};
+        auto visit = [&](int x, int y) {
+            if (!in_bounds(x, y) || seen[x * MAP_SIZE + y])
+                return;
+            seen[x * MAP_SIZE + y] = true;
+            double &cell = pheromone[ant.player][x][y];
+            cell = std::max(cell + delta, PHEROMONE_FLOOR);
+        };
+        if (ant.trail.empty() || ant.trail.back().x != ant.x || ant.trail.back().y != ant.y)
+            visit(ant.x, ant.y);
+        for (auto it = ant.trail.rbegin(); it != ant.trail.rend(); ++it)
+            visit(it->x, it->y);
+    }
+
+    void attenuate_pheromone(int player) {
+        const double offset = (1 - forecast::PHEROMONE_ATTENUATION) * forecast::PHEROMONE_INIT;
+        for (int x = 0; x < MAP_SIZE; ++x) {
+            for (int y = 0; y < MAP_SIZE; ++y) {
+                if (forecast::TERRAIN[x][y] >= 0)
+                    pheromone[player][x][y] = forecast::PHEROMONE_ATTENUATION * pheromone[player][x][y] + offset;
+            }
+        }
+    }
+
+    bool play_round(int perspective, bool prune) {
+        using namespace forecast;
+        if (round >= MAX_ROUND)
+            return false;
+
+        std::vector<ForecastWeapon> kept_weapons;
+        kept_weapons.reserve(super_weapons.size());
+        for (auto weapon : super_weapons) {
+            --weapon.left_time;
+            if (weapon.left_time > 0)
+                kept_weapons.push_back(weapon);
+        }
+        super_weapons.swap(kept_weapons);
+
+        for (const auto &weapon : super_weapons) {
+            if (weapon.type != LIGHTNING_STORM || weapon.player != perspective)
+                continue;
+            const int active_turn = WEAPON_STATS[weapon.type][0] - weapon.left_time + 1;
+            if (active_turn <= 0 || active_turn % LIGHTNING_STORM_TOWER_INTERVAL != 0)
+                continue;
+            std::vector<ForecastTower> surviving;
+            surviving.reserve(towers.size());
+            for (auto &tower : towers) {
+                if (tower.player != weapon.player && weapon.in_range(tower.x, tower.y)) {
+                    tower.hp -= LIGHTNING_STORM_TOWER_DAMAGE;
+                    if (tower.hp <= 0)
+                        continue;
+                }
+                surviving.push_back(tower);
+            }
+            towers.swap(surviving);
+        }
+
+        if (prune) {
+            ants.erase(std::remove_if(ants.begin(), ants.end(), [&](const ForecastAnt &ant) { return ant.player == perspective; }),
+                       ants.end());
+            towers.erase(
+                std::remove_if(towers.begin(), towers.end(), [&](const ForecastTower &tower) { return tower.player != perspective; }),
+                towers.end());
+        }
+
+        for (auto &ant : ants)
+            ant.deflector = false;
+        for (auto &tower : towers)
+            tower.emp = false;
+
+        for (const auto &weapon : super_weapons) {
+            if (weapon.type == LIGHTNING_STORM && weapon.player == perspective) {
+                for (auto &ant : ants) {
+                    if (!weapon.in_range(ant.x, ant.y))
+                        continue;
+                    ant.hp -= LIGHTNING_STORM_ANT_DAMAGE;
+                    if (ant.hp <= 0) {
+                        ant.state = FAIL;
+                        coins[weapon.player] += ant.reward();
+                    }
+                }
+            } else if (weapon.type == DEFLECTOR && weapon.player == 1 - perspective) {
+                for (auto &ant : ants) {
+                    if (weapon.in_range(ant.x, ant.y))
+                        ant.deflector = true;
+                }
+            } else if (weapon.type == EMP_BLASTER && weapon.player == 1 - perspective) {
+                for (auto &tower : towers) {
+                    if (weapon.in_range(tower.x, tower.y))
+                        tower.emp = true;
+                }
+            }
+        }
+
+        for (auto &tower : towers) {
+            if (tower.emp)
+                continue;
+            for (const int idx : tower.attack(ants)) {
+                if (ants[idx].state == FAIL)
+                    coins[tower.player] += ants[idx].reward();
+            }
+        }
+
+        for (auto &ant : ants) {
+            ++ant.age;
+            if (ant.state != FAIL && ant.kind != COMBAT && ant.age > ANT_AGE_LIMIT)
+                ant.state = TOO_OLD;
+            int direction = NO_MOVE;
+            if (ant.state == ALIVE)
+                direction = next_move(ant);
+            ant.record_move(direction);
+            const int enemy = 1 - ant.player;
+            if (ant.state != FAIL && ant.x == BASE_POS[enemy][0] && ant.y == BASE_POS[enemy][1]) {
+                ant.state = SUCCESS;
+                bases[enemy].hp -= 1;
+                coins[ant.player] += 5;
+                if (bases[enemy].hp <= 0)
+                    return false;
+            }
+            if (ant.state == FROZEN)
+                ant.state = ALIVE;
+        }
+
+        const int enemy = 1 - perspective;
+        attenuate_pheromone(enemy);
+        for (const auto &ant : ants)
+            update_pheromone(ant);
+
+        std::vector<ForecastAnt> survivors;
+        survivors.reserve(ants.size() + 1);
+        for (auto &ant : ants) {
+            if (ant.state == FAIL)
+                ++die_count[ant.player];
+            else if (ant.state == TOO_OLD)
+                ++old_count[ant.player];
+            if (ant.state != SUCCESS && ant.state != FAIL && ant.state != TOO_OLD)
+                survivors.push_back(std::move(ant));
+        }
+        ants.swap(survivors);
+
+        const ForecastBase &base = bases[enemy];
+        const int numerator = ANT_GENERATION_SCHEDULE[base.gen_speed_level][0];
+        const int denominator = ANT_GENERATION_SCHEDULE[base.gen_speed_level][1];
+        if (round == 0 || (round * denominator) / numerator > ((round - 1) * denominator) / numerator) {
+            ForecastAnt spawned;
+            spawned.id = static_cast<int>(next_ant_id);
+            spawned.player = base.player;
+            spawned.x = base.x;
+            spawned.y = base.y;
+            spawned.hp = ANT_MAX_HP[base.ant_level];
+            spawned.level = base.ant_level;
+            spawned.trail.push_back({base.x, base.y});
+            ants.push_back(std::move(spawned));
+            ++next_ant_id;
+        }
+
+        if ((round + 1) % BASIC_INCOME_INTERVAL == 0) {
+            coins[0] += BASIC_INCOME;
+            coins[1] += BASIC_INCOME;
+            if (round % 3 != 0)
+                coins[enemy] += BASIC_INCOME;
+        }
+
+        ++round;
+        for (int player = 0; player < 2; ++player) {
+            for (int weapon_type = 1; weapon_type < 5; ++weapon_type) {
+                if (super_weapon_cd[player][weapon_type] > 0)
+                    --super_weapon_cd[player][weapon_type];
+            }
+        }
+        return true;
+    }
+
+    bool fast_next_round(int perspective) { return play_round(perspective, true); }
+
+    py::dict fast_forward(int rounds, int perspective, int anchor_x, int anchor_y, int stop_player, int stop_hp) {
+        const int enemy = 1 - perspective;
+        std::vector<std::pair<int, int>> base_hp;
+        std::vector<std::pair<long long, long long>> coin_trace;
+        std::vector<int> nearest_hostile;
+        bool halted = false;
+        bool stopped = false;
+        bool prune = true;
+        for (int played = 0; played < rounds; ++played) {
+            if (!play_round(perspective, prune)) {
+                halted = true;
+                break;
+            }
+            prune = false;
+            int nearest = 32;
+            for (const auto &ant : ants) {
+                if (ant.player == enemy)
+                    nearest = std::min(nearest, forecast::hex_distance(ant.x, ant.y, anchor_x, anchor_y));
+            }
+            base_hp.emplace_back(bases[0].hp, bases[1].hp);
+            coin_trace.emplace_back(coins[0], coins[1]);
+            nearest_hostile.push_back(nearest);
+            if (stop_player >= 0 && bases[stop_player].hp <= stop_hp) {
+                stopped = true;
+                break;
+            }
+        }
+        py::dict trace;
+        trace["base_hp"] = base_hp;
+        trace["coins"] = coin_trace;
+        trace["nearest_hostile"] = nearest_hostile;
+        trace["halted"] = halted;
+        trace["stopped"] = stopped;
+        return trace;
+    }
+
+    std::vector<std::pair<int, int>> ant_cells(int player) const {
+        std::vector<std::pair<int, int>> cells;
+        for (const auto &ant : ants)
+            if (ant.player == player)
+                cells.emplace_back(ant.x, ant.y);
+        return cells;
+    }
+
+    // Becomes `source` carried along the idle trajectory origin -> snapshot; only `player`'s
+    // towers, coins, building tags and base levels may differ between source and origin.
+    void graft(const NativeForecast &source, const NativeForecast &origin, const NativeForecast &snapshot, int player) {
+        const int elapsed = snapshot.round - origin.round;
+        std::vector<forecast::ForecastTower> grafted;
+        for (const auto &tower : source.towers) {
+            if (tower.player != player)
+                continue;
+            const forecast::ForecastTower *carried = nullptr;
+            for (const auto &before : origin.towers) {
+                if (before.id == tower.id && before.x == tower.x && before.y == tower.y && before.type == tower.type &&
+                    before.cd == tower.cd && before.hp == tower.hp && before.emp == tower.emp) {
+                    for (const auto &after : snapshot.towers)
+                        if (after.id == tower.id)
+                            carried = &after;
+                    break;
+                }
+            }
+            if (carried != nullptr) {
+                grafted.push_back(*carried);
+                continue;
+            }
+            forecast::ForecastTower moved = tower;
+            for (int step = 1; step <= elapsed; ++step) {
+                moved.emp = false;
+                for (const auto &weapon : origin.super_weapons)
+                    if (weapon.left_time - step > 0 && weapon.type == forecast::EMP_BLASTER && weapon.player != player &&
+                        weapon.in_range(moved.x, moved.y))
+                        moved.emp = true;
+                if (!moved.emp && moved.cd > 0)
+                    --moved.cd;
+            }
+            grafted.push_back(moved);
+        }
+        std::array<long long, 2> grafted_coins = snapshot.coins;
+        for (int side = 0; side < 2; ++side)
+            grafted_coins[side] += source.coins[side] - origin.coins[side];
+        const forecast::ForecastBase levels = source.bases[player];
+
+        *this = snapshot;
+        towers = std::move(grafted);
+        coins = grafted_coins;
+        std::memcpy(building_tag, source.building_tag, sizeof(building_tag));
+        bases[player].gen_speed_level = levels.gen_speed_level;
+        bases[player].ant_level = levels.ant_level;
+        next_tower_id = source.next_tower_id;
+    }
+
+    std::uint64_t state_hash() const {
+        std::uint64_t hash = CHECKSUM_SEED;
+        auto mix = [&hash](std::uint64_t value) { hash = splitmix64((hash ^ value) + CHECKSUM_GOLDEN); };
+        mix(round);
+        mix(towers.size());
+        for (const auto &tower : towers) {
+            for (const long long value : {tower.id, tower.player, tower.x, tower.y, tower.type, tower.cd, int(tower.emp), tower.hp})
+                mix(static_cast<std::uint64_t>(value));
+        }
+        mix(ants.size());
+        for (const auto &ant : ants) {
+            for (const long long value : {ant.id, ant.player, ant.x, ant.y, ant.hp, ant.level, ant.age, ant.state, ant.evasion,
+                                          int(ant.deflector), ant.last_move, ant.path_len_total, ant.kind})
+                mix(static_cast<std::uint64_t>(value));
+            mix(ant.trail.size());
+            for (const auto &cell : ant.trail)
+                mix(static_cast<std::uint64_t>(cell.x) << 32 ^ static_cast<std::uint32_t>(cell.y));
+        }
+        for (const auto &base : bases) {
+            for (const long long value : {base.hp, base.gen_speed_level, base.ant_level})
+                mix(static_cast<std::uint64_t>(value));
+        }
+        mix(super_weapons.size());
+        for (const auto &weapon : super_weapons) {
+            for (const long long value : {weapon.type, weapon.player, weapon.x, weapon.y, weapon.left_time, weapon.range})
+                mix(static_cast<std::uint64_t>(value));
+        }
+        for (int player = 0; player < 2; ++player) {
+            for (const long long value : {coins[player], old_count[player], die_count[player]})
+                mix(static_cast<std::uint64_t>(value));
+            for (const long long value : super_weapon_cd[player])
+                mix(static_cast<std::uint64_t>(value));
+        }
+        mix(next_ant_id);
+        mix(next_tower_id);
+        const double *cells = &pheromone[0][0][0];
+        for (int index = 0; index < 2 * MAP_SIZE * MAP_SIZE; ++index) {
+            std::uint64_t bits;
+            std::memcpy(&bits, cells + index, sizeof(bits));
+            mix(bits);
+        }
+        const std::int8_t *tags = &building_tag[0][0];
+        for (int index = 0; index < MAP_SIZE * MAP_SIZE; ++index)
+            mix(static_cast<std::uint64_t>(tags[index]));
+        return hash;
+    }
+
+    py::tuple snapshot() const {
+        std::vector<std::array<long long, 8>> tower_rows_out;
+        tower_rows_out.reserve(towers.size());
+        for (const auto &tower : towers)
+            tower_rows_out.push_back({tower.id, tower.player, tower.x, tower.y, tower.type, tower.cd, tower.emp, tower.hp});
+        std::vector<std::array<long long, 13>> ant_rows_out;
+        std::vector<std::vector<std::pair<int, int>>> trails;
+        ant_rows_out.reserve(ants.size());
+        trails.reserve(ants.size());
+        for (const auto &ant : ants) {
+            ant_rows_out.push_back({ant.id, ant.player, ant.x, ant.y, ant.hp, ant.level, ant.age, ant.state, ant.evasion,
+                                    ant.deflector, ant.last_move, ant.path_len_total, ant.kind});
+            std::vector<std::pair<int, int>> trail;
+            trail.reserve(ant.trail.size());
+            for (const auto &cell : ant.trail)
+                trail.emplace_back(cell.x, cell.y);
+            trails.push_back(std::move(trail));
+        }
+        std::vector<std::array<int, 6>> base_rows_out;
+        for (const auto &base : bases)
+            base_rows_out.push_back({base.player, base.x, base.y, base.hp, base.gen_speed_level, base.ant_level});
+        std::vector<std::array<int, 6>> weapon_rows_out;
+        weapon_rows_out.reserve(super_weapons.size());
+        for (const auto &weapon : super_weapons)
+            weapon_rows_out.push_back({weapon.type, weapon.player, weapon.x, weapon.y, weapon.left_time, weapon.range});
+        py::array_t<double> pheromone_out({2, MAP_SIZE, MAP_SIZE});
+        std::copy(&pheromone[0][0][0], &pheromone[0][0][0] + 2 * MAP_SIZE * MAP_SIZE, pheromone_out.mutable_data());
+        py::array_t<std::int8_t> building_tag_out({MAP_SIZE, MAP_SIZE});
+        std::copy(&building_tag[0][0], &building_tag[0][0] + MAP_SIZE * MAP_SIZE, building_tag_out.mutable_data());
+        py::array_t<long long> weapon_cd_out({2, 5});
+        std::copy(&super_weapon_cd[0][0], &super_weapon_cd[0][0] + 10, weapon_cd_out.mutable_data());
+        return py::make_tuple(round, tower_rows_out, ant_rows_out, trails, base_rows_out, coins, pheromone_out,
+                              building_tag_out, weapon_rows_out, weapon_cd_out, old_count, die_count, next_ant_id,
+                              next_tower_id);
+    }
+};
+
 PYBIND11_MODULE(native_antwar, m) {
     py::class_<BoundOperation>(m, "Operation")
         .def(py::init<int, int, int>(), py::arg("type"), py::arg("arg0") = -1, py::arg("arg1") = -1)
@@ -587,8 +1666,50 @@ PYBIND11_MODULE(native_antwar, m) {
         .def("effect_rows", &NativeState::effect_rows_view)
         .def("next_ant_id", &NativeState::next_ant_id)
         .def("next_tower_id", &NativeState::next_tower_id)
+        .def("checksum", &NativeState::checksum, py::arg("public_only") = false)
         .def("apply_operation_list", &NativeState::apply_operation_list)
         .def("advance_round", &NativeState::advance_round)
         .def("resolve_turn", &NativeState::resolve_turn)
         .def("sync_public_round_state", &NativeState::sync_public_round_state);
+
+    py::class_<NativeForecast>(m, "NativeForecast")
+        .def(py::init<long long, int, const std::vector<std::vector<long long>> &, const std::vector<std::vector<long long>> &,
+                      const std::vector<std::vector<std::pair<int, int>>> &, const std::vector<std::vector<long long>> &,
+                      const std::vector<long long> &, py::array_t<double, py::array::c_style | py::array::forcecast>,
+                      py::array_t<std::int8_t, py::array::c_style | py::array::forcecast>,
+                      const std::vector<std::vector<long long>> &,
+                      py::array_t<long long, py::array::c_style | py::array::forcecast>, const std::vector<long long> &,
+                      const std::vector<long long> &, long long, long long>(),
+             py::arg("seed"),
+             py::arg("round"),
+             py::arg("tower_rows"),
+             py::arg("ant_rows"),
+             py::arg("ant_trails"),
+             py::arg("base_rows"),
+             py::arg("coins"),
+             py::arg("pheromone"),
+             py::arg("building_tag"),
+             py::arg("weapon_rows"),
+             py::arg("weapon_cooldowns"),
+             py::arg("old_count"),
+             py::arg("die_count"),
+             py::arg("next_ant_id"),
+             py::arg("next_tower_id"))
+        .def("clone", &NativeForecast::clone)
+        .def_readonly("seed", &NativeForecast::seed)
+        .def_readonly("round", &NativeForecast::round)
+        .def("is_operation_sequence_valid", &NativeForecast::is_operation_sequence_valid)
+        .def("apply_operations", &NativeForecast::apply_operations)
+        .def("fast_next_round", &NativeForecast::fast_next_round)
+        .def("fast_forward", &NativeForecast::fast_forward,
+             py::arg("rounds"),
+             py::arg("perspective"),
+             py::arg("anchor_x"),
+             py::arg("anchor_y"),
+             py::arg("stop_player") = -1,
+             py::arg("stop_hp") = 0)
+        .def("ant_cells", &NativeForecast::ant_cells)
+        .def("graft", &NativeForecast::graft)
+        .def("state_hash", &NativeForecast::state_hash)
+        .def("snapshot", &NativeForecast::snapshot);
 }
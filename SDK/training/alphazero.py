@@ -16,7 +16,8 @@ from SDK.alphazero import (
 )
 from SDK.training.env import AntWarSequentialEnv
 from SDK.training.logging_utils import TrainingLogger
-from SDK.utils.actions import ActionCatalog
+from SDK.training.traces import CompactSelfPlayBatch
+from SDK.utils.actions import ActionCatalog, BundleCache
 from SDK.utils.features import FeatureExtractor
 
 
@@ -89,7 +90,12 @@ class AlphaZeroSelfPlayTrainer:
         self.config = config or AlphaZeroTrainerConfig()
         self.logger = logger
         self.feature_extractor = FeatureExtractor(max_actions=self.config.max_actions)
-        self.action_catalog = ActionCatalog(max_actions=self.config.max_actions, feature_extractor=self.feature_extractor)
+        self.bundle_cache = BundleCache()
+        self.action_catalog = ActionCatalog(
+            max_actions=self.config.max_actions,
+            feature_extractor=self.feature_extractor,
+            bundle_cache=self.bundle_cache,
+        )
         self.model = self._build_or_resume_model()
         self.search = PriorGuidedMCTS(
             model=self.model,
@@ -175,13 +181,18 @@ class AlphaZeroSelfPlayTrainer:
         raw = self.feature_extractor.evaluate(env.state, player, context=env.decision_context)
         return float(np.tanh(raw / self.config.value_scale))
 
+    def _make_env(self, seed: int) -> AntWarSequentialEnv:
+        env = self.env_factory(seed=seed)
+        env.action_catalog.bundle_cache = self.bundle_cache
+        return env
+
     def collect_episode(
         self,
         seed: int,
         batch_index: int | None = None,
         episode_index: int | None = None,
-    ) -> tuple[SelfPlayBatch, EpisodeSummary]:
-        env = self.env_factory(seed=seed)
+    ) -> tuple[CompactSelfPlayBatch, EpisodeSummary]:
+        env = self._make_env(seed)
         try:
             env.reset(seed=seed)
             traces = {agent: [] for agent in env.possible_agents}
@@ -225,11 +236,11 @@ class AlphaZeroSelfPlayTrainer:
                 if len(recent_search_times) > 16:
                     recent_search_times.pop(0)
                 traces[agent_name].append(
-                    SelfPlaySample(
-                        observation=self.feature_extractor.flatten_observation(current),
-                        mask=current["action_mask"].astype(np.float32),
-                        policy=result.policy.copy(),
-                        value=0.0,
+                    CompactSelfPlayBatch.from_arrays(
+                        self.feature_extractor.flatten_observation(current)[None],
+                        current["action_mask"][None],
+                        result.policy[None],
+                        np.zeros(1, dtype=np.float32),
                     )
                 )
                 decision_count += 1
@@ -271,24 +282,10 @@ class AlphaZeroSelfPlayTrainer:
                 "player_0": self._value_target(env, 0),
                 "player_1": self._value_target(env, 1),
             }
-            observation_rows = []
-            mask_rows = []
-            policy_rows = []
-            value_rows = []
             for agent_name in env.possible_agents:
-                target_value = player_targets[agent_name]
                 for sample in traces[agent_name]:
-                    observation_rows.append(sample.observation)
-                    mask_rows.append(sample.mask)
-                    policy_rows.append(sample.policy)
-                    value_rows.append(target_value)
-
-            batch = SelfPlayBatch(
-                observations=np.asarray(observation_rows, dtype=np.float32),
-                masks=np.asarray(mask_rows, dtype=np.float32),
-                policies=np.asarray(policy_rows, dtype=np.float32),
-                values=np.asarray(value_rows, dtype=np.float32),
-            )
+                    sample.values[:] = player_targets[agent_name]
+            batch = CompactSelfPlayBatch.concatenate(traces["player_0"] + traces["player_1"])
             summary = EpisodeSummary(
                 seed=seed,
                 rounds=env.state.round_index,
@@ -325,15 +322,14 @@ class AlphaZeroSelfPlayTrainer:
             "mean_reward_player_1": float(sum(summary.reward_player_1 for summary in summaries) / episodes),
         }
 
-    def _merge_batches(self, batches: list[SelfPlayBatch]) -> SelfPlayBatch:
-        return SelfPlayBatch(
-            observations=np.concatenate([batch.observations for batch in batches], axis=0),
-            masks=np.concatenate([batch.masks for batch in batches], axis=0),
-            policies=np.concatenate([batch.policies for batch in batches], axis=0),
-            values=np.concatenate([batch.values for batch in batches], axis=0),
-        )
+    def _merge_batches(self, batches: list[CompactSelfPlayBatch]) -> CompactSelfPlayBatch:
+        return CompactSelfPlayBatch.concatenate(batches)
 
-    def update_from_batch(self, batch: SelfPlayBatch) -> dict[str, float]:
+    def update_from_batch(self, batch: SelfPlayBatch | CompactSelfPlayBatch) -> dict[str, float]:
+        saturated = 0
+        if isinstance(batch, CompactSelfPlayBatch):
+            saturated = batch.saturated
+            batch = SelfPlayBatch(*batch.decode())
         metrics = self.model.update(
             observations=batch.observations,
             masks=batch.masks,
@@ -345,10 +341,11 @@ class AlphaZeroSelfPlayTrainer:
         )
         metrics["samples"] = float(len(batch.values))
         metrics["mean_target_value"] = float(np.mean(batch.values))
+        metrics["saturated_steps"] = float(saturated)
         return metrics
 
     def _play_evaluation_episode(self, seed: int, trained_side: int) -> tuple[int | None, int]:
-        env = self.env_factory(seed=seed)
+        env = self._make_env(seed)
         try:
             env.reset(seed=seed)
             for agent_name in env.agent_iter():
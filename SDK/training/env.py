@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 
 import numpy as np
@@ -27,7 +28,12 @@ class AntWarSequentialEnv(AECEnv):
         self.max_actions = max_actions
         self.backend = backend or load_backend(prefer_native=prefer_native_backend)
         self.feature_extractor = FeatureExtractor(max_actions=max_actions)
-        self.action_catalog = ActionCatalog(max_actions=max_actions, feature_extractor=self.feature_extractor)
+        self.rollout_executor = ThreadPoolExecutor(max_workers=4) if self.backend.name == "native" else None
+        self.action_catalog = ActionCatalog(
+            max_actions=max_actions,
+            feature_extractor=self.feature_extractor,
+            rollout_executor=self.rollout_executor,
+        )
         self.possible_agents = ["player_0", "player_1"]
         self.agent_name_mapping = {agent: index for index, agent in enumerate(self.possible_agents)}
         self.agents: list[str] = []
@@ -93,9 +99,10 @@ class AntWarSequentialEnv(AECEnv):
         return self.action_catalog.action_mask(self._bundles[player])
 
     def observe(self, agent: str) -> dict[str, np.ndarray]:
+        player = self.player_index(agent)
         return self.feature_extractor.encode_observation(
             self.state,
-            self.player_index(agent),
+            player,
             self._action_mask_for_agent(agent),
             context=self._context,
         )
@@ -246,6 +253,8 @@ class AntWarSequentialEnv(AECEnv):
 
     def close(self):
         self.agents = []
+        if self.rollout_executor is not None:
+            self.rollout_executor.shutdown(wait=False)
 
 
 AntWarParallelEnv = AntWarSequentialEnv
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from SDK.utils.features import BOARD_SHAPE, BOARD_SIZE
+
+# Board channels by storage class; see FeatureExtractor.encode_board for the layout.
+BINARY_CHANNELS = (0, 3, 4, 5)
+HALF_STEP_CHANNELS = (1, 2, 6, 12)
+COUNT_CHANNELS = (16, 17, 18, 19)
+HALF_CHANNELS = tuple(
+    channel
+    for channel in range(BOARD_SHAPE[0])
+    if channel not in BINARY_CHANNELS + HALF_STEP_CHANNELS + COUNT_CHANNELS
+)
+STEP_CHANNELS = HALF_STEP_CHANNELS + COUNT_CHANNELS
+CELLS = BOARD_SHAPE[1] * BOARD_SHAPE[2]
+STEP_SCALE = np.repeat(np.array([2.0] * len(HALF_STEP_CHANNELS) + [1.0] * len(COUNT_CHANNELS), dtype=np.float32), CELLS)
+
+
+@dataclass(slots=True)
+class CompactSelfPlayBatch:
+    """Self-play samples in a compact form that is decoded to float32 only for training.
+
+    Binary board channels and masks are bit-packed. Half-step and count channels are stored as
+    uint8 steps, and sparse policies keep only their non-zero entries. Together with the float32
+    stats, all of these round-trip exactly while a channel stays within 255 steps (127.5 for
+    half-step channels); cells beyond that are clipped to the bound and counted in
+    ``saturated``. The remaining continuous channels are stored as float16, so a decoded value
+    ``y`` of an original ``x`` satisfies ``|y - x| <= 2**-11 * |x| + 2**-25`` for ``|x| < 65504``.
+    """
+
+    flags: np.ndarray
+    steps: np.ndarray
+    halves: np.ndarray
+    stats: np.ndarray
+    masks: np.ndarray
+    policy_rows: np.ndarray
+    policy_actions: np.ndarray
+    policy_values: np.ndarray
+    values: np.ndarray
+    action_dim: int
+    saturated: int = 0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        observations: np.ndarray,
+        masks: np.ndarray,
+        policies: np.ndarray,
+        values: np.ndarray,
+    ) -> CompactSelfPlayBatch:
+        count = len(observations)
+        boards = observations[:, :BOARD_SIZE].reshape(count, BOARD_SHAPE[0], CELLS)
+        rows, actions = np.nonzero(policies)
+        steps = np.rint(boards[:, STEP_CHANNELS].reshape(count, -1) * STEP_SCALE)
+        saturated = int(np.count_nonzero((steps < 0) | (steps > 255)))
+        return cls(
+            flags=np.packbits(boards[:, BINARY_CHANNELS] != 0, axis=-1).reshape(count, -1),
+            steps=np.clip(steps, 0, 255).astype(np.uint8),
+            halves=boards[:, HALF_CHANNELS].reshape(count, -1).astype(np.float16),
+            stats=np.array(observations[:, BOARD_SIZE:], dtype=np.float32),
+            masks=np.packbits(masks != 0, axis=-1),
+            policy_rows=rows.astype(np.int32),
+            policy_actions=actions.astype(np.uint16),
+            policy_values=policies[rows, actions].astype(np.float32),
+            values=np.asarray(values, dtype=np.float32).reshape(count),
+            action_dim=masks.shape[1],
+            saturated=saturated,
+        )
+
+    @classmethod
+    def concatenate(cls, batches: list[CompactSelfPlayBatch]) -> CompactSelfPlayBatch:
+        offsets = np.cumsum([0] + [len(batch) for batch in batches[:-1]])
+        return cls(
+            flags=np.concatenate([batch.flags for batch in batches]),
+            steps=np.concatenate([batch.steps for batch in batches]),
+            halves=np.concatenate([batch.halves for batch in batches]),
+            stats=np.concatenate([batch.stats for batch in batches]),
+            masks=np.concatenate([batch.masks for batch in batches]),
+            policy_rows=np.concatenate([batch.policy_rows + offset for batch, offset in zip(batches, offsets)]).astype(np.int32),
+            policy_actions=np.concatenate([batch.policy_actions for batch in batches]),
+            policy_values=np.concatenate([batch.policy_values for batch in batches]),
+            values=np.concatenate([batch.values for batch in batches]),
+            action_dim=batches[0].action_dim,
+            saturated=sum(batch.saturated for batch in batches),
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            array.nbytes
+            for array in (
+                self.flags,
+                self.steps,
+                self.halves,
+                self.stats,
+                self.masks,
+                self.policy_rows,
+                self.policy_actions,
+                self.policy_values,
+                self.values,
+            )
+        )
+
+    def decode(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Float32 ``(observations, masks, policies, values)`` arrays for ``PolicyValueNet.update``."""
+        count = len(self)
+        observations = np.empty((count, BOARD_SIZE + self.stats.shape[1]), dtype=np.float32)
+        boards = observations[:, :BOARD_SIZE].reshape(count, BOARD_SHAPE[0], CELLS)
+        flags = np.unpackbits(self.flags.reshape(count, len(BINARY_CHANNELS), -1), axis=-1, count=CELLS)
+        boards[:, BINARY_CHANNELS] = flags
+        boards[:, STEP_CHANNELS] = (self.steps / STEP_SCALE).reshape(count, len(STEP_CHANNELS), CELLS)
+        boards[:, HALF_CHANNELS] = self.halves.reshape(count, len(HALF_CHANNELS), CELLS)
+        observations[:, BOARD_SIZE:] = self.stats
+        masks = np.unpackbits(self.masks, axis=-1, count=self.action_dim).astype(np.float32)
+        policies = np.zeros((count, self.action_dim), dtype=np.float32)
+        policies[self.policy_rows, self.policy_actions] = self.policy_values
+        return observations, masks, policies, self.values.copy()
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
+from functools import partial
+import threading
 
 import numpy as np
 
 from SDK.utils.constants import (
     ANT_GENERATION_CYCLE,
     ANT_MAX_HP,
+    BASE_UPGRADE_COST,
     LIGHTNING_STORM_ANT_DAMAGE,
     LIGHTNING_STORM_TOWER_DAMAGE,
     LIGHTNING_STORM_TOWER_INTERVAL,
+    MAP_SIZE,
     MAX_ACTIONS,
     OperationType,
     PLAYER_BASES,
@@ -20,14 +26,14 @@ from SDK.utils.constants import (
     TOWER_UPGRADE_TREE,
     TowerType,
 )
-from SDK.utils.features import FeatureExtractor
-from SDK.utils.geometry import hex_distance
+from SDK.utils.features import HEX_DISTANCE, FeatureExtractor
+from SDK.utils.geometry import hex_distance, is_highland, is_valid_pos
 from SDK.backend.state import BackendState
 from SDK.backend.model import Operation, Tower
 from SDK.utils.turns import DecisionContext
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ActionBundle:
     name: str
     operations: tuple[Operation, ...] = ()
@@ -38,10 +44,110 @@ class ActionBundle:
         return [op.to_protocol_tokens() for op in self.operations]
 
 
+BASE_UPGRADE_OPERATIONS = (OperationType.UPGRADE_GENERATION_SPEED, OperationType.UPGRADE_GENERATED_ANT)
+PAIRABLE_OPERATIONS = (
+    OperationType.BUILD_TOWER,
+    OperationType.UPGRADE_TOWER,
+    OperationType.DOWNGRADE_TOWER,
+    *BASE_UPGRADE_OPERATIONS,
+)
+TOWER_OPERATIONS = (OperationType.BUILD_TOWER, OperationType.UPGRADE_TOWER, OperationType.DOWNGRADE_TOWER)
+ROLLOUT_CACHE_LIMIT = 4096
+# PRESSURE_KERNEL[x * MAP_SIZE + y] is one level-0 ant's pressure contribution over the board from (x, y).
+PRESSURE_KERNEL = np.where(HEX_DISTANCE <= 6, np.maximum(0.0, 6.5 - HEX_DISTANCE.astype(np.float64)), 0.0)
+
+
+def _operations_key(operations: tuple[Operation, ...]) -> tuple[tuple[int, int, int], ...]:
+    return tuple((int(op.op_type), op.arg0, op.arg1) for op in operations)
+
+
+def _state_key(state: BackendState) -> tuple:
+    """``checksum()`` plus the fields it leaves out that candidates or ``evaluate`` still read."""
+    return (
+        state.checksum(),
+        tuple((base.generation_level, base.ant_level) for base in state.bases),
+        state.weapon_cooldowns.tobytes(),
+        tuple((int(effect.weapon_type), effect.player, effect.x, effect.y, effect.remaining_turns) for effect in state.active_effects),
+        tuple(state.die_count),
+        tuple(state.old_count),
+        state.terminal,
+        state.winner,
+    )
+
+
+def _weapon_kernels(radius: int) -> tuple[np.ndarray, np.ndarray]:
+    """``(disk, ramp)`` hex kernels over flat cells; row ``x * MAP_SIZE + y`` is 1 within ``radius``
+    of ``(x, y)`` for the disk and ``radius + 1 - distance`` for the ramp."""
+    distance = HEX_DISTANCE.reshape(MAP_SIZE * MAP_SIZE, -1)
+    inside = distance <= radius
+    return inside.astype(np.float64), np.where(inside, radius + 1.0 - distance, 0.0)
+
+
+def _spread(entities: list, weights: list[float], kernel: np.ndarray) -> np.ndarray:
+    """The entity raster convolved with ``kernel``, using only the occupied kernel rows."""
+    return np.asarray(weights, dtype=np.float64) @ kernel[[entity.x * MAP_SIZE + entity.y for entity in entities]]
+
+
+WEAPON_KERNELS = {stats.attack_range: _weapon_kernels(stats.attack_range) for stats in SUPER_WEAPON_STATS.values()}
+WEAPON_CELLS = np.array([is_valid_pos(x, y) for x in range(MAP_SIZE) for y in range(MAP_SIZE)])
+
+
+class BundleCache:
+    """Bounded LRU of ranked bundle tuples, safe to share between catalogs in one process.
+
+    Copies of an agent share the cache rather than duplicating it.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[ActionBundle, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __deepcopy__(self, memo: dict) -> BundleCache:
+        return self
+
+    def get(self, key: tuple) -> tuple[ActionBundle, ...] | None:
+        with self._lock:
+            bundles = self._entries.get(key)
+            if bundles is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return bundles
+
+    def put(self, key: tuple, bundles: tuple[ActionBundle, ...]) -> None:
+        with self._lock:
+            self._entries[key] = bundles
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
 class ActionCatalog:
-    def __init__(self, max_actions: int = MAX_ACTIONS, feature_extractor: FeatureExtractor | None = None) -> None:
+    def __init__(
+        self,
+        max_actions: int = MAX_ACTIONS,
+        feature_extractor: FeatureExtractor | None = None,
+        rollout_executor: Executor | None = None,
+        bundle_cache: BundleCache | None = None,
+    ) -> None:
         self.max_actions = max_actions
         self.feature_extractor = feature_extractor or FeatureExtractor(max_actions=max_actions)
+        self.rollout_executor = rollout_executor
+        self.bundle_cache = bundle_cache
+        self._rollout_values: dict[tuple, float] = {}
 
     def build(
         self,
@@ -53,25 +159,49 @@ class ActionCatalog:
     ) -> list[ActionBundle]:
         if context is None:
             context = DecisionContext.for_player(player)
+        state_key = None
+        if self.bundle_cache is not None:
+            state_key = _state_key(state)
+            key = (state_key, player, context.phase, rerank, self.max_actions)
+            cached = self.bundle_cache.get(key)
+            if cached is None:
+                cached = tuple(self._build(state, player, context, rerank, state_key))
+                self.bundle_cache.put(key, cached)
+            return list(cached)
+        return self._build(state, player, context, rerank, state_key)
+
+    def _build(
+        self,
+        state: BackendState,
+        player: int,
+        context: DecisionContext,
+        rerank: bool,
+        state_key: tuple | None,
+    ) -> list[ActionBundle]:
         bundles: list[ActionBundle] = [ActionBundle(name="hold", score=0.0, tags=("noop",))]
-        bundles.extend(self._build_candidates(state, player))
-        bundles.extend(self._upgrade_candidates(state, player))
-        bundles.extend(self._downgrade_candidates(state, player))
+        pressure = self._enemy_pressure_field(state, player)
+        bundles.extend(self._build_candidates(state, player, pressure))
+        bundles.extend(self._upgrade_candidates(state, player, pressure))
+        bundles.extend(self._downgrade_candidates(state, player, pressure))
         bundles.extend(self._base_upgrade_candidates(state, player))
         bundles.extend(self._superweapon_candidates(state, player))
         bundles.extend(self._paired_candidates(state, player, bundles[1:]))
-        unique: dict[tuple[tuple[int, int, int], ...], ActionBundle] = {}
-        for bundle in bundles:
-            key = tuple((int(op.op_type), op.arg0, op.arg1) for op in bundle.operations)
-            if key not in unique or bundle.score > unique[key].score:
-                unique[key] = bundle
-        ordered = sorted(unique.values(), key=lambda item: item.score, reverse=True)
+        ordered = self._rank(bundles)
         ordered = ordered[: min(len(ordered), self.max_actions * 2)]
         if not rerank:
             return ordered[: self.max_actions]
-        reranked = self._rerank_with_one_step_rollout(state, player, context, ordered)
+        reranked = self._rerank_with_one_step_rollout(state, player, context, ordered, state_key)
         return reranked[: self.max_actions]
 
+    @staticmethod
+    def _rank(bundles: list[ActionBundle]) -> list[ActionBundle]:
+        unique: dict[tuple[tuple[int, int, int], ...], ActionBundle] = {}
+        for bundle in bundles:
+            key = _operations_key(bundle.operations)
+            if key not in unique or bundle.score > unique[key].score:
+                unique[key] = bundle
+        return sorted(unique.values(), key=lambda item: item.score, reverse=True)
+
     def action_mask(self, bundles: list[ActionBundle]) -> np.ndarray:
         mask = np.zeros(self.max_actions, dtype=np.int8)
         mask[: len(bundles)] = 1
@@ -82,7 +212,7 @@ class ActionCatalog:
             return bundles[action_index]
         return bundles[0]
 
-    def _build_candidates(self, state: BackendState, player: int) -> list[ActionBundle]:
+    def _build_candidates(self, state: BackendState, player: int, pressure: list[list[float]]) -> list[ActionBundle]:
         results: list[ActionBundle] = []
         tower_count = state.tower_count(player)
         build_cost = state.build_tower_cost(tower_count)
@@ -92,17 +222,16 @@ class ActionCatalog:
             op = Operation(OperationType.BUILD_TOWER, x, y)
             if not state.can_apply_operation(player, op):
                 continue
-            pressure = self._local_enemy_pressure(state, player, x, y)
             lane_bonus = state.slot_priority(player, x, y)
-            score = lane_bonus + pressure * 2.5 - build_cost * 0.03
+            score = lane_bonus + pressure[x][y] * 2.5 - build_cost * 0.03
             results.append(ActionBundle(name=f"build@{x},{y}", operations=(op,), score=score, tags=("build",)))
         return results
 
-    def _upgrade_candidates(self, state: BackendState, player: int) -> list[ActionBundle]:
+    def _upgrade_candidates(self, state: BackendState, player: int, pressure: list[list[float]]) -> list[ActionBundle]:
         results: list[ActionBundle] = []
         enemy_base = PLAYER_BASES[1 - player]
         for tower in state.towers_of(player):
-            local_density = self._local_enemy_pressure(state, player, tower.x, tower.y)
+            local_density = pressure[tower.x][tower.y]
             for target in TOWER_UPGRADE_TREE.get(tower.tower_type, ()): 
                 op = Operation(OperationType.UPGRADE_TOWER, tower.tower_id, int(target))
                 if not state.can_apply_operation(player, op):
@@ -119,11 +248,10 @@ class ActionCatalog:
                 )
         return results
 
-    def _downgrade_candidates(self, state: BackendState, player: int) -> list[ActionBundle]:
+    def _downgrade_candidates(self, state: BackendState, player: int, pressure: list[list[float]]) -> list[ActionBundle]:
         results: list[ActionBundle] = []
         for tower in state.towers_of(player):
-            pressure = self._local_enemy_pressure(state, player, tower.x, tower.y)
-            if pressure > 1.5:
+            if pressure[tower.x][tower.y] > 1.5:
                 continue
             op = Operation(OperationType.DOWNGRADE_TOWER, tower.tower_id)
             if not state.can_apply_operation(player, op):
@@ -161,54 +289,25 @@ class ActionCatalog:
         enemy_ants = state.ants_of(enemy)
         my_ants = state.ants_of(player)
         enemy_towers = state.towers_of(enemy)
-
-        if (enemy_ants or enemy_towers) and state.weapon_cooldowns[player, SuperWeaponType.LIGHTNING_STORM] == 0 and state.coins[player] >= SUPER_WEAPON_STATS[SuperWeaponType.LIGHTNING_STORM].cost:
-            centers = {(ant.x, ant.y) for ant in enemy_ants}
-            centers.update((tower.x, tower.y) for tower in enemy_towers)
-            best = max(
-                ((x, y, self._storm_value(state, player, x, y)) for x, y in centers),
-                key=lambda item: item[2],
-                default=None,
-            )
-            if best and best[2] > 1.5:
-                op = Operation(OperationType.USE_LIGHTNING_STORM, best[0], best[1])
-                if state.can_apply_operation(player, op):
-                    results.append(ActionBundle(f"storm@{best[0]},{best[1]}", (op,), best[2], ("weapon", "storm")))
-
-        if enemy_towers and state.weapon_cooldowns[player, SuperWeaponType.EMP_BLASTER] == 0 and state.coins[player] >= SUPER_WEAPON_STATS[SuperWeaponType.EMP_BLASTER].cost:
-            centers = {(tower.x, tower.y) for tower in enemy_towers}
-            scored = [
-                (x, y, self._emp_value(state, player, x, y))
-                for x, y in centers
-            ]
-            best = max(scored, key=lambda item: item[2], default=None)
-            if best and best[2] > 2.0:
-                op = Operation(OperationType.USE_EMP_BLASTER, best[0], best[1])
-                if state.can_apply_operation(player, op):
-                    results.append(ActionBundle(f"emp@{best[0]},{best[1]}", (op,), best[2], ("weapon", "emp")))
-
-        if my_ants and state.weapon_cooldowns[player, SuperWeaponType.DEFLECTOR] == 0 and state.coins[player] >= SUPER_WEAPON_STATS[SuperWeaponType.DEFLECTOR].cost:
-            best = max(
-                ((ant.x, ant.y, self._deflector_value(state, player, ant.x, ant.y)) for ant in my_ants),
-                key=lambda item: item[2],
-                default=None,
-            )
-            if best and best[2] > 1.5:
-                op = Operation(OperationType.USE_DEFLECTOR, best[0], best[1])
-                if state.can_apply_operation(player, op):
-                    results.append(ActionBundle(f"deflect@{best[0]},{best[1]}", (op,), best[2], ("weapon", "shield")))
-
-        if my_ants and state.weapon_cooldowns[player, SuperWeaponType.EMERGENCY_EVASION] == 0 and state.coins[player] >= SUPER_WEAPON_STATS[SuperWeaponType.EMERGENCY_EVASION].cost:
-            best = max(
-                ((ant.x, ant.y, self._evasion_value(state, player, ant.x, ant.y)) for ant in my_ants),
-                key=lambda item: item[2],
-                default=None,
-            )
-            if best and best[2] > 1.0:
-                op = Operation(OperationType.USE_EMERGENCY_EVASION, best[0], best[1])
-                if state.can_apply_operation(player, op):
-                    results.append(ActionBundle(f"evasion@{best[0]},{best[1]}", (op,), best[2], ("weapon", "panic")))
-
+        options = (
+            (OperationType.USE_LIGHTNING_STORM, enemy_ants or enemy_towers, 1.5, "storm", "storm", self._storm_values),
+            (OperationType.USE_EMP_BLASTER, enemy_towers, 2.0, "emp", "emp", self._emp_values),
+            (OperationType.USE_DEFLECTOR, my_ants, 1.5, "deflect", "shield", self._deflector_values),
+            (OperationType.USE_EMERGENCY_EVASION, my_ants, 1.0, "evasion", "panic", self._evasion_values),
+        )
+        for op_type, targets, threshold, name, tag, values in options:
+            weapon_type = SuperWeaponType(op_type % 10)
+            if not targets or state.weapon_cooldowns[player, weapon_type] != 0 or state.coins[player] < SUPER_WEAPON_STATS[weapon_type].cost:
+                continue
+            field = np.where(WEAPON_CELLS, values(state, player), -np.inf)
+            cell = int(np.argmax(field))
+            value = float(field[cell])
+            if value <= threshold:
+                continue
+            x, y = divmod(cell, MAP_SIZE)
+            op = Operation(op_type, x, y)
+            if state.can_apply_operation(player, op):
+                results.append(ActionBundle(f"{name}@{x},{y}", (op,), value, ("weapon", tag)))
         return results
 
     def _paired_candidates(self, state: BackendState, player: int, singles: list[ActionBundle]) -> list[ActionBundle]:
@@ -222,52 +321,167 @@ class ActionCatalog:
                 operations = first.operations + second.operations
                 if len(operations) > 2:
                     continue
-                trial = state.clone()
-                invalid_ops = trial.apply_operation_list(player, operations)
-                if invalid_ops:
+                if not self._pair_is_legal(state, player, first.operations[0], second.operations[0]):
                     continue
                 score = first.score + second.score * 0.9
                 name = f"{first.name}+{second.name}"
                 results.append(ActionBundle(name=name, operations=tuple(operations), score=score, tags=("combo",)))
         return results
 
+    def _pair_is_legal(self, state: BackendState, player: int, first: Operation, second: Operation) -> bool:
+        """Whether ``apply_operation_list(player, (first, second))`` on a clone would accept both.
+
+        The second operation is checked against the state after ``first`` with ``first`` still
+        pending, so the first operation's cost is counted twice, as in the clone-based check.
+        """
+        if first.op_type not in PAIRABLE_OPERATIONS or second.op_type not in PAIRABLE_OPERATIONS:
+            return not state.clone().apply_operation_list(player, (first, second))
+        if not state.can_apply_operation(player, first):
+            return False
+        removed = None
+        if first.op_type == OperationType.DOWNGRADE_TOWER:
+            tower = state.tower_by_id(first.arg0)
+            if tower.tower_type == TowerType.BASIC:
+                removed = tower
+
+        if second.op_type == OperationType.BUILD_TOWER:
+            cell = (second.arg0, second.arg1)
+            if not is_highland(player, *cell) or cell in PLAYER_BASES or state.is_shielded_by_emp(player, *cell):
+                return False
+            if first.op_type == OperationType.BUILD_TOWER and (first.arg0, first.arg1) == cell:
+                return False
+            occupant = state.tower_at(*cell)
+            if occupant is not None and occupant is not removed:
+                return False
+        elif second.op_type in (OperationType.UPGRADE_TOWER, OperationType.DOWNGRADE_TOWER):
+            if first.op_type in (OperationType.UPGRADE_TOWER, OperationType.DOWNGRADE_TOWER) and first.arg0 == second.arg0:
+                return False
+            tower = state.tower_by_id(second.arg0)
+            if tower is None or tower.player != player or state.is_shielded_by_emp(player, tower.x, tower.y):
+                return False
+            if second.op_type == OperationType.UPGRADE_TOWER and not tower.is_upgrade_type_valid(TowerType(second.arg1)):
+                return False
+        elif first.op_type in BASE_UPGRADE_OPERATIONS or self._base_level(state, player, second) >= 2:
+            return False
+
+        coins = state.coins[player] + state.operation_income(player, first)
+        tower_count = state.tower_count(player)
+        if first.op_type == OperationType.BUILD_TOWER:
+            tower_count += 1
+        elif removed is not None:
+            tower_count -= 1
+        income = 0
+        for index, operation in enumerate((first, second)):
+            if operation.op_type == OperationType.BUILD_TOWER:
+                income -= state.build_tower_cost(tower_count)
+                tower_count += 1
+            elif operation.op_type == OperationType.DOWNGRADE_TOWER:
+                tower = state.tower_by_id(operation.arg0)
+                if index == 0:
+                    if removed is not None:
+                        continue
+                    tower = tower.clone()
+                    tower.downgrade_or_destroy()
+                if tower.tower_type == TowerType.BASIC:
+                    income += state.destroy_tower_income(tower_count, tower)
+                    tower_count -= 1
+                else:
+                    income += state.downgrade_tower_income(tower.tower_type, tower)
+            elif index == 0 and operation.op_type in BASE_UPGRADE_OPERATIONS:
+                level = self._base_level(state, player, operation) + 1
+                income -= state.upgrade_base_cost(level) if level < len(BASE_UPGRADE_COST) else 0
+            else:
+                income += state.operation_income(player, operation)
+        return coins + income >= 0
+
+    @staticmethod
+    def _base_level(state: BackendState, player: int, operation: Operation) -> int:
+        if operation.op_type == OperationType.UPGRADE_GENERATION_SPEED:
+            return state.bases[player].generation_level
+        return state.bases[player].ant_level
+
     def _rerank_with_one_step_rollout(
         self,
         state: BackendState,
         player: int,
         context: DecisionContext,
         bundles: list[ActionBundle],
+        state_key: tuple | None = None,
     ) -> list[ActionBundle]:
         baseline = self.feature_extractor.evaluate(state, player, context=context)
+        rollout_key = (state_key or _state_key(state), player, context.settles_after_action)
+        keys = [(rollout_key, _operations_key(bundle.operations)) for bundle in bundles]
+        missing = [index for index, key in enumerate(keys) if key not in self._rollout_values]
+        if missing:
+            reply = None if context.settles_after_action else self._enemy_candidates(state, 1 - player)
+            rollout = partial(self._one_step_rollout, state, player, reply)
+            operations = [bundles[index].operations for index in missing]
+            if self.rollout_executor is not None and len(operations) > 1:
+                trials = list(self.rollout_executor.map(rollout, operations))
+            else:
+                trials = [rollout(item) for item in operations]
+            values = [self.feature_extractor.evaluate(trial, player) for trial in trials]
+            if len(self._rollout_values) + len(missing) > ROLLOUT_CACHE_LIMIT:
+                self._rollout_values.clear()
+            for index, value in zip(missing, values):
+                self._rollout_values[keys[index]] = float(value)
         reranked: list[ActionBundle] = []
-        for bundle in bundles:
-            trial = state.clone()
-            trial.apply_operation_list(player, bundle.operations)
-            child_context = context.next_turn()
-            if not trial.terminal:
-                if context.settles_after_action:
-                    trial.advance_round()
-                else:
-                    enemy = 1 - player
-                    enemy_bundles = self.build(trial, enemy, child_context, rerank=False)
-                    enemy_bundle = enemy_bundles[0] if enemy_bundles else ActionBundle(name="hold")
-                    trial.apply_operation_list(enemy, enemy_bundle.operations)
-                    if not trial.terminal:
-                        trial.advance_round()
-            rollout_value = self.feature_extractor.evaluate(trial, player, context=DecisionContext.for_player(player)) - baseline
+        for bundle, key in zip(bundles, keys):
+            rollout_value = self._rollout_values[key] - baseline
             reranked.append(ActionBundle(bundle.name, bundle.operations, bundle.score + rollout_value * 0.2, bundle.tags))
         reranked.sort(key=lambda item: item.score, reverse=True)
         if not reranked:
             return [ActionBundle(name="hold")]
         return reranked
 
-    def _local_enemy_pressure(self, state: BackendState, player: int, x: int, y: int) -> float:
-        pressure = 0.0
+    def _enemy_candidates(self, state: BackendState, enemy: int) -> tuple[list[ActionBundle], list[ActionBundle], list[ActionBundle]]:
+        """The enemy's unranked candidates on ``state``, split into ``(singles, weapons, pairs)``.
+
+        Tower and base operations of the other player leave the singles and pairs unchanged, and
+        only tower operations can change the weapons.
+        """
+        singles = [ActionBundle(name="hold", score=0.0, tags=("noop",))]
+        pressure = self._enemy_pressure_field(state, enemy)
+        singles.extend(self._build_candidates(state, enemy, pressure))
+        singles.extend(self._upgrade_candidates(state, enemy, pressure))
+        singles.extend(self._downgrade_candidates(state, enemy, pressure))
+        singles.extend(self._base_upgrade_candidates(state, enemy))
+        weapons = self._superweapon_candidates(state, enemy)
+        return singles, weapons, self._paired_candidates(state, enemy, singles[1:] + weapons)
+
+    def _one_step_rollout(
+        self,
+        state: BackendState,
+        player: int,
+        reply: tuple[list[ActionBundle], list[ActionBundle], list[ActionBundle]] | None,
+        operations: tuple[Operation, ...],
+    ) -> BackendState:
+        trial = state.clone()
+        trial.apply_operation_list(player, operations)
+        if trial.terminal:
+            return trial
+        if reply is None:
+            trial.advance_round()
+            return trial
+        enemy = 1 - player
+        if any(operation.op_type not in PAIRABLE_OPERATIONS for operation in operations):
+            enemy_bundle = self.build(trial, enemy, rerank=False)[0]
+        else:
+            singles, weapons, pairs = reply
+            if any(operation.op_type in TOWER_OPERATIONS for operation in operations):
+                weapons = self._superweapon_candidates(trial, enemy)
+            enemy_bundle = self._rank(singles + weapons + pairs)[0]
+        trial.apply_operation_list(enemy, enemy_bundle.operations)
+        if not trial.terminal:
+            trial.advance_round()
+        return trial
+
+    def _enemy_pressure_field(self, state: BackendState, player: int) -> list[list[float]]:
+        """Enemy ant pressure on every cell, summed in ant order so each entry matches a per-cell loop."""
+        field = np.zeros((MAP_SIZE, MAP_SIZE), dtype=np.float64)
         for ant in state.ants_of(1 - player):
-            distance = hex_distance(x, y, ant.x, ant.y)
-            if distance <= 6:
-                pressure += max(0.0, 6.5 - distance) * (1.0 + ant.level * 0.4)
-        return pressure
+            field += PRESSURE_KERNEL[ant.x * MAP_SIZE + ant.y] * (1.0 + ant.level * 0.4)
+        return field.tolist()
 
     def _tower_type_fit(self, tower_type: TowerType, local_density: float, forward_distance: int) -> float:
         if tower_type in (TowerType.HEAVY, TowerType.HEAVY_PLUS, TowerType.BEWITCH):
@@ -294,51 +508,43 @@ class ActionCatalog:
             return density_bonus + forward_bonus + cadence + branch_bonus
         return 0.0
 
-    def _storm_value(self, state: BackendState, player: int, x: int, y: int) -> float:
+    def _storm_values(self, state: BackendState, player: int) -> np.ndarray:
         enemy = 1 - player
         stats = SUPER_WEAPON_STATS[SuperWeaponType.LIGHTNING_STORM]
         tower_strikes = max(stats.duration // LIGHTNING_STORM_TOWER_INTERVAL, 1)
-        total = 0.0
-        for ant in state.ants_of(enemy):
-            distance = hex_distance(x, y, ant.x, ant.y)
-            if distance > stats.attack_range:
-                continue
-            immediate_damage = min(LIGHTNING_STORM_ANT_DAMAGE, ant.hp)
-            sustained_damage = min(ant.hp, LIGHTNING_STORM_ANT_DAMAGE * tower_strikes)
-            total += immediate_damage / max(ant.max_hp, 1) * (2.5 + ant.level)
-            total += sustained_damage / max(ant.max_hp, 1) * (0.8 + ant.level * 0.4)
-            if ant.hp <= LIGHTNING_STORM_ANT_DAMAGE:
-                total += ant.kill_reward
-            total += max(0.0, stats.attack_range + 1 - distance) * 0.2
-        for tower in state.towers_of(enemy):
-            distance = hex_distance(x, y, tower.x, tower.y)
-            if distance > stats.attack_range:
-                continue
-            projected_damage = min(tower.hp, LIGHTNING_STORM_TOWER_DAMAGE * tower_strikes)
-            total += projected_damage / max(tower.max_hp, 1) * (6.0 + tower.level * 2.5)
-            total += max(0.0, stats.attack_range + 1 - distance) * 0.15
-        return total - stats.cost * 0.03
-
-    def _emp_value(self, state: BackendState, player: int, x: int, y: int) -> float:
-        total = 0.0
-        for tower in state.towers_of(1 - player):
-            distance = hex_distance(x, y, tower.x, tower.y)
-            if distance <= SUPER_WEAPON_STATS[SuperWeaponType.EMP_BLASTER].attack_range:
-                total += 3.0 + tower.level * 2.5
-        return total - SUPER_WEAPON_STATS[SuperWeaponType.EMP_BLASTER].cost * 0.025
-
-    def _deflector_value(self, state: BackendState, player: int, x: int, y: int) -> float:
-        total = 0.0
-        for ant in state.ants_of(player):
-            if hex_distance(x, y, ant.x, ant.y) <= SUPER_WEAPON_STATS[SuperWeaponType.DEFLECTOR].attack_range:
-                total += 0.8 + ant.level * 0.8
-        total += max(0.0, 7 - state.nearest_ant_distance(player)) * 0.5
-        return total - SUPER_WEAPON_STATS[SuperWeaponType.DEFLECTOR].cost * 0.02
-
-    def _evasion_value(self, state: BackendState, player: int, x: int, y: int) -> float:
-        total = 0.0
-        for ant in state.ants_of(player):
-            if hex_distance(x, y, ant.x, ant.y) <= SUPER_WEAPON_STATS[SuperWeaponType.EMERGENCY_EVASION].attack_range:
-                total += 0.6 + ant.level * 0.7
-        total += max(0.0, 5 - state.nearest_ant_distance(player))
-        return total - SUPER_WEAPON_STATS[SuperWeaponType.EMERGENCY_EVASION].cost * 0.02
+        ants = state.ants_of(enemy)
+        towers = state.towers_of(enemy)
+        hit = [
+            min(LIGHTNING_STORM_ANT_DAMAGE, ant.hp) / max(ant.max_hp, 1) * (2.5 + ant.level)
+            + min(ant.hp, LIGHTNING_STORM_ANT_DAMAGE * tower_strikes) / max(ant.max_hp, 1) * (0.8 + ant.level * 0.4)
+            + (ant.kill_reward if ant.hp <= LIGHTNING_STORM_ANT_DAMAGE else 0)
+            for ant in ants
+        ]
+        hit.extend(
+            min(tower.hp, LIGHTNING_STORM_TOWER_DAMAGE * tower_strikes) / max(tower.max_hp, 1) * (6.0 + tower.level * 2.5)
+            for tower in towers
+        )
+        reach = [0.2] * len(ants) + [0.15] * len(towers)
+        entities = ants + towers
+        disk, ramp = WEAPON_KERNELS[stats.attack_range]
+        return _spread(entities, hit, disk) + _spread(entities, reach, ramp) - stats.cost * 0.03
+
+    def _emp_values(self, state: BackendState, player: int) -> np.ndarray:
+        stats = SUPER_WEAPON_STATS[SuperWeaponType.EMP_BLASTER]
+        towers = state.towers_of(1 - player)
+        disk, _ = WEAPON_KERNELS[stats.attack_range]
+        return _spread(towers, [3.0 + tower.level * 2.5 for tower in towers], disk) - stats.cost * 0.025
+
+    def _deflector_values(self, state: BackendState, player: int) -> np.ndarray:
+        stats = SUPER_WEAPON_STATS[SuperWeaponType.DEFLECTOR]
+        ants = state.ants_of(player)
+        disk, _ = WEAPON_KERNELS[stats.attack_range]
+        bonus = max(0.0, 7 - state.nearest_ant_distance(player)) * 0.5
+        return _spread(ants, [0.8 + ant.level * 0.8 for ant in ants], disk) + bonus - stats.cost * 0.02
+
+    def _evasion_values(self, state: BackendState, player: int) -> np.ndarray:
+        stats = SUPER_WEAPON_STATS[SuperWeaponType.EMERGENCY_EVASION]
+        ants = state.ants_of(player)
+        disk, _ = WEAPON_KERNELS[stats.attack_range]
+        bonus = max(0.0, 5 - state.nearest_ant_distance(player))
+        return _spread(ants, [0.6 + ant.level * 0.7 for ant in ants], disk) + bonus - stats.cost * 0.02
@@ -21,11 +21,113 @@ from SDK.utils.constants import (
     SuperWeaponType,
     SUPER_WEAPON_STATS,
 )
-from SDK.utils.geometry import hex_distance
+from SDK.backend.model import Ant, Tower, WeaponEffect
 from SDK.backend.state import BackendState
 from SDK.utils.turns import DecisionContext
 
 
+def _hex_distance_table() -> np.ndarray:
+    """``table[x0 * MAP_SIZE + y0, x1, y1]`` is ``hex_distance(x0, y0, x1, y1)``."""
+    cells = np.indices((MAP_SIZE, MAP_SIZE)).reshape(2, -1)
+    x0 = cells[0][:, None, None]
+    y0 = cells[1][:, None, None]
+    x1, y1 = np.indices((MAP_SIZE, MAP_SIZE))
+    dy = np.abs(y0 - y1)
+    shift = np.where(x0 > x1, y0 % 2, 1 - y0 % 2) * (dy % 2)
+    dx = np.maximum(0, np.abs(x0 - x1) - dy // 2 - shift)
+    return (dx + dy).astype(np.int16)
+
+
+def _terrain_channels(player: int) -> np.ndarray:
+    terrain = np.array(MAP_PROPERTY)
+    channels = np.zeros((4, MAP_SIZE, MAP_SIZE), dtype=np.float32)
+    channels[0][terrain == Terrain.PATH] = 1.0
+    channels[1][terrain == Terrain.PLAYER0_HIGHLAND] = 1.0 if player == 0 else 0.5
+    channels[2][terrain == Terrain.PLAYER1_HIGHLAND] = 1.0 if player == 1 else 0.5
+    channels[3][terrain == Terrain.BARRIER] = 1.0
+    return channels
+
+
+BOARD_SHAPE = (28, MAP_SIZE, MAP_SIZE)
+BOARD_SIZE = math.prod(BOARD_SHAPE)
+HEX_DISTANCE = _hex_distance_table()
+TERRAIN_CHANNELS = (_terrain_channels(0), _terrain_channels(1))
+BEHAVIOR_CHANNELS = {
+    AntBehavior.RANDOM: 17,
+    AntBehavior.BEWITCHED: 18,
+    AntBehavior.CONTROL_FREE: 19,
+}
+EFFECT_CHANNELS = {
+    SuperWeaponType.LIGHTNING_STORM: 20,
+    SuperWeaponType.EMP_BLASTER: 22,
+    SuperWeaponType.DEFLECTOR: 24,
+    SuperWeaponType.EMERGENCY_EVASION: 26,
+}
+# Per weapon and centre ``x * MAP_SIZE + y``: the non-void cells inside the effect radius.
+EFFECT_DISKS = {
+    weapon_type: (HEX_DISTANCE <= SUPER_WEAPON_STATS[weapon_type].attack_range)
+    & (np.array(MAP_PROPERTY) != Terrain.VOID)
+    for weapon_type in EFFECT_CHANNELS
+}
+
+
+def _world_pos(x: int, y: int) -> tuple[float, float]:
+    return x + 0.5 * (y & 1), y * math.sqrt(3) / 2.0
+
+
+def _angle_delta(angle: float, target: float) -> float:
+    return (angle - target + math.pi) % (2 * math.pi) - math.pi
+
+
+def _arc_cover_table(player: int) -> list[list[int]]:
+    """Per cell, the bitmask of forward arcs (-30, 0, +30 degrees) a tower there covers for ``player``."""
+    world_base_x, world_base_y = _world_pos(*PLAYER_BASES[player])
+    world_enemy_x, world_enemy_y = _world_pos(*PLAYER_BASES[1 - player])
+    forward_angle = math.atan2(world_enemy_y - world_base_y, world_enemy_x - world_base_x)
+    tolerance = math.radians(20.0)
+    table = [[0] * MAP_SIZE for _ in range(MAP_SIZE)]
+    for x in range(MAP_SIZE):
+        for y in range(MAP_SIZE):
+            tower_world_x, tower_world_y = _world_pos(x, y)
+            angle = math.atan2(tower_world_y - world_base_y, tower_world_x - world_base_x)
+            if abs(_angle_delta(angle, forward_angle)) > math.pi / 2:
+                continue
+            for bit, target in enumerate((-30.0, 0.0, 30.0)):
+                if abs(_angle_delta(angle, forward_angle + math.radians(target))) <= tolerance:
+                    table[x][y] |= 1 << bit
+    return table
+
+
+SUMMARY_NAMES = (
+    "round_ratio",
+    "hp_delta",
+    "coin_ratio",
+    "safe_coin",
+    "frontline_advantage",
+    "enemy_front_distance",
+    "my_front_distance",
+    "enemy_progress",
+    "my_progress",
+    "tower_count",
+    "enemy_tower_count",
+    "tower_level_sum",
+    "enemy_tower_level_sum",
+    "kill_delta",
+    "old_delta",
+    "tower_spread",
+    "slot_fill_ratio",
+    "generation_level",
+    "ant_level",
+    "hostile_distance",
+    "base_arc_coverage",
+    "tower_spacing",
+)
+HEX_DISTANCE_ROWS = HEX_DISTANCE.reshape(MAP_SIZE * MAP_SIZE, -1).tolist()
+BASE_DISTANCE = tuple(HEX_DISTANCE[x * MAP_SIZE + y].tolist() for x, y in PLAYER_BASES)
+ARC_COVER = (_arc_cover_table(0), _arc_cover_table(1))
+ARC_COVERAGE = tuple(float(bin(mask).count("1") / 3) for mask in range(8))
+
+
 @dataclass(slots=True)
 class StateFeatures:
     values: np.ndarray
@@ -36,55 +138,96 @@ class FeatureExtractor:
     def __init__(self, max_actions: int = MAX_ACTIONS) -> None:
         self.max_actions = max_actions
 
-    @staticmethod
-    def _world_pos(x: int, y: int) -> tuple[float, float]:
-        return x + 0.5 * (y & 1), y * math.sqrt(3) / 2.0
+    def _summary_values(self, state: BackendState, player: int) -> tuple[float, ...]:
+        """All SUMMARY_NAMES scalars from one sweep over the towers and ants."""
+        enemy = 1 - player
+        my_cells: list[int] = []
+        arc_cover = ARC_COVER[player]
+        covered = 0
+        tower_level_sum = 0
+        enemy_tower_count = 0
+        enemy_tower_level_sum = 0
+        for tower in state.towers:
+            if tower.player == player:
+                my_cells.append(tower.x * MAP_SIZE + tower.y)
+                tower_level_sum += tower.level
+                covered |= arc_cover[tower.x][tower.y]
+            elif tower.player == enemy:
+                enemy_tower_count += 1
+                enemy_tower_level_sum += tower.level
 
-    @staticmethod
-    def _angle_delta(angle: float, target: float) -> float:
-        return (angle - target + math.pi) % (2 * math.pi) - math.pi
-
-    def _base_arc_coverage(self, state: BackendState, player: int) -> float:
-        my_towers = state.towers_of(player)
-        if not my_towers:
-            return 0.0
-        base_x, base_y = PLAYER_BASES[player]
-        enemy_x, enemy_y = PLAYER_BASES[1 - player]
-        world_base_x, world_base_y = self._world_pos(base_x, base_y)
-        world_enemy_x, world_enemy_y = self._world_pos(enemy_x, enemy_y)
-        forward_angle = math.atan2(world_enemy_y - world_base_y, world_enemy_x - world_base_x)
-        target_offsets = (-30.0, 0.0, 30.0)
-        tolerance = math.radians(20.0)
-        covered = {target: False for target in target_offsets}
-        for tower in my_towers:
-            tower_world_x, tower_world_y = self._world_pos(tower.x, tower.y)
-            angle = math.atan2(tower_world_y - world_base_y, tower_world_x - world_base_x)
-            if abs(self._angle_delta(angle, forward_angle)) > math.pi / 2:
+        to_my_base = BASE_DISTANCE[player]
+        to_enemy_base = BASE_DISTANCE[enemy]
+        my_front = enemy_front = 32
+        my_progress_terms: list[float] = []
+        enemy_progress_terms: list[float] = []
+        for ant in state.ants:
+            if not ant.is_alive():
                 continue
-            for target in target_offsets:
-                target_angle = forward_angle + math.radians(target)
-                if abs(self._angle_delta(angle, target_angle)) <= tolerance:
-                    covered[target] = True
-        return float(sum(1 for hit in covered.values() if hit) / len(covered))
-
-    def _tower_spacing_score(self, state: BackendState, player: int) -> float:
-        towers = state.towers_of(player)
-        if len(towers) <= 1:
-            return 0.0
+            if ant.player == player:
+                gap = to_enemy_base[ant.x][ant.y]
+                my_front = min(my_front, gap)
+                my_progress_terms.append(float(ANT_AGE_LIMIT) - ant.age - 1.5 * gap)
+            else:
+                gap = to_my_base[ant.x][ant.y]
+                enemy_front = min(enemy_front, gap)
+                if ant.player == enemy:
+                    enemy_progress_terms.append(float(ANT_AGE_LIMIT) - ant.age - 1.5 * gap)
+        enemy_progress = np.mean(enemy_progress_terms, dtype=np.float32) if enemy_progress_terms else 0.0
+        my_progress = np.mean(my_progress_terms, dtype=np.float32) if my_progress_terms else 0.0
+
         penalty = 0.0
         distant_pair = False
-        for index, tower in enumerate(towers[:-1]):
-            for other in towers[index + 1 :]:
-                gap = hex_distance(tower.x, tower.y, other.x, other.y)
+        for index, cell in enumerate(my_cells[:-1]):
+            row = HEX_DISTANCE_ROWS[cell]
+            for other in my_cells[index + 1 :]:
+                gap = row[other]
                 if gap <= 3:
                     penalty += 5.0
                 elif gap <= 6:
                     penalty += 2.0
                 else:
                     distant_pair = True
-        if len(towers) >= 3 and not distant_pair:
-            penalty += 20.0
-        return float(-penalty / math.sqrt(max(len(towers), 1)))
+        tower_count = len(my_cells)
+        tower_spread = -penalty if tower_count >= 2 else 0.0
+        if tower_count <= 1:
+            tower_spacing = 0.0
+        else:
+            if tower_count >= 3 and not distant_pair:
+                penalty += 20.0
+            tower_spacing = float(-penalty / math.sqrt(max(tower_count, 1)))
+
+        bases = state.bases
+        safe_coin = max(state.coins[player] - state.safe_coin_threshold(player), 0)
+        base_cycle = ANT_GENERATION_CYCLE[0]
+        cycle_span = max(base_cycle - min(ANT_GENERATION_CYCLE), 1e-6)
+        generation_value = (base_cycle - ANT_GENERATION_CYCLE[bases[player].generation_level]) / cycle_span
+        ant_hp_span = max(ANT_MAX_HP[-1] - ANT_MAX_HP[0], 1)
+        ant_value = (ANT_MAX_HP[bases[player].ant_level] - ANT_MAX_HP[0]) / ant_hp_span
+        return (
+            state.round_index / MAX_ROUND,
+            float(bases[player].hp - bases[enemy].hp),
+            state.coins[player] / max(state.coins[enemy], 1),
+            float(safe_coin),
+            float(enemy_front - my_front),
+            float(enemy_front),
+            float(my_front),
+            float(enemy_progress),
+            float(my_progress),
+            float(tower_count),
+            float(enemy_tower_count),
+            float(tower_level_sum),
+            float(enemy_tower_level_sum),
+            float(state.die_count[enemy] - state.die_count[player]),
+            float(state.old_count[enemy] - state.old_count[player]),
+            float(tower_spread),
+            float(tower_count / max(len(HIGHLAND_CELLS[player]), 1)),
+            float(generation_value),
+            float(ant_value),
+            float(enemy_front),
+            ARC_COVERAGE[covered],
+            tower_spacing,
+        )
 
     def summarize(
         self,
@@ -93,125 +236,71 @@ class FeatureExtractor:
         context: DecisionContext | None = None,
     ) -> StateFeatures:
         del context
-        enemy = 1 - player
-        my_towers = state.towers_of(player)
-        enemy_towers = state.towers_of(enemy)
-        my_ants = state.ants_of(player)
-        enemy_ants = state.ants_of(enemy)
-        my_base_x, my_base_y = PLAYER_BASES[player]
-        enemy_base_x, enemy_base_y = PLAYER_BASES[enemy]
-
-        my_front = min((hex_distance(ant.x, ant.y, enemy_base_x, enemy_base_y) for ant in my_ants), default=32)
-        enemy_front = min((hex_distance(ant.x, ant.y, my_base_x, my_base_y) for ant in enemy_ants), default=32)
-        enemy_progress = np.mean(
-            [float(ANT_AGE_LIMIT) - ant.age - 1.5 * hex_distance(ant.x, ant.y, my_base_x, my_base_y) for ant in enemy_ants],
-            dtype=np.float32,
-        ) if enemy_ants else 0.0
-        my_progress = np.mean(
-            [float(ANT_AGE_LIMIT) - ant.age - 1.5 * hex_distance(ant.x, ant.y, enemy_base_x, enemy_base_y) for ant in my_ants],
-            dtype=np.float32,
-        ) if my_ants else 0.0
-        tower_level_sum = sum(tower.level for tower in my_towers)
-        enemy_tower_level_sum = sum(tower.level for tower in enemy_towers)
-        safe_coin = max(state.coins[player] - state.safe_coin_threshold(player), 0)
-        hp_delta = float(state.bases[player].hp - state.bases[enemy].hp)
-        kill_delta = float(state.die_count[enemy] - state.die_count[player])
-        old_delta = float(state.old_count[enemy] - state.old_count[player])
-        tower_spread = state.tower_spread_score(player)
-        slot_fill_ratio = len(my_towers) / max(len(HIGHLAND_CELLS[player]), 1)
-        hostile_distance = float(state.nearest_ant_distance(player))
-        base_cycle = ANT_GENERATION_CYCLE[0]
-        best_cycle = min(ANT_GENERATION_CYCLE)
-        cycle_span = max(base_cycle - best_cycle, 1e-6)
-        generation_value = (base_cycle - ANT_GENERATION_CYCLE[state.bases[player].generation_level]) / cycle_span
-        base_ant_hp = ANT_MAX_HP[0]
-        best_ant_hp = ANT_MAX_HP[-1]
-        ant_hp_span = max(best_ant_hp - base_ant_hp, 1)
-        ant_value = (ANT_MAX_HP[state.bases[player].ant_level] - base_ant_hp) / ant_hp_span
-        base_arc_coverage = self._base_arc_coverage(state, player)
-        tower_spacing = self._tower_spacing_score(state, player)
-
-        named = {
-            "round_ratio": state.round_index / MAX_ROUND,
-            "hp_delta": hp_delta,
-            "coin_ratio": state.coins[player] / max(state.coins[enemy], 1),
-            "safe_coin": float(safe_coin),
-            "frontline_advantage": float(enemy_front - my_front),
-            "enemy_front_distance": float(enemy_front),
-            "my_front_distance": float(my_front),
-            "enemy_progress": float(enemy_progress),
-            "my_progress": float(my_progress),
-            "tower_count": float(len(my_towers)),
-            "enemy_tower_count": float(len(enemy_towers)),
-            "tower_level_sum": float(tower_level_sum),
-            "enemy_tower_level_sum": float(enemy_tower_level_sum),
-            "kill_delta": kill_delta,
-            "old_delta": old_delta,
-            "tower_spread": float(tower_spread),
-            "slot_fill_ratio": float(slot_fill_ratio),
-            "generation_level": float(generation_value),
-            "ant_level": float(ant_value),
-            "hostile_distance": hostile_distance,
-            "base_arc_coverage": float(base_arc_coverage),
-            "tower_spacing": float(tower_spacing),
-        }
-        values = np.array(list(named.values()), dtype=np.float32)
-        return StateFeatures(values=values, named=named)
+        values = self._summary_values(state, player)
+        return StateFeatures(values=np.array(values, dtype=np.float32), named=dict(zip(SUMMARY_NAMES, values)))
 
-    def encode_board(self, state: BackendState, player: int) -> np.ndarray:
+    def encode_board(self, state: BackendState, player: int, out: np.ndarray | None = None) -> np.ndarray:
         enemy = 1 - player
-        board = np.zeros((28, MAP_SIZE, MAP_SIZE), dtype=np.float32)
-        for x in range(MAP_SIZE):
-            for y in range(MAP_SIZE):
-                terrain = MAP_PROPERTY[x][y]
-                if terrain == Terrain.PATH:
-                    board[0, x, y] = 1.0
-                elif terrain == Terrain.PLAYER0_HIGHLAND:
-                    board[1, x, y] = 1.0 if player == 0 else 0.5
-                elif terrain == Terrain.PLAYER1_HIGHLAND:
-                    board[2, x, y] = 1.0 if player == 1 else 0.5
-                elif terrain == Terrain.BARRIER:
-                    board[3, x, y] = 1.0
-                board[14, x, y] = state.pheromone[player, x, y] / float(12 * PHEROMONE_SCALE)
-                board[15, x, y] = state.pheromone[enemy, x, y] / float(12 * PHEROMONE_SCALE)
-        for tower in state.towers:
-            channel = 4 if tower.player == player else 5
-            board[channel, tower.x, tower.y] = 1.0
-            board[6, tower.x, tower.y] = tower.level / 2.0
-            board[7, tower.x, tower.y] = tower.attack_range / 6.0
-            board[8, tower.x, tower.y] = tower.display_cooldown() / 6.0
-            board[9, tower.x, tower.y] = tower.damage / 50.0
-        for ant in state.ants:
-            channel = 10 if ant.player == player else 11
-            board[channel, ant.x, ant.y] += ant.hp / max(ant.max_hp, 1)
-            board[12, ant.x, ant.y] += ant.level / 2.0
-            board[13, ant.x, ant.y] += ant.age / float(ANT_AGE_LIMIT)
-            if ant.frozen:
-                board[16, ant.x, ant.y] += 1.0
-            if ant.behavior == AntBehavior.RANDOM:
-                board[17, ant.x, ant.y] += 1.0
-            elif ant.behavior == AntBehavior.BEWITCHED:
-                board[18, ant.x, ant.y] += 1.0
-            elif ant.behavior == AntBehavior.CONTROL_FREE:
-                board[19, ant.x, ant.y] += 1.0
-        for effect in state.active_effects:
-            base_channel = {
-                SuperWeaponType.LIGHTNING_STORM: 20,
-                SuperWeaponType.EMP_BLASTER: 22,
-                SuperWeaponType.DEFLECTOR: 24,
-                SuperWeaponType.EMERGENCY_EVASION: 26,
-            }[effect.weapon_type]
-            channel = base_channel if effect.player == player else base_channel + 1
-            radius = SUPER_WEAPON_STATS[effect.weapon_type].attack_range
-            strength = effect.remaining_turns / max(SUPER_WEAPON_STATS[effect.weapon_type].duration, 1)
-            for x in range(MAP_SIZE):
-                for y in range(MAP_SIZE):
-                    if MAP_PROPERTY[x][y] == Terrain.VOID:
-                        continue
-                    if effect.in_range(x, y):
-                        board[channel, x, y] = max(board[channel, x, y], strength)
+        if out is None:
+            board = np.zeros(BOARD_SHAPE, dtype=np.float32)
+        else:
+            board = out
+            board.fill(0.0)
+        board[:4] = TERRAIN_CHANNELS[player]
+        self._stamp_pheromone(board, state, player)
+        self._stamp_towers(board, state.towers, player)
+        self._stamp_ants(board, state.ants, player)
+        self._stamp_effects(board, state.active_effects, player)
         return board
 
+    @staticmethod
+    def _stamp_pheromone(board: np.ndarray, state: BackendState, player: int) -> None:
+        board[14] = state.pheromone[player] / float(12 * PHEROMONE_SCALE)
+        board[15] = state.pheromone[1 - player] / float(12 * PHEROMONE_SCALE)
+
+    @staticmethod
+    def _stamp_towers(board: np.ndarray, towers: list[Tower], player: int) -> None:
+        if not towers:
+            return
+        xs = np.array([tower.x for tower in towers], dtype=np.intp)
+        ys = np.array([tower.y for tower in towers], dtype=np.intp)
+        owners = np.array([4 if tower.player == player else 5 for tower in towers], dtype=np.intp)
+        board[owners, xs, ys] = 1.0
+        board[6, xs, ys] = [tower.level / 2.0 for tower in towers]
+        board[7, xs, ys] = [tower.attack_range / 6.0 for tower in towers]
+        board[8, xs, ys] = [tower.display_cooldown() / 6.0 for tower in towers]
+        board[9, xs, ys] = [tower.damage / 50.0 for tower in towers]
+
+    @staticmethod
+    def _stamp_ants(board: np.ndarray, ants: list[Ant], player: int) -> None:
+        if not ants:
+            return
+        # Sequential float32 accumulation keeps stacked ants identical to per-ant ``+=``.
+        xs = np.array([ant.x for ant in ants], dtype=np.intp)
+        ys = np.array([ant.y for ant in ants], dtype=np.intp)
+        owners = np.array([10 if ant.player == player else 11 for ant in ants], dtype=np.intp)
+        np.add.at(board, (owners, xs, ys), np.array([ant.hp / max(ant.max_hp, 1) for ant in ants], dtype=np.float32))
+        np.add.at(board[12], (xs, ys), np.array([ant.level / 2.0 for ant in ants], dtype=np.float32))
+        np.add.at(board[13], (xs, ys), np.array([ant.age / float(ANT_AGE_LIMIT) for ant in ants], dtype=np.float32))
+        frozen = np.array([ant.frozen for ant in ants], dtype=bool)
+        np.add.at(board[16], (xs[frozen], ys[frozen]), np.float32(1.0))
+        behaviors = np.array([BEHAVIOR_CHANNELS.get(ant.behavior, -1) for ant in ants], dtype=np.intp)
+        marked = behaviors >= 0
+        np.add.at(board, (behaviors[marked], xs[marked], ys[marked]), np.float32(1.0))
+
+    @staticmethod
+    def _effect_channel(effect: WeaponEffect, player: int) -> int:
+        base_channel = EFFECT_CHANNELS[effect.weapon_type]
+        return base_channel if effect.player == player else base_channel + 1
+
+    @staticmethod
+    def _stamp_effects(board: np.ndarray, effects: list[WeaponEffect], player: int) -> None:
+        for effect in effects:
+            channel = FeatureExtractor._effect_channel(effect, player)
+            strength = effect.remaining_turns / max(SUPER_WEAPON_STATS[effect.weapon_type].duration, 1)
+            disk = EFFECT_DISKS[effect.weapon_type][effect.x * MAP_SIZE + effect.y]
+            np.maximum(board[channel], np.float32(strength), out=board[channel], where=disk)
+
     def encode_stats(
         self,
         state: BackendState,
@@ -277,30 +366,87 @@ class FeatureExtractor:
         stats = observation["stats"].reshape(-1)
         return np.concatenate([board, stats], dtype=np.float32)
 
+    def encode_batch(
+        self,
+        states: list[BackendState],
+        players: list[int],
+        contexts: list[DecisionContext | None] | None = None,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Write flattened observations row by row, into ``out`` when given, and return the filled rows."""
+        if contexts is None:
+            contexts = [None] * len(states)
+        if not len(states) == len(players) == len(contexts):
+            raise ValueError("states, players and contexts must have the same length")
+        if out is not None and (
+            out.dtype != np.float32 or out.ndim != 2 or not out.flags.c_contiguous or len(out) < len(states)
+        ):
+            raise ValueError(f"out must be a C-contiguous float32 buffer with at least {len(states)} rows")
+        for index, (state, player, context) in enumerate(zip(states, players, contexts)):
+            stats = self.encode_stats(state, player, context=context)
+            if out is None:
+                out = np.empty((len(states), BOARD_SIZE + len(stats)), dtype=np.float32)
+            elif out.shape[1] != BOARD_SIZE + len(stats):
+                raise ValueError(f"out rows must hold {BOARD_SIZE + len(stats)} features, got {out.shape[1]}")
+            self.encode_board(state, player, out=out[index, :BOARD_SIZE].reshape(BOARD_SHAPE))
+            out[index, BOARD_SIZE:] = stats
+        if out is None:
+            raise ValueError("encode_batch needs at least one state or an output buffer")
+        return out[: len(states)]
+
+    @staticmethod
+    def observation_views(batch: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Board and stats views of rows produced by ``encode_batch``; no data is copied."""
+        return batch[:, :BOARD_SIZE].reshape(len(batch), *BOARD_SHAPE), batch[:, BOARD_SIZE:]
+
     def evaluate(
         self,
         state: BackendState,
         player: int,
         context: DecisionContext | None = None,
     ) -> float:
-        summary = self.summarize(state, player, context=context).named
+        del context
+        (
+            _,
+            hp_delta,
+            coin_ratio,
+            safe_coin,
+            frontline_advantage,
+            _,
+            _,
+            enemy_progress,
+            my_progress,
+            _,
+            _,
+            tower_level_sum,
+            enemy_tower_level_sum,
+            kill_delta,
+            old_delta,
+            tower_spread,
+            _,
+            generation_level,
+            ant_level,
+            hostile_distance,
+            base_arc_coverage,
+            tower_spacing,
+        ) = self._summary_values(state, player)
         value = 0.0
-        value += summary["hp_delta"] * 15.0
-        value += summary["coin_ratio"] * 2.5
-        value += summary["safe_coin"] * 0.05
-        value += summary["frontline_advantage"] * 1.8
-        value += summary["my_progress"] * 0.7
-        value -= summary["enemy_progress"] * 0.9
-        value += summary["kill_delta"] * 3.0
-        value -= summary["old_delta"] * 1.5
-        value += summary["tower_level_sum"] * 5.0
-        value -= summary["enemy_tower_level_sum"] * 3.0
-        value += summary["tower_spread"]
-        value += summary["base_arc_coverage"] * 10.0
-        value += summary["tower_spacing"] * 0.8
-        value += summary["hostile_distance"] * 0.4
-        value += summary["generation_level"] * 6.0
-        value += summary["ant_level"] * 8.0
+        value += hp_delta * 15.0
+        value += coin_ratio * 2.5
+        value += safe_coin * 0.05
+        value += frontline_advantage * 1.8
+        value += my_progress * 0.7
+        value -= enemy_progress * 0.9
+        value += kill_delta * 3.0
+        value -= old_delta * 1.5
+        value += tower_level_sum * 5.0
+        value -= enemy_tower_level_sum * 3.0
+        value += tower_spread
+        value += base_arc_coverage * 10.0
+        value += tower_spacing * 0.8
+        value += hostile_distance * 0.4
+        value += generation_level * 6.0
+        value += ant_level * 8.0
         if state.terminal:
             if state.winner == player:
                 value += 10000.0
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from typing import Iterator
 
-from SDK.utils.constants import MAP_PROPERTY, MAP_SIZE, OFFSET, Terrain
+import numpy as np
+
+from SDK.utils.constants import MAP_PROPERTY, MAP_SIZE, OFFSET, PLAYER_BASES, Terrain
+
+CELL_COUNT = MAP_SIZE * MAP_SIZE
 
 
 def is_valid_pos(x: int, y: int) -> bool:
@@ -13,6 +17,10 @@ def is_path(x: int, y: int) -> bool:
     return 0 <= x < MAP_SIZE and 0 <= y < MAP_SIZE and MAP_PROPERTY[x][y] == Terrain.PATH
 
 
+def is_ant_walkable(x: int, y: int) -> bool:
+    return (x, y) in PLAYER_BASES or is_path(x, y)
+
+
 def is_highland(player: int, x: int, y: int) -> bool:
     target = Terrain.PLAYER0_HIGHLAND if player == 0 else Terrain.PLAYER1_HIGHLAND
     return 0 <= x < MAP_SIZE and 0 <= y < MAP_SIZE and MAP_PROPERTY[x][y] == target
@@ -38,7 +46,50 @@ def neighbors(x: int, y: int) -> Iterator[tuple[int, int, int]]:
 
 
 def direction_between(x0: int, y0: int, x1: int, y1: int) -> int:
+    if 0 <= x0 < MAP_SIZE and 0 <= y0 < MAP_SIZE:
+        return _DIRECTION_LOOKUP.get((x0, y0, x1, y1), -1)
     for index, (dx, dy) in enumerate(OFFSET[y0 % 2]):
         if x0 + dx == x1 and y0 + dy == y1:
             return index
     return -1
+
+
+def cell_id(x: int, y: int) -> int:
+    return x * MAP_SIZE + y
+
+
+def _neighbor_table(keep) -> tuple[tuple[tuple[tuple[int, int, int], ...], ...], ...]:
+    return tuple(
+        tuple(tuple(item for item in neighbors(x, y) if keep(item[1], item[2])) for y in range(MAP_SIZE))
+        for x in range(MAP_SIZE)
+    )
+
+
+# Static neighbour tables, indexed [x][y] for on-map cells. Each entry keeps the
+# (direction, nx, ny) triples of neighbors() in direction order, pre-filtered.
+VALID_NEIGHBORS = _neighbor_table(is_valid_pos)
+WALKABLE_NEIGHBORS = _neighbor_table(is_ant_walkable)
+PATH_NEIGHBORS = _neighbor_table(is_path)
+
+# Flat-id forms for array code: NEIGHBOR_IDS[cell_id(x, y)][direction] is the
+# neighbour's flat id, or -1 when it is off the map.
+NEIGHBOR_IDS = tuple(
+    tuple(cell_id(nx, ny) if is_valid_pos(nx, ny) else -1 for _, nx, ny in neighbors(x, y))
+    for x in range(MAP_SIZE)
+    for y in range(MAP_SIZE)
+)
+NEIGHBOR_ID_ARRAY = np.array(NEIGHBOR_IDS, dtype=np.int32)
+VALID_MASK = np.array(
+    [[is_valid_pos(x, y) for y in range(MAP_SIZE)] for x in range(MAP_SIZE)], dtype=bool
+)
+WALKABLE_MASK = np.array(
+    [[is_ant_walkable(x, y) for y in range(MAP_SIZE)] for x in range(MAP_SIZE)], dtype=bool
+)
+WALKABLE_NEIGHBOR_MASK = (NEIGHBOR_ID_ARRAY >= 0) & WALKABLE_MASK.ravel()[NEIGHBOR_ID_ARRAY]
+
+_DIRECTION_LOOKUP = {
+    (x, y, nx, ny): direction
+    for x in range(MAP_SIZE)
+    for y in range(MAP_SIZE)
+    for direction, nx, ny in neighbors(x, y)
+}
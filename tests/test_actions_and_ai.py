@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import dataclasses
 from pathlib import Path
 
+import numpy as np
+import pytest
+
 import AI.ai_greedy as greedy_module
 from AI.ai_greedy import AI as GreedyAI, _to_greedy_info, _to_sdk_operation
 from AI.ai_mcts import MCTSAgent
 from AI.ai_random import RandomAgent
-from SDK.utils.actions import ActionCatalog
+from SDK.utils.actions import ActionCatalog, BundleCache
 from SDK.backend import load_backend
 from SDK.utils.features import FeatureExtractor
-from SDK.utils.constants import COMBAT_ANT_KILL_REWARD, AntBehavior, AntKind, AntStatus, OperationType, SuperWeaponType, TowerType
+from SDK.utils.constants import ANT_AGE_LIMIT, COMBAT_ANT_KILL_REWARD, MAP_PROPERTY, MAP_SIZE, PHEROMONE_ATTENUATION, PHEROMONE_INIT, PHEROMONE_SCALE, SUPER_WEAPON_STATS, TOWER_UPGRADE_TREE, AntBehavior, AntKind, AntStatus, OperationType, SuperWeaponType, Terrain, TowerType
 from SDK.backend.engine import GameState, PublicRoundState
-from SDK.backend.forecast import Ant as ForecastAnt, AntState as ForecastAntState, ForecastSimulator, ForecastState, Operation as ForecastOperation
-from SDK.backend.model import Ant, Operation, Tower
+from SDK.backend.forecast import Ant as ForecastAnt, AntState as ForecastAntState, BuildingType, ForecastSimulator, ForecastState, Operation as ForecastOperation, build_forecast_state
+from SDK.backend.runtime import MatchRuntime
+from SDK.backend.model import Ant, Operation, Tower, WeaponEffect
+from SDK.utils.geometry import hex_distance, is_highland
+from SDK.utils.turns import DecisionContext
 
 
 def test_action_catalog_returns_legal_bundles() -> None:
@@ -68,6 +77,124 @@ def test_action_catalog_tolerates_base_upgrade_pairing_without_crashing() -> Non
     assert bundles
 
 
+def test_action_catalog_pair_legality_matches_clone_and_apply() -> None:
+    catalog = ActionCatalog(max_actions=32)
+    checked = set()
+    for seed, coins, ant_level in ((3, 45, 0), (8, 160, 1), (13, 420, 2), (21, 900, 0)):
+        state = GameState.initial(seed=seed)
+        state.bases[0].ant_level = ant_level
+        state.bases[0].generation_level = 2 - ant_level // 2
+        slots = [slot for slot in state.strategic_slots(0) if is_highland(0, *slot)]
+        for index, (x, y) in enumerate(slots[:4]):
+            state.apply_operation(0, Operation(OperationType.BUILD_TOWER, x, y))
+            tower = state.tower_at(x, y)
+            if index % 2:
+                tower.upgrade(TOWER_UPGRADE_TREE[TowerType.BASIC][index // 2])
+            tower.hp = max(1, tower.max_hp * (index + 1) // 5)
+        state.coins[0] = coins
+        operations = [Operation(OperationType.BUILD_TOWER, x, y) for x, y in slots[:6]]
+        for tower in state.towers_of(0):
+            operations.append(Operation(OperationType.DOWNGRADE_TOWER, tower.tower_id))
+            operations.extend(Operation(OperationType.UPGRADE_TOWER, tower.tower_id, int(target)) for target in TOWER_UPGRADE_TREE.get(tower.tower_type, ()))
+        operations.append(Operation(OperationType.UPGRADE_GENERATION_SPEED))
+        operations.append(Operation(OperationType.UPGRADE_GENERATED_ANT))
+        for first in operations:
+            for second in operations:
+                if first is second:
+                    continue
+                expected = not state.clone().apply_operation_list(0, (first, second))
+                assert catalog._pair_is_legal(state, 0, first, second) == expected, (seed, first, second)
+                checked.add((first.op_type, second.op_type, expected))
+    assert len(checked) > 20
+
+
+def test_action_catalog_pressure_field_matches_per_cell_ant_loop() -> None:
+    state = GameState.initial(seed=9)
+    for _ in range(60):
+        state.advance_round()
+    catalog = ActionCatalog(max_actions=16)
+    for player in (0, 1):
+        ants = state.ants_of(1 - player)
+        assert ants
+        field = catalog._enemy_pressure_field(state, player)
+        for x in range(MAP_SIZE):
+            for y in range(MAP_SIZE):
+                expected = 0.0
+                for ant in ants:
+                    distance = hex_distance(x, y, ant.x, ant.y)
+                    if distance <= 6:
+                        expected += max(0.0, 6.5 - distance) * (1.0 + ant.level * 0.4)
+                assert field[x][y] == expected
+
+
+def test_action_catalog_rerank_shares_enemy_reply_and_memoizes_rollouts(monkeypatch) -> None:
+    state = GameState.initial(seed=4)
+    for _ in range(45):
+        state.advance_round()
+    for x, y in [slot for slot in state.strategic_slots(0) if is_highland(0, *slot)][:3]:
+        state.apply_operation(0, Operation(OperationType.BUILD_TOWER, x, y))
+    state.coins[0] = state.coins[1] = 600
+    catalog = ActionCatalog(max_actions=16)
+    singles, _, pairs = catalog._enemy_candidates(state, 0)
+    for bundle in singles + pairs:
+        trial = state.clone()
+        trial.apply_operation_list(0, bundle.operations)
+        enemy_singles, weapons, enemy_pairs = catalog._enemy_candidates(state, 1)
+        if any(operation.op_type in (OperationType.BUILD_TOWER, OperationType.UPGRADE_TOWER, OperationType.DOWNGRADE_TOWER) for operation in bundle.operations):
+            weapons = catalog._superweapon_candidates(trial, 1)
+        shared = catalog._rank(enemy_singles + weapons + enemy_pairs)[0]
+        assert shared.operations == catalog.build(trial, 1, rerank=False)[0].operations
+
+    first = catalog.build(state, 0)
+    calls = []
+    original = ActionCatalog._one_step_rollout
+    monkeypatch.setattr(ActionCatalog, "_one_step_rollout", lambda self, *args: calls.append(args) or original(self, *args))
+    assert [(bundle.name, bundle.score) for bundle in catalog.build(state, 0)] == [(bundle.name, bundle.score) for bundle in first]
+    assert not calls
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pooled = ActionCatalog(max_actions=16, rollout_executor=executor).build(state, 0)
+    assert [(bundle.name, bundle.score) for bundle in pooled] == [(bundle.name, bundle.score) for bundle in first]
+    assert calls
+
+    calls.clear()
+    state.die_count[1] += 3
+    catalog.build(state, 0)
+    assert calls
+
+
+def test_action_catalog_bundle_cache_is_a_shared_state_keyed_lru() -> None:
+    state = GameState.initial(seed=7)
+    cache = BundleCache(max_entries=2)
+    catalog = ActionCatalog(max_actions=16, bundle_cache=cache)
+    search_catalog = copy.deepcopy(catalog)
+    assert search_catalog.bundle_cache is cache
+
+    first = catalog.build(state, 0, rerank=False)
+    assert first == ActionCatalog(max_actions=16).build(state, 0, rerank=False)
+    assert search_catalog.build(state.clone(), 0, rerank=False) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first[0].score = 1.0
+
+    catalog.build(state, 1, rerank=False)
+    later = state.clone()
+    later.advance_round()
+    catalog.build(later, 0, rerank=False)
+    assert len(cache) == 2 and (cache.hits, cache.misses) == (1, 3)
+    catalog.build(state, 1, rerank=False)
+    assert (cache.hits, cache.misses) == (2, 3)
+    catalog.build(state, 0, rerank=False)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    catalog.build(state, 0, rerank=False)
+    killed = state.clone()
+    killed.die_count[0] += 1
+    assert killed.checksum() == state.checksum()
+    catalog.build(killed, 0, rerank=False)
+    assert (cache.hits, cache.misses) == (3, 5)
+
+
 def test_action_catalog_can_offer_storm_against_enemy_towers_without_enemy_ants() -> None:
     state = GameState.initial(seed=24)
     state.coins[0] = 200
@@ -83,6 +210,30 @@ def test_action_catalog_can_offer_storm_against_enemy_towers_without_enemy_ants(
     )
 
 
+def test_action_catalog_weapon_value_maps_cover_every_cell() -> None:
+    state = GameState.initial(seed=24)
+    for _ in range(50):
+        state.advance_round()
+    state.towers.append(Tower(90, 1, 10, 9, TowerType.PRODUCER, hp=15))
+    state.towers.append(Tower(91, 1, 12, 9, TowerType.BASIC))
+    state.coins[0] = 400
+    catalog = ActionCatalog(max_actions=32)
+    emp_range = SUPER_WEAPON_STATS[SuperWeaponType.EMP_BLASTER].attack_range
+    emp = catalog._emp_values(state, 0).reshape(MAP_SIZE, MAP_SIZE)
+    for x in range(MAP_SIZE):
+        for y in range(MAP_SIZE):
+            expected = sum(3.0 + tower.level * 2.5 for tower in state.towers_of(1) if hex_distance(x, y, tower.x, tower.y) <= emp_range)
+            assert np.isclose(emp[x, y], expected - SUPER_WEAPON_STATS[SuperWeaponType.EMP_BLASTER].cost * 0.025)
+
+    storm = catalog._storm_values(state, 0).reshape(MAP_SIZE, MAP_SIZE)
+    valid = np.array([[MAP_PROPERTY[x][y] != Terrain.VOID for y in range(MAP_SIZE)] for x in range(MAP_SIZE)])
+    bundle = next(bundle for bundle in catalog._superweapon_candidates(state, 0) if bundle.tags[1] == "storm")
+    operation = bundle.operations[0]
+    assert valid[operation.arg0, operation.arg1]
+    assert bundle.score == storm[operation.arg0, operation.arg1] == storm[valid].max()
+    assert all(bundle.score >= storm[entity.x, entity.y] for entity in state.towers_of(1) + state.ants_of(1))
+
+
 def test_action_catalog_skips_max_level_base_upgrades() -> None:
     state = GameState.initial(seed=6)
     state.coins[0] = 9999
@@ -128,6 +279,89 @@ def test_feature_extractor_increases_generation_value_when_cycle_improves() -> N
     assert summary2["generation_level"] > summary1["generation_level"]
 
 
+def test_feature_extractor_board_matches_cellwise_geometry() -> None:
+    extractor = FeatureExtractor()
+    state = GameState.initial(seed=31)
+    for turn in range(40):
+        state.coins[0] = state.coins[1] = 500
+        builds = []
+        for player in (0, 1):
+            x, y = state.strategic_slots(player)[turn % 6]
+            operation = Operation(OperationType.BUILD_TOWER, x, y)
+            builds.append([operation] if turn < 12 and state.can_apply_operation(player, operation) else [])
+        state.resolve_turn(*builds)
+    stacked = state.ants[0]
+    state.ants.append(stacked.clone())
+    state.ants[-1].ant_id = state.next_ant_id
+    state.ants[-1].behavior = AntBehavior.BEWITCHED
+    state.active_effects.append(WeaponEffect(SuperWeaponType.EMP_BLASTER, 1, 9, 9, 3))
+    state.active_effects.append(WeaponEffect(SuperWeaponType.EMP_BLASTER, 1, 11, 9, 5))
+
+    board = extractor.encode_board(state, 0)
+
+    for x in range(MAP_SIZE):
+        for y in range(MAP_SIZE):
+            assert board[0, x, y] == float(MAP_PROPERTY[x][y] == Terrain.PATH)
+            assert board[15, x, y] == np.float32(state.pheromone[1, x, y] / float(12 * PHEROMONE_SCALE))
+            covering = [effect for effect in state.active_effects if effect.in_range(x, y) and MAP_PROPERTY[x][y] != Terrain.VOID]
+            strength = max((effect.remaining_turns / SUPER_WEAPON_STATS[effect.weapon_type].duration for effect in covering), default=0.0)
+            assert board[23, x, y] == np.float32(strength)
+    expected = np.float32(0.0)
+    for ant in state.ants:
+        if (ant.x, ant.y) == (stacked.x, stacked.y):
+            expected += ant.age / float(ANT_AGE_LIMIT)
+    assert board[13, stacked.x, stacked.y] == expected
+    assert board[18, stacked.x, stacked.y] >= 1.0
+    assert all(board[4 if tower.player == 0 else 5, tower.x, tower.y] == 1.0 for tower in state.towers)
+
+
+def test_feature_extractor_encode_batch_fills_caller_buffer_in_place() -> None:
+    extractor = FeatureExtractor()
+    states = [GameState.initial(seed=41), GameState.initial(seed=42)]
+    for _ in range(15):
+        states[1].resolve_turn([], [])
+    contexts = [DecisionContext.for_player(0), DecisionContext.for_player(1).next_turn()]
+    expected = [
+        extractor.flatten_observation(extractor.encode_observation(state, player, np.zeros(4), context=context))
+        for state, player, context in zip(states, (0, 1), contexts)
+    ]
+
+    buffer = np.full((3, len(expected[0])), np.nan, dtype=np.float32)
+    rows = extractor.encode_batch(states, [0, 1], contexts, out=buffer)
+
+    assert rows.shape == (2, len(expected[0])) and np.shares_memory(rows, buffer)
+    np.testing.assert_array_equal(rows, np.stack(expected))
+    assert np.isnan(buffer[2]).all()
+    boards, stats = extractor.observation_views(rows)
+    assert np.shares_memory(boards, buffer) and np.shares_memory(stats, buffer)
+    np.testing.assert_array_equal(boards[1], extractor.encode_board(states[1], 1))
+    np.testing.assert_array_equal(extractor.encode_batch(states, [0, 1], contexts), rows)
+
+
+def test_feature_extractor_single_pass_summary_agrees_with_state_queries() -> None:
+    extractor = FeatureExtractor()
+    states = [GameState.initial(seed=17)]
+    for turn in range(60):
+        state = states[-1].clone()
+        state.coins[0] = state.coins[1] = 500
+        builds = []
+        for player in (0, 1):
+            x, y = state.strategic_slots(player)[turn % 8]
+            operation = Operation(OperationType.BUILD_TOWER, x, y)
+            builds.append([operation] if turn % 3 == 0 and state.can_apply_operation(player, operation) else [])
+        state.resolve_turn(*builds)
+        states.append(state)
+
+    for state in states[::10]:
+        for player in (0, 1):
+            named = extractor.summarize(state, player).named
+            assert named["tower_spread"] == state.tower_spread_score(player)
+            assert named["hostile_distance"] == state.nearest_ant_distance(player)
+            assert named["my_front_distance"] == state.frontline_distance(player)
+            assert named["tower_count"] == len(state.towers_of(player))
+    assert len(states[-1].towers_of(0)) >= 3
+
+
 def test_action_catalog_skips_ant_upgrade_when_next_level_has_no_real_gain() -> None:
     state = GameState.initial(seed=22)
     state.coins[0] = 9999
@@ -256,6 +490,19 @@ def test_native_backend_can_boot_and_advance() -> None:
     assert state.coins == [50, 50]
 
 
+def test_native_backend_checksum_matches_python_engine() -> None:
+    native = load_backend(prefer_native=True).initial_state(seed=5)
+    python = GameState.initial(seed=5)
+    build = [Operation(OperationType.BUILD_TOWER, 6, 9)]
+    native.resolve_turn(build, [])
+    python.resolve_turn(build, [])
+    for _ in range(30):
+        native.resolve_turn([], [])
+        python.resolve_turn([], [])
+        assert native.checksum() == python.checksum()
+    assert native.checksum(public_only=True) == python.checksum(public_only=True)
+
+
 def test_native_backend_uses_alternating_tower_build_cost_curve() -> None:
     state = load_backend(prefer_native=True).initial_state(seed=11)
     pending: list[Operation] = []
@@ -587,6 +834,165 @@ def test_greedy_ai_smoke_uses_sdk_runtime_view_without_re() -> None:
         accepted.append(sdk_operation)
 
 
+def test_greedy_search_budget_scales_with_danger_and_stops_at_deadline() -> None:
+    greedy_impl = greedy_module._load_impl("ai")
+    budget = greedy_impl.SearchBudget()
+    quiet = budget.allot(200, 60)
+    assert budget.allot(200, 5) > budget.allot(200, 20) > quiet
+    assert budget.allot(10, 60) < quiet
+    budget.base = 100.0
+    assert budget.allot(200, 5) <= budget.turn_limit - budget.margin
+    budget.charge(budget.allowance)
+    assert budget.allot(200, 5) == 0.0
+
+    state = GameState.initial(seed=41)
+    for _ in range(45):
+        state.resolve_turn([], [])
+    agent = GreedyAI()
+    agent.budget.charge(agent.budget.allowance)
+    operations = agent(0, _to_greedy_info(state))
+    assert len(agent.nodes) <= 3
+    accepted = []
+    for operation in operations:
+        sdk_operation = _to_sdk_operation(operation)
+        assert state.can_apply_operation(0, sdk_operation, accepted)
+        accepted.append(sdk_operation)
+
+
+def test_greedy_reroots_the_chosen_subtree_when_the_turn_matches_its_forecast(monkeypatch) -> None:
+    greedy_impl = greedy_module._load_impl("ai")
+    monkeypatch.setattr(greedy_impl, "MAX_NODE_COUNT", 150)
+    state = GameState.initial(seed=41)
+    for _ in range(45):
+        state.resolve_turn([], [])
+    info = _to_greedy_info(state)
+
+    def forecast_turn(agent: GreedyAI) -> tuple:
+        operations = agent(0, info)
+        carry = agent.carry
+        assert carry is not None
+        carried = carry.nodes[carry.node_id]
+        children = [carry.nodes[child_id] for child_id in carried.children]
+        first_layer = [child for child in children if child.round_tag == info.round + 1]
+        sim = ForecastSimulator(info)
+        for operation in operations:
+            sim.add_operation_of_player(0, operation)
+        sim.apply_operations_of_player(0)
+        sim.fast_next_round(0)
+        return carried, first_layer, sim.info
+
+    agent = GreedyAI()
+    agent.budget.base = 100.0
+    carried, first_layer, forecast = forecast_turn(agent)
+    assert first_layer
+    starts = [node.sim.clone() for node in first_layer]
+    agent(0, forecast)
+    assert agent.nodes[1] is carried and not carried.chosen
+    root = agent.nodes[0]
+    assert {id(node) for node in first_layer} <= {id(agent.nodes[child_id]) for child_id in root.children}
+    assert carried.score == root.score
+    assert carried.best_descendant == max([carried.score] + [agent.nodes[child_id].score for child_id in carried.children])
+    for node, start in zip(first_layer, starts):
+        fresh = greedy_impl.ForecastNode(agent, start)
+        fresh.sunk_cost = node.sunk_cost
+        agent.transpositions.clear()
+        assert fresh.evaluate() == node.score
+    for node_id, node in enumerate(agent.nodes):
+        assert node.node_id == node_id
+        assert all(agent.nodes[child_id].parent == node_id for child_id in node.children)
+
+    agent = GreedyAI()
+    agent.budget.base = 100.0
+    carried, _, forecast = forecast_turn(agent)
+    forecast.coins[1] -= 1
+    agent(0, forecast)
+    assert all(node is not carried for node in agent.nodes)
+
+
+def test_greedy_fork_leaves_the_carry_so_a_ponder_miss_plays_like_a_plain_agent(monkeypatch) -> None:
+    greedy_impl = greedy_module._load_impl("ai")
+    monkeypatch.setattr(greedy_impl, "MAX_NODE_COUNT", 150)
+    state = GameState.initial(seed=41)
+    for _ in range(45):
+        state.resolve_turn([], [])
+    info = _to_greedy_info(state)
+    plain, pondering = GreedyAI(), GreedyAI()
+    for agent in (plain, pondering):
+        agent.budget.base = 100.0
+    operations = plain(0, info)
+    assert pondering(0, info) == operations
+    sim = ForecastSimulator(info)
+    for operation in operations:
+        sim.add_operation_of_player(0, operation)
+    sim.apply_operations_of_player(0)
+    sim.fast_next_round(0)
+    forecast = sim.info
+    carried = pondering.carry.nodes[pondering.carry.node_id]
+
+    guess = forecast.clone()
+    guess.coins[1] -= 1
+    pondering.fork()(0, guess)
+    pondering.fork()(0, forecast)
+    assert pondering.carry is not None
+    assert pondering(0, forecast) == plain(0, forecast)
+    assert pondering.nodes[1] is carried
+
+
+def test_greedy_root_parallel_search_merges_worker_results_and_falls_back_to_serial(monkeypatch) -> None:
+    greedy_impl = greedy_module._load_impl("ai")
+    state = GameState.initial(seed=41)
+    for _ in range(45):
+        state.resolve_turn([], [])
+    info = _to_greedy_info(state)
+
+    def decide(agent: GreedyAI) -> None:
+        accepted = []
+        for operation in agent(0, info):
+            sdk_operation = _to_sdk_operation(operation)
+            assert state.can_apply_operation(0, sdk_operation, accepted)
+            accepted.append(sdk_operation)
+
+    agent = GreedyAI()
+    agent.root_pool = greedy_impl.RootPool(2)
+    decide(agent)
+    assert not agent.root_pool.running
+    agent.on_match_start(0, 41)
+    try:
+        assert agent.root_pool.running
+        decide(agent)
+        assert agent.root_pool.available
+    finally:
+        agent.on_match_end()
+    assert not agent.root_pool.running
+    root = agent.nodes[0]
+    assert len(agent.nodes) == 1 + len(root.children)
+    assert all(agent.nodes[child_id].expanded_layers > 0 for child_id in root.children)
+    assert agent.carry is None
+
+    monkeypatch.setattr(greedy_impl, "_search_root_slice", _failing_root_slice)
+    agent = GreedyAI()
+    agent.root_pool = greedy_impl.RootPool(2)
+    agent.on_match_start(0, 41)
+    decide(agent)
+    assert not agent.root_pool.available and not agent.root_pool.running
+    assert len(agent.nodes) > 1 + len(agent.nodes[0].children)
+
+    def refuse(method):
+        raise OSError("processes are not allowed here")
+
+    monkeypatch.setattr(greedy_impl.multiprocessing, "get_context", refuse)
+    agent = GreedyAI()
+    agent.root_pool = greedy_impl.RootPool(2)
+    agent.on_match_start(0, 41)
+    decide(agent)
+    assert not agent.root_pool.available
+    assert len(agent.nodes) > 1 + len(agent.nodes[0].children)
+
+
+def _failing_root_slice(payload: bytes) -> bytes:
+    raise KeyError("rollout")
+
+
 def test_greedy_rollout_pheromone_update_tolerates_teleported_ant_trails() -> None:
     info = ForecastState(19)
     info.ants.append(
@@ -611,6 +1017,24 @@ def test_greedy_rollout_pheromone_update_tolerates_teleported_ant_trails() -> No
     assert info.pheromone[0][18][9] < before_target
 
 
+def test_forecast_attenuation_matches_scalar_update_and_clone_is_independent() -> None:
+    info = ForecastState(7)
+    copied = info.clone()
+    expected = info.pheromone.tolist()
+    info.global_pheromone_attenuation()
+    for player in range(2):
+        for x in range(19):
+            for y in range(19):
+                if MAP_PROPERTY[x][y] >= 0:
+                    expected[player][x][y] = (
+                        PHEROMONE_ATTENUATION * expected[player][x][y] + (1 - PHEROMONE_ATTENUATION) * PHEROMONE_INIT
+                    )
+    assert info.pheromone.tolist() == expected
+    assert (copied.pheromone != info.pheromone).any()
+    copied.build_tower(0, 0, 6, 9)
+    assert info.building_tag[6, 9] == BuildingType.EMPTY
+
+
 def test_greedy_tower_investment_uses_current_build_curve() -> None:
     greedy_impl = greedy_module._load_impl("ai")
     info = ForecastState(41)
@@ -624,6 +1048,54 @@ def test_greedy_tower_investment_uses_current_build_curve() -> None:
     assert node._score_tower_investment(info.towers) == expected
 
 
+def test_greedy_site_tables_match_geometry_and_drive_bitset_candidates() -> None:
+    greedy_impl = greedy_module._load_impl("ai")
+    layout = greedy_impl.SITE_LAYOUT[0]
+    for site, (x, y) in enumerate(layout):
+        assert greedy_impl.SITE_DISTANCE[0][site] == tuple(hex_distance(x, y, px, py) for px, py in layout)
+    for x, y in ((4, 9), (9, 9), (6, 3)):
+        cover = greedy_impl.EMP_SITE_COVER[0][x * greedy_impl.MAP_SIZE + y]
+        assert [site for site in range(len(layout)) if cover >> site & 1] == [
+            site for site, (sx, sy) in enumerate(layout) if hex_distance(x, y, sx, sy) <= 3
+        ]
+
+    info = ForecastState(41)
+    info.coins[0] = 400
+    info.build_tower(0, 0, *layout[1], TowerType.BASIC)
+    info.build_tower(1, 0, *layout[10], TowerType.HEAVY)
+    agent = greedy_impl.AI()
+    agent.side = 0
+    sites = agent._site_state(info)
+
+    def cells(bundles, index):
+        return [(bundle[index].arg0, bundle[index].arg1) for bundle in bundles]
+
+    taken = set(greedy_impl.SITE_TO_FAMILY[1]) | set(greedy_impl.SITE_TO_FAMILY[10])
+    expected = [layout[site] for site in greedy_impl.ACTIONABLE_SITES if site not in taken]
+    assert cells(agent._candidate_bundles(0, info, sites, 0), 0) == expected
+
+    upgrades = agent._candidate_bundles(1, info, sites, 0)
+    assert [(bundle[0].arg0, bundle[0].arg1) for bundle in upgrades] == [
+        (0, int(TowerType.HEAVY)),
+        (0, int(TowerType.MORTAR)),
+        (0, int(TowerType.QUICK)),
+        (1, int(TowerType.HEAVY_PLUS)),
+        (1, int(TowerType.BEWITCH)),
+        (1, int(TowerType.ICE)),
+    ]
+
+    # Selling the basic tower at site 1 frees the rest of its family for the paired build.
+    swaps = agent._candidate_bundles(6, info, sites, 0)
+    assert {bundle[0].arg0 for bundle in swaps} == {0}
+    reopened = set(greedy_impl.SITE_TO_FAMILY[10]) | {1}
+    assert cells(swaps, 1) == [layout[site] for site in greedy_impl.ACTIONABLE_SITES if site not in reopened]
+
+    blocked = greedy_impl.EMP_ACTIONABLE_COVER[0][layout[2][0] * greedy_impl.MAP_SIZE + layout[2][1]]
+    covered = {cell for rank, cell in enumerate(greedy_impl.ACTIONABLE_CELLS[0]) if blocked >> rank & 1}
+    assert layout[2] in covered
+    assert cells(agent._candidate_bundles(0, info, sites, blocked), 0) == [cell for cell in expected if cell not in covered]
+
+
 def test_forecast_max_level_base_upgrade_returns_zero_income() -> None:
     info = ForecastState(23)
     info.bases[0].gen_speed_level = 2
@@ -673,6 +1145,196 @@ def test_forecast_producer_tower_does_not_crash_attack_loop() -> None:
     assert enemy_ant.hp == 10
 
 
+def _forecast_view(info: ForecastState) -> tuple:
+    return (
+        info.round,
+        info.coins,
+        info.old_count,
+        info.die_count,
+        info.next_ant_id,
+        info.next_tower_id,
+        info.super_weapon_cd.tolist(),
+        info.building_tag.tolist(),
+        info.pheromone.tolist(),
+        [repr(base) for base in info.bases],
+        [repr(tower) for tower in info.towers],
+        [repr(ant) for ant in info.ants],
+        [repr(weapon) for weapon in info.super_weapons],
+    )
+
+
+def test_runtime_forecast_mirror_tracks_rebuilt_forecast_state() -> None:
+    reference = GameState.initial(seed=19)
+    runtime = MatchRuntime(0, GameState.initial(seed=19))
+    turns = {
+        2: ([Operation(OperationType.BUILD_TOWER, 6, 9)], [Operation(OperationType.BUILD_TOWER, 12, 9)]),
+        9: ([Operation(OperationType.UPGRADE_TOWER, 0, int(TowerType.HEAVY))], []),
+        14: ([Operation(OperationType.USE_DEFLECTOR, 6, 9)], [Operation(OperationType.USE_LIGHTNING_STORM, 7, 9)]),
+        30: ([Operation(OperationType.BUILD_TOWER, 6, 9)], [Operation(OperationType.DOWNGRADE_TOWER, 1)]),
+    }
+    reference.coins = [400, 400]
+    runtime.state.coins = [400, 400]
+    mirrored = runtime.forecast_state()
+    for round_index in range(60):
+        assert _forecast_view(runtime.forecast_state()) == _forecast_view(build_forecast_state(runtime.state))
+        ops0, ops1 = turns.get(round_index, ([], []))
+        runtime.apply_self_operations(ops0)
+        runtime.apply_opponent_operations(ops1)
+        assert reference.resolve_turn(ops0, ops1).illegal == ([], [])
+        runtime.finish_round(reference.to_public_round_state())
+    assert runtime.forecast_state() is mirrored
+
+
+def test_forecast_fast_forward_matches_fast_next_round_loop() -> None:
+    info = ForecastState(37)
+    info.build_tower(0, 0, 6, 9)
+    info.build_tower(1, 1, 12, 9)
+    info.ants.append(ForecastAnt(0, 1, 9, 9, 10, 0, 0, ForecastAntState.ALIVE))
+    info.ants.append(ForecastAnt(1, 0, 10, 9, 10, 0, 0, ForecastAntState.ALIVE))
+    stepped = ForecastSimulator(info)
+    fused = ForecastSimulator(info)
+    distances = []
+    for _ in range(25):
+        assert stepped.fast_next_round(0)
+        distances.append(min([32] + [hex_distance(ant.x, ant.y, 2, 9) for ant in stepped.info.ants if ant.player == 1]))
+    trace = fused.fast_forward(25, 0)
+    assert len(trace) == 25 and not trace.halted and not trace.stopped
+    assert trace.nearest_hostile == distances
+    assert fused.info.round == stepped.info.round
+    assert fused.info.coins == stepped.info.coins
+    assert (fused.info.pheromone == stepped.info.pheromone).all()
+    assert [(ant.id, ant.x, ant.y, ant.hp) for ant in fused.info.ants] == [
+        (ant.id, ant.x, ant.y, ant.hp) for ant in stepped.info.ants
+    ]
+
+
+def test_native_forecast_matches_python_simulator() -> None:
+    from SDK.native_adapter import NativeForecastSimulator
+
+    state = GameState.initial(seed=41)
+    for _ in range(45):
+        state.resolve_turn([], [])
+    info = build_forecast_state(state)
+    info.coins = [600, 600]
+    scripted = {
+        0: [ForecastOperation(OperationType.BUILD_TOWER, 6, 9), ForecastOperation(OperationType.BUILD_TOWER, 5, 7)],
+        3: [ForecastOperation(OperationType.UPGRADE_TOWER, info.next_tower_id, int(TowerType.MORTAR))],
+        6: [ForecastOperation(OperationType.USE_LIGHTNING_STORM, 9, 9), ForecastOperation(OperationType.UPGRADE_GENERATED_ANT)],
+        11: [ForecastOperation(OperationType.USE_EMERGENCY_EVASION, 12, 9), ForecastOperation(OperationType.USE_DEFLECTOR, 10, 9)],
+        17: [ForecastOperation(OperationType.DOWNGRADE_TOWER, info.next_tower_id + 1)],
+    }
+    python = ForecastSimulator(info)
+    native = NativeForecastSimulator(info)
+    assert GreedyAI().simulator is NativeForecastSimulator
+    assert _forecast_view(native.info) == _forecast_view(python.info)
+    for round_index in range(30):
+        player = 1 if round_index == 11 else 0
+        for operation in scripted.get(round_index, []):
+            assert native.add_operation_of_player(player, operation) == python.add_operation_of_player(player, operation)
+        python.apply_operations_of_player(player)
+        native.apply_operations_of_player(player)
+        assert native.fast_next_round(0) == python.fast_next_round(0)
+        assert _forecast_view(native.info) == _forecast_view(python.info)
+    stop = (0, python.info.bases[0].hp - 1)
+    assert native.clone().fast_forward(80, 0, stop_base_hp=stop) == python.clone().fast_forward(80, 0, stop_base_hp=stop)
+
+
+def test_native_forecast_fast_forward_predicate_sees_each_round() -> None:
+    from SDK.native_adapter import NativeForecastSimulator
+
+    state = GameState.initial(seed=41)
+    for _ in range(20):
+        state.resolve_turn([], [])
+    info = build_forecast_state(state)
+    seen = {}
+    traces = {}
+    for name, simulator in (("python", ForecastSimulator(info)), ("native", NativeForecastSimulator(info))):
+        rounds = seen[name] = []
+        traces[name] = simulator.fast_forward(10, 0, stop_when=lambda view: rounds.append(view.round) or view.round >= info.round + 5)
+    assert seen["native"] == seen["python"] == list(range(info.round + 1, info.round + 6))
+    assert traces["native"] == traces["python"] and traces["native"].stopped
+
+
+def test_greedy_transposition_table_shares_duplicate_forecast_evaluations() -> None:
+    from SDK.native_adapter import NativeForecastSimulator
+
+    greedy_impl = greedy_module._load_impl("ai")
+    state = GameState.initial(seed=41)
+    for _ in range(45):
+        state.resolve_turn([], [])
+    info = _to_greedy_info(state)
+    for simulator in (ForecastSimulator, NativeForecastSimulator):
+        base = simulator(info)
+        twin = base.clone()
+        assert twin.state_hash() == base.state_hash()
+        twin.add_operation_of_player(0, ForecastOperation(OperationType.BUILD_TOWER, 6, 9))
+        twin.apply_operations_of_player(0)
+        assert twin.state_hash() != base.state_hash()
+
+    agent = GreedyAI()
+    agent(0, info)
+    table = agent.transpositions
+    assert table.hits > 0 and 0.0 < table.hit_rate < 1.0
+    assert len(table) == table.misses
+
+    leaf = next(node for node in agent.nodes[1:] if node.expanded_layers == 0)
+    shared = greedy_impl.ForecastNode(agent, leaf.sim)
+    shared.collapse_round = leaf.collapse_round
+    hits = table.hits
+    shared_score = shared.evaluate()
+    assert table.hits == hits + 1
+    table.clear()
+    fresh = greedy_impl.ForecastNode(agent, leaf.sim)
+    fresh.collapse_round = leaf.collapse_round
+    assert fresh.evaluate() == shared_score
+    assert fresh.distance_trace == shared.distance_trace
+    assert (fresh.collapse_round, fresh.solvent) == (shared.collapse_round, shared.solvent)
+
+
+def test_greedy_idle_baseline_rollouts_match_full_rollouts() -> None:
+    from SDK.native_adapter import NativeForecastSimulator
+
+    greedy_impl = greedy_module._load_impl("ai")
+    state = GameState.initial(seed=41)
+    for _ in range(60):
+        state.resolve_turn([], [])
+    info = _to_greedy_info(state)
+    info.coins = [600, 600]
+    info.apply_operation(0, ForecastOperation(OperationType.BUILD_TOWER, 6, 9))
+    info.apply_operation(0, ForecastOperation(OperationType.BUILD_TOWER, 5, 7))
+    agent = GreedyAI()
+    agent.side = 0
+    agent.current_round = info.round
+    agent.wall_hp_snapshot = info.bases[0].hp
+    agent.enemy_old_baseline = info.old_count[1]
+    agent.enemy_die_baseline = info.die_count[1]
+    first, second = (tower.id for tower in info.towers if tower.player == 0)
+    bundles = [
+        [],
+        [ForecastOperation(OperationType.BUILD_TOWER, 4, 9)],
+        [ForecastOperation(OperationType.BUILD_TOWER, 4, 15)],
+        [ForecastOperation(OperationType.UPGRADE_TOWER, first, int(TowerType.MORTAR))],
+        [ForecastOperation(OperationType.DOWNGRADE_TOWER, second)],
+        [ForecastOperation(OperationType.UPGRADE_GENERATED_ANT)],
+    ]
+    for simulator in (ForecastSimulator, NativeForecastSimulator):
+        parent = simulator(info)
+        idle = greedy_impl.IdleBaseline(agent, parent)
+        for bundle in bundles:
+            results = []
+            for baseline in (None, idle):
+                agent.transpositions.clear()
+                node = greedy_impl.ForecastNode(agent, parent)
+                for operation in bundle:
+                    assert node.sim.add_operation_of_player(0, operation)
+                node.sim.apply_operations_of_player(0)
+                node.idle = baseline
+                score = node.evaluate()
+                results.append((score, node.distance_trace, node.collapse_round, node.solvent))
+            assert results[0] == results[1]
+        assert idle.base_hp
+
+
 def test_forecast_lightning_storm_damages_enemy_combat_ants_without_instant_kill() -> None:
     info = ForecastState(31)
     info.ants.extend(
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import replace
+
+import pytest
+
 from SDK.utils.constants import LAMBDA_DENOM, LAMBDA_NUM, PHEROMONE_FAIL_BONUS_INT, SUPER_WEAPON_STATS, TAU_BASE_ADD_INT
 from SDK.utils.constants import ANT_AGE_LIMIT, ANT_TELEPORT_INTERVAL, ANT_TELEPORT_RATIO, BASIC_INCOME, COMBAT_ANT_KILL_REWARD, INITIAL_COINS, TOWER_DOWNGRADE_REFUND_RATIO, AntBehavior, AntKind, AntStatus, OperationType, PATH_CELLS, PLAYER_BASES, SPECIAL_BEHAVIOR_DECAY_TURNS, SPAWN_PROFILE_WEIGHTS, SuperWeaponType, TowerType
 from SDK.backend.engine import (
@@ -7,9 +11,25 @@ from SDK.backend.engine import (
     MOVEMENT_POLICY_LEGACY,
     GameState,
     PublicRoundState,
+    stop_on_base_hp_drop,
 )
+from SDK.backend.checksum import public_state_checksum
+from SDK.backend.runtime import MatchRuntime
 from SDK.backend.model import Ant, Operation, Tower, WeaponEffect
-from SDK.utils.geometry import direction_between, hex_distance, is_path, neighbors
+from SDK.utils.geometry import (
+    NEIGHBOR_ID_ARRAY,
+    NEIGHBOR_IDS,
+    VALID_NEIGHBORS,
+    WALKABLE_NEIGHBOR_MASK,
+    WALKABLE_NEIGHBORS,
+    cell_id,
+    direction_between,
+    hex_distance,
+    is_ant_walkable,
+    is_path,
+    is_valid_pos,
+    neighbors,
+)
 
 
 def _half_plane_delta(player: int, x: int, y: int) -> int:
@@ -1060,6 +1080,18 @@ def test_too_old_ants_remain_visible_until_next_lifecycle_cleanup() -> None:
     assert state.old_count == [1, 0]
 
 
+def test_lifecycle_timers_only_touch_due_ants() -> None:
+    state = GameState.initial(seed=4)
+    frozen = Ant(12, 0, 2, 9, hp=10, level=0, frozen=True, status=AntStatus.FROZEN, pending_behavior=AntBehavior.RANDOM)
+    steady = Ant(13, 1, 16, 9, hp=10, level=0, age=3, behavior_turns=3)
+    state.ants.extend([frozen, steady])
+    state.advance_round()
+    assert frozen.status == AntStatus.ALIVE
+    assert frozen.behavior == AntBehavior.RANDOM
+    assert (steady.age, steady.behavior_turns, steady.behavior) == (4, 4, AntBehavior.DEFAULT)
+    assert steady.status == AntStatus.ALIVE
+
+
 def test_combat_ants_do_not_die_of_old_age() -> None:
     state = GameState.initial(seed=22)
     ant = Ant(15, 0, 2, 9, hp=30, level=0, age=ANT_AGE_LIMIT + 20, kind=AntKind.COMBAT)
@@ -1192,3 +1224,106 @@ def test_public_round_state_exposes_visible_runtime_fields() -> None:
     assert public_state.anthp_lv == (0, 2)
     assert public_state.weapon_cooldowns == ((12, 0, 0, 0), (0, 5, 0, 0))
     assert public_state.active_effects == [(int(SuperWeaponType.DEFLECTOR), 0, 6, 9, 4)]
+
+
+def test_fast_forward_matches_repeated_advance_round() -> None:
+    reference = GameState.initial(seed=21)
+    reference.towers.append(Tower(0, 0, 6, 9, TowerType.BASIC, cooldown_clock=1.0, hp=10))
+    reference.towers.append(Tower(1, 1, 12, 9, TowerType.ICE, cooldown_clock=1.0, hp=10))
+    reference.active_effects = [WeaponEffect(SuperWeaponType.LIGHTNING_STORM, 0, 12, 9, 4)]
+    fused = reference.clone()
+    for _ in range(40):
+        reference.advance_round()
+    trace = fused.fast_forward(40)
+    assert len(trace) == 40
+    assert fused.to_public_round_state() == reference.to_public_round_state()
+    assert fused.rng_state == reference.rng_state
+    assert (fused.pheromone == reference.pheromone).all()
+    assert trace.round_index[-1] == reference.round_index
+    assert tuple(trace.coins[-1]) == tuple(reference.coins)
+    assert tuple(trace.nearest_hostile[-1]) == (reference.nearest_ant_distance(0), reference.nearest_ant_distance(1))
+
+
+def test_fast_forward_stops_on_base_hp_drop() -> None:
+    state = GameState.initial(seed=4)
+    state.ants.append(Ant(50, 1, 3, 9, hp=10, level=0))
+    trace = state.fast_forward(30, stop_when=stop_on_base_hp_drop(state, 0))
+    assert trace.stopped
+    assert state.bases[0].hp == trace.base_hp[-1, 0] < 50
+    assert len(trace) < 30
+
+
+def test_state_bytes_round_trip_preserves_hidden_state() -> None:
+    state = GameState.initial(seed=13, movement_policy=MOVEMENT_POLICY_LEGACY, cold_handle_rule_illegal=True)
+    state.towers.append(Tower(0, 0, 6, 9, TowerType.ICE, cooldown_clock=1.5, hp=7))
+    state.active_effects = [WeaponEffect(SuperWeaponType.DEFLECTOR, 1, 12, 9, 3, last_trigger_round=2)]
+    for _ in range(12):
+        state.advance_round()
+    bewitched = state.ants[0]
+    bewitched.set_behavior(AntBehavior.BEWITCHED, target=(5, 9))
+    bewitched.pending_behavior = AntBehavior.CONSERVATIVE
+    bewitched.frozen = True
+    bewitched.add_evasion(2)
+    state.winner = 1
+    payload = state.to_bytes()
+    restored = GameState.from_bytes(payload)
+    assert restored.to_bytes() == payload
+    assert restored.movement_policy == MOVEMENT_POLICY_LEGACY
+    assert restored.cold_handle_rule_illegal
+    assert restored.rng_state == state.rng_state
+    assert restored.ants[0].trail_cells == bewitched.trail_cells
+    assert restored.ants[0].pending_behavior == AntBehavior.CONSERVATIVE
+    assert (restored.pheromone == state.pheromone).all()
+    state.winner = None
+    restored.winner = None
+    state.advance_round()
+    restored.advance_round()
+    assert restored.to_bytes() == state.to_bytes()
+
+
+def test_state_from_bytes_rejects_foreign_payloads() -> None:
+    payload = bytearray(GameState.initial(seed=1).to_bytes())
+    payload[4] = 99
+    with pytest.raises(ValueError):
+        GameState.from_bytes(bytes(payload))
+    with pytest.raises(ValueError):
+        GameState.from_bytes(b"pickle")
+
+
+def test_checksum_covers_hidden_state_and_matches_public_view() -> None:
+    state = GameState.initial(seed=6)
+    for _ in range(8):
+        state.advance_round()
+    baseline = state.checksum()
+    assert state.checksum(public_only=True) == public_state_checksum(state.to_public_round_state())
+    state.pheromone[0, 9, 9] += 1
+    assert state.checksum() != baseline
+    assert state.checksum(public_only=True) == public_state_checksum(state.to_public_round_state())
+    state.pheromone[0, 9, 9] -= 1
+    state.rng_state ^= 1
+    assert state.checksum() != baseline
+
+
+def test_runtime_checksum_mode_counts_mismatches() -> None:
+    runtime = MatchRuntime(0, GameState.initial(seed=9), verify_checksums=True)
+    reference = GameState.initial(seed=9)
+    reference.advance_round()
+    runtime.finish_round(reference.to_public_round_state())
+    assert (runtime.checksum_checks, runtime.checksum_mismatches) == (1, 0)
+    reference.advance_round()
+    public = reference.to_public_round_state()
+    runtime.finish_round(replace(public, coins=(public.coins[0], public.coins[1] + 1)))
+    assert (runtime.checksum_checks, runtime.checksum_mismatches) == (2, 1)
+
+
+def test_neighbor_tables_match_generator() -> None:
+    for x, y in PATH_CELLS + PLAYER_BASES:
+        generated = list(neighbors(x, y))
+        assert list(VALID_NEIGHBORS[x][y]) == [item for item in generated if is_valid_pos(item[1], item[2])]
+        assert list(WALKABLE_NEIGHBORS[x][y]) == [item for item in generated if is_ant_walkable(item[1], item[2])]
+        flat = cell_id(x, y)
+        for direction, nx, ny in generated:
+            expected = cell_id(nx, ny) if is_valid_pos(nx, ny) else -1
+            assert NEIGHBOR_IDS[flat][direction] == NEIGHBOR_ID_ARRAY[flat, direction] == expected
+            assert WALKABLE_NEIGHBOR_MASK[flat, direction] == (expected >= 0 and is_ant_walkable(nx, ny))
+            assert direction_between(x, y, nx, ny) == direction
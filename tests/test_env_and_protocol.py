@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import io
 import struct
+import threading
+import time
 
-from AI.protocol import ProtocolIO
-from SDK.backend.model import Operation
+from AI.ai_greedy import AI as GreedyAI, GreedySession
+from AI.ai_random import RandomAgent
+from AI.common import Ponderer
+from AI.protocol import ProtocolIO, ProtocolSession
+from SDK.backend.engine import GameState
+from SDK.backend.model import Operation, WeaponEffect
 from SDK.training import AntWarParallelEnv
-from SDK.utils.constants import OperationType
+from SDK.utils.constants import OperationType, SuperWeaponType
 
 
 def test_env_reset_and_step() -> None:
@@ -21,6 +27,18 @@ def test_env_reset_and_step() -> None:
     env.close()
 
 
+def test_env_boards_match_full_encoding_across_joint_steps() -> None:
+    env = AntWarParallelEnv(seed=8)
+    observations, _ = env.reset(seed=8)
+    for step in range(40):
+        for player, agent in enumerate(env.possible_agents):
+            assert observations[agent]["board"].tobytes() == env.feature_extractor.encode_board(env.state, player).tobytes()
+        if step == 12:
+            env.state.active_effects.append(WeaponEffect(SuperWeaponType.DEFLECTOR, 1, 9, 9, 4))
+        observations, *_ = env.step({"player_0": step % 3, "player_1": step % 2})
+    env.close()
+
+
 def test_protocol_send_and_receive_round_state() -> None:
     stdin = io.BytesIO(
         b"0 7\n"
@@ -82,3 +100,122 @@ def test_protocol_receives_extended_public_round_state_fields() -> None:
     assert round_state.anthp_lv == (0, 1)
     assert round_state.weapon_cooldowns == ((10, 20, 30, 40), (1, 2, 3, 4))
     assert round_state.active_effects == [(2, 1, 8, 9, 6)]
+
+
+class _JudgeIO:
+    """Plays the judge on a local engine; the opponent sends ``script[round]`` or holds."""
+
+    def __init__(self, player: int, seed: int, script: dict[int, list[Operation]] | None = None) -> None:
+        self.player = player
+        self.seed = seed
+        self.state = GameState.initial(seed=seed)
+        self.script = script or {}
+        self.sent: list[list[Operation]] = []
+        self.opponent: list[Operation] = []
+
+    def recv_init(self) -> tuple[int, int]:
+        return self.player, self.seed
+
+    def send_operations(self, operations) -> None:
+        self.sent.append(list(operations))
+
+    def recv_operations(self) -> list[Operation]:
+        self.opponent = list(self.script.get(self.state.round_index, []))
+        return self.opponent
+
+    def recv_round_state(self):
+        ours, theirs = self.sent[-1], self.opponent
+        self.state.resolve_turn(*((ours, theirs) if self.player == 0 else (theirs, ours)))
+        return self.state.to_public_round_state()
+
+
+def _play(session, rounds: int) -> list[list[Operation]]:
+    # Waiting on the ponderer stands in for an opponent that thinks longer than we ponder.
+    ponderer = getattr(session, "ponderer", None)
+    for _ in range(rounds):
+        if session.player == 0:
+            session.perform_self_turn()
+            if ponderer is not None:
+                ponderer.wait()
+            session.receive_opponent_turn()
+            session.sync_round()
+        else:
+            session.receive_opponent_turn()
+            session.perform_self_turn()
+            session.sync_round()
+            if ponderer is not None:
+                ponderer.wait()
+    return session.io.sent
+
+
+def test_protocol_session_pondering_reuses_only_matching_predictions() -> None:
+    script = {5: [Operation(OperationType.UPGRADE_GENERATION_SPEED)]}
+    for player in (0, 1):
+        pondering = ProtocolSession(RandomAgent(seed=5), io=_JudgeIO(player, 7, script), ponder=True)
+        plain = ProtocolSession(RandomAgent(seed=5), io=_JudgeIO(player, 7, script))
+        assert _play(pondering, 10) == _play(plain, 10)
+        assert pondering.ponderer.hits > 0
+        assert pondering.ponderer.misses > 0
+
+
+def test_greedy_session_pondering_hits_when_opponent_holds() -> None:
+    session = GreedySession(GreedyAI(), io=_JudgeIO(1, 7), ponder=True)
+    _play(session, 3)
+    assert session.ponderer.hits == 2 and session.ponderer.misses == 0
+
+
+def test_ponderer_cancel_halts_and_drops_unfinished_search() -> None:
+    class SlowAgent:
+        def __init__(self) -> None:
+            self.stop = threading.Event()
+
+        def halt(self) -> None:
+            self.stop.set()
+
+    agent = SlowAgent()
+    ponderer = Ponderer()
+    ponderer.start(agent, "key", lambda: [] if agent.stop.wait(5) else ["late"])
+    ponderer.cancel()
+    assert ponderer.claim("key") is None
+    assert ponderer.misses == 1
+
+    ponderer.start(agent, "key", lambda: ["done"])
+    ponderer.wait()
+    assert ponderer.claim("other") is None
+    ponderer.start(agent, "key", lambda: ["done"])
+    ponderer.wait()
+    assert ponderer.claim("key") == (agent, ["done"])
+    assert (ponderer.hits, ponderer.misses) == (1, 2)
+
+
+def test_protocol_session_does_not_wait_for_a_pondering_agent_without_halt() -> None:
+    release = threading.Event()
+
+    class StubbornAgent(RandomAgent):
+        stubborn = False
+
+        def fork(self):
+            twin = super().fork()
+            twin.stubborn = True
+            return twin
+
+        def choose_bundle(self, state, player, bundles=None):
+            if self.stubborn:
+                release.wait(5)
+            return super().choose_bundle(state, player, bundles=bundles)
+
+    pondering = ProtocolSession(StubbornAgent(seed=5), io=_JudgeIO(0, 7), ponder=True)
+    plain = ProtocolSession(RandomAgent(seed=5), io=_JudgeIO(0, 7))
+    try:
+        started = time.perf_counter()
+        for _ in range(3):
+            pondering.perform_self_turn()
+            pondering.receive_opponent_turn()
+            pondering.sync_round()
+        elapsed = time.perf_counter() - started
+    finally:
+        release.set()
+    _play(plain, 3)
+    assert elapsed < 2
+    assert pondering.io.sent == plain.io.sent
+    assert (pondering.ponderer.hits, pondering.ponderer.misses) == (0, 2)
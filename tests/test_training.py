@@ -4,7 +4,10 @@ import numpy as np
 
 from SDK.training import AntWarParallelEnv
 from SDK.training.base import BaseSelfPlayTrainer
+from SDK.training.alphazero import AlphaZeroSelfPlayTrainer, AlphaZeroTrainerConfig
 from SDK.training.selfplay import LinearSelfPlayTrainer, TrainerConfig
+from SDK.training.traces import BINARY_CHANNELS, COUNT_CHANNELS, HALF_STEP_CHANNELS, STEP_CHANNELS, CompactSelfPlayBatch
+from SDK.utils.features import BOARD_SHAPE, BOARD_SIZE
 
 
 class DummyTrainer(BaseSelfPlayTrainer):
@@ -46,3 +49,75 @@ def test_linear_selfplay_trainer_runs_one_batch() -> None:
     assert not np.allclose(before, after)
     metrics = trainer.evaluate_policy(1)
     assert "eval_return" in metrics
+
+
+def test_compact_selfplay_batch_round_trips_within_documented_bound() -> None:
+    env = AntWarParallelEnv(seed=5)
+    observations, _ = env.reset(seed=5)
+    extractor = env.feature_extractor
+    rows, masks = [], []
+    for step in range(30):
+        for agent in env.possible_agents:
+            rows.append(extractor.flatten_observation(observations[agent]))
+            masks.append(observations[agent]["action_mask"])
+        observations, *_ = env.step({"player_0": step % 4, "player_1": step % 3})
+    env.close()
+    observations = np.stack(rows)
+    masks = np.stack(masks)
+    policies = np.zeros(masks.shape, dtype=np.float32)
+    policies[:, 0] = 0.75
+    policies[::2, 3] = 0.25
+    values = np.linspace(-1.0, 1.0, len(rows), dtype=np.float32)
+
+    half = len(rows) // 2
+    compact = CompactSelfPlayBatch.concatenate(
+        [
+            CompactSelfPlayBatch.from_arrays(observations[:half], masks[:half], policies[:half], values[:half]),
+            CompactSelfPlayBatch.from_arrays(observations[half:], masks[half:], policies[half:], values[half:]),
+        ]
+    )
+    decoded, decoded_masks, decoded_policies, decoded_values = compact.decode()
+
+    assert compact.nbytes * 2.5 < observations.nbytes + masks.astype(np.float32).nbytes + policies.nbytes
+    assert np.all(np.abs(decoded - observations) <= 2.0**-11 * np.abs(observations) + 2.0**-25)
+    boards = decoded[:, :BOARD_SIZE].reshape(len(rows), *BOARD_SHAPE)
+    original = observations[:, :BOARD_SIZE].reshape(len(rows), *BOARD_SHAPE)
+    exact = list(BINARY_CHANNELS + STEP_CHANNELS)
+    np.testing.assert_array_equal(boards[:, exact], original[:, exact])
+    np.testing.assert_array_equal(decoded[:, BOARD_SIZE:], observations[:, BOARD_SIZE:])
+    np.testing.assert_array_equal(decoded_masks, masks.astype(np.float32))
+    np.testing.assert_array_equal(decoded_policies, policies)
+    np.testing.assert_array_equal(decoded_values, values)
+
+
+def test_compact_selfplay_batch_clips_and_counts_out_of_range_steps() -> None:
+    observations = np.zeros((2, BOARD_SIZE + 3), dtype=np.float32)
+    boards = observations[:, :BOARD_SIZE].reshape(2, *BOARD_SHAPE)
+    boards[0, COUNT_CHANNELS[0], 4, 5] = 300.0
+    boards[1, HALF_STEP_CHANNELS[0], 6, 7] = 200.0
+    boards[1, COUNT_CHANNELS[1], 1, 1] = 255.0
+    masks = np.ones((2, 4), dtype=np.float32)
+    policies = np.full((2, 4), 0.25, dtype=np.float32)
+
+    compact = CompactSelfPlayBatch.from_arrays(observations, masks, policies, np.zeros(2, dtype=np.float32))
+    decoded = compact.decode()[0][:, :BOARD_SIZE].reshape(2, *BOARD_SHAPE)
+
+    assert compact.saturated == 2
+    assert CompactSelfPlayBatch.concatenate([compact, compact]).saturated == 4
+    assert decoded[0, COUNT_CHANNELS[0], 4, 5] == 255.0
+    assert decoded[1, HALF_STEP_CHANNELS[0], 6, 7] == 127.5
+    assert decoded[1, COUNT_CHANNELS[1], 1, 1] == 255.0
+
+
+def test_alphazero_trainer_updates_from_compact_traces() -> None:
+    trainer = AlphaZeroSelfPlayTrainer(
+        lambda seed=0: AntWarParallelEnv(seed=seed, max_actions=24),
+        AlphaZeroTrainerConfig(search_iterations=2, max_depth=1, max_rounds=3, max_actions=24, hidden_dim=8, hidden_dim2=4),
+    )
+    batch, _ = trainer.collect_episode(seed=3)
+    merged = trainer._merge_batches([batch, batch])
+
+    assert isinstance(merged, CompactSelfPlayBatch) and len(merged) == 2 * len(batch) > 0
+    metrics = trainer.update_from_batch(merged)
+    assert metrics["samples"] == float(len(merged))
+    assert metrics["saturated_steps"] == 0.0
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from SDK.backend.engine import GameState  # noqa: E402
+from SDK.backend.model import Ant  # noqa: E402
+from SDK.utils.constants import PATH_CELLS, AntBehavior, AntKind  # noqa: E402
+
+
+def crowded_state(ants: int, seed: int) -> GameState:
+    rng = random.Random(seed)
+    state = GameState.initial(seed=seed)
+    for index in range(ants):
+        x, y = rng.choice(PATH_CELLS)
+        kind = AntKind.COMBAT if rng.random() < 0.2 else AntKind.WORKER
+        ant = Ant(index + 2, index % 2, x, y, hp=10, level=0, kind=kind, age=rng.randrange(0, 60))
+        roll = rng.random()
+        if roll < 0.1:
+            ant.set_behavior(AntBehavior.RANDOM)
+        elif roll < 0.2:
+            ant.set_behavior(AntBehavior.CONSERVATIVE)
+        elif roll < 0.25:
+            ant.frozen = True
+            ant.pending_behavior = AntBehavior.RANDOM
+        state.ants.append(ant)
+    state.next_ant_id = ants + 2
+    return state
+
+
+def bench_lifecycle(states: list[GameState], rounds: int) -> tuple[float, float]:
+    lifecycle = 0.0
+    total = 0.0
+    for state in states:
+        for _ in range(rounds):
+            if state.terminal:
+                break
+            start = time.perf_counter()
+            state._attack_ants()
+            state._move_ants()
+            state._update_pheromone()
+            mark = time.perf_counter()
+            state._resolve_ant_lifecycle()
+            state._spawn_ants()
+            state._increase_ant_age()
+            lifecycle += time.perf_counter() - mark
+            state._tick_effects()
+            state.round_index += 1
+            total += time.perf_counter() - start
+    return lifecycle, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the Python engine round phases.")
+    parser.add_argument("--ants", type=int, default=600)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    states = [crowded_state(args.ants, args.seed + index) for index in range(args.repeat)]
+    lifecycle, total = bench_lifecycle(states, args.rounds)
+    played = args.repeat * args.rounds
+    print(f"ants={args.ants} rounds={played}")
+    print(f"lifecycle+age: {lifecycle / played * 1e3:.3f} ms/round")
+    print(f"full round:    {total / played * 1e3:.3f} ms/round")
+
+
+if __name__ == "__main__":
+    main()